@@ -13,6 +13,18 @@ import maya.cmds as cmds
 import re
 
 import os
+import sys
+
+try:
+    import tool_profiler
+except ImportError:
+    tool_profiler = None
+
+
+profiled = tool_profiler.span if tool_profiler else (lambda name: lambda function: function)
+
+if tool_profiler is not None:
+    tool_profiler.register(sys.modules[__name__])
 
 
 def maya_main_window():
@@ -66,13 +78,11 @@ class AutoShaderDialog(QtWidgets.QDialog):
     )
 
     def __init__(self, parent=maya_main_window()):
-        print("init()")
         super(AutoShaderDialog, self).__init__(parent)
 
         self.extension_filters = [".png", ".exr", ".jpg", ".jpeg"]
 
         self.extension_str = " ".join(["*" + ext for ext in self.extension_filters])
-        print(self.extension_str)
 
         self.default_text_path = "G:/ATI-M1/INTENSIFS_sem1/auto-shader/textures/dflt_text.png"
         self.texture_files_path = {
@@ -94,7 +104,6 @@ class AutoShaderDialog(QtWidgets.QDialog):
         self.updateRegexUI()
 
     def custom_set_style_sheet(self):
-        print("function style for widget")
         self.setStyleSheet("background-color : #192E5B;")
         self.set_style_sheet_Desc_Label_wdg(
             self.description_te, self.FONT_COLOR_DESC, self.FONT_LABEL_DESC, self.FONT_SIZE_DESC
@@ -156,7 +165,6 @@ class AutoShaderDialog(QtWidgets.QDialog):
         # self.set_style_sheet_btn(self.close_btn, self.BTN_BACKGROUND_COLOR,self.FONT_LABEL_DESC)
 
     def set_style_sheet_checkbox(*list_checkbox_widget):
-        print("dans la fonction")
         for checkbox_wdg in list_checkbox_widget:
             checkbox_wdg.setStyleSheet(
                 """
@@ -461,20 +469,15 @@ class AutoShaderDialog(QtWidgets.QDialog):
         self.specular_regex_le.setText(specular_regex_str)
         self.normal_regex_le.setText(normal_regex_str)
 
+    @profiled("AutoShaderDialog.import_btn_clicked")
     def import_btn_clicked(self):
-        print("import_btn_clicked()")
         # TODO all or selected with radio buttons
         meshs_list = cmds.ls(sl=True)
-        print(meshs_list)
         # meshList_lr = cmds.listRelatives(cmds.ls(g=True), p=True, pa=True)
         # print(meshList_lr)
 
         for mesh in meshs_list:
             material = mesh + "_MAT"
-            print("============================================================")
-            print("Creating material: " + material + "...")
-            print("On mesh: " + mesh + "...")
-            print("============================================================")
             cmds.shadingNode("aiStandardSurface", asShader=True, name=material)  # plus a shading node
             cmds.sets(renderable=True, noSurfaceShader=True, empty=True, name=material + "_SG")
             cmds.connectAttr(material + ".outColor", material + "_SG.surfaceShader", force=True)
@@ -482,7 +485,6 @@ class AutoShaderDialog(QtWidgets.QDialog):
             cmds.hyperShade(assign=material)
 
             for type, textureFile in self.texture_files_path.items():
-                print(type, textureFile)
                 if type == "color":
                     self.colorMap(textureFile, material)
                 elif type == "metalness":
@@ -491,11 +493,10 @@ class AutoShaderDialog(QtWidgets.QDialog):
                     self.specularMap(textureFile, material)
                 elif type == "normal":
                     self.normalMap(textureFile, material)
-                else:
-                    print("error import_btn_clicked")
+        print(f"{len(meshs_list)} material(s) created and assigned")
 
+    @profiled("AutoShaderDialog.colorMap")
     def colorMap(self, textureFile, material):
-        print("colorMap()")
         # if a file texture is already connected to this input, update it
         # otherwise, delete it
         input = "baseColor"
@@ -531,19 +532,14 @@ class AutoShaderDialog(QtWidgets.QDialog):
             cmds.connectAttr(newPlacer + "." + connection, newFile + "." + connection)
 
         # now connect the file texture output to the material input
-        print("Connecting color map...")
         cmds.connectAttr(newFile + ".outColor", material + "." + input, f=1)
-        print(">> " + newFile + ".outColor" + " connected to " + material + "." + input)
         cmds.setAttr(newFile + ".alphaIsLuminance", 0)
-        print(">> " + newFile + ".alphaIsLuminance set to 0")
 
         cmds.setAttr(newFile + ".fileTextureName", textureFile, type="string")
         cmds.setAttr(newFile + ".cs", colorSpace, type="string")
-        print(">> " + newFile + ".cs set to " + colorSpace)
-        print(" ")
 
+    @profiled("AutoShaderDialog.metalnessMap")
     def metalnessMap(self, textureFile, material):
-        print("metalnessMap()")
         # if a file texture is already connected to this input, update it
         # otherwise, delete it
         input = "metalness"
@@ -575,19 +571,14 @@ class AutoShaderDialog(QtWidgets.QDialog):
         cmds.connectAttr(newPlacer + ".outUvFilterSize", newFile + ".uvFilterSize")
         for i in connections:
             cmds.connectAttr(newPlacer + "." + i, newFile + "." + i)
-        print("Connecting metalness map...")
         cmds.connectAttr(newFile + ".outAlpha", material + "." + input, f=1)
-        print(">> " + newFile + ".outAlpha" + " connected to " + material + "." + input)
         cmds.setAttr(newFile + ".alphaIsLuminance", 1)
-        print(">> " + newFile + ".alphaIsLuminance set to 1")
 
         cmds.setAttr(newFile + ".fileTextureName", textureFile, type="string")
         cmds.setAttr(newFile + ".cs", colorSpace, type="string")
-        print(">> " + newFile + ".cs set to " + colorSpace)
-        print(" ")
 
+    @profiled("AutoShaderDialog.specularMap")
     def specularMap(self, textureFile, material):
-        print("specularMap()")
         # if a file texture is already connected to this input, update it
         # otherwise, delete it
         input = "specularRoughness"
@@ -621,19 +612,14 @@ class AutoShaderDialog(QtWidgets.QDialog):
         cmds.connectAttr(newPlacer + ".outUvFilterSize", newFile + ".uvFilterSize")
         for i in connections:
             cmds.connectAttr(newPlacer + "." + i, newFile + "." + i)
-        print("Connecting specular map...")
         cmds.connectAttr(newFile + ".outAlpha", material + "." + input, f=1)
-        print(">> " + newFile + ".outAlpha" + " connected to " + material + "." + input)
         cmds.setAttr(newFile + ".alphaIsLuminance", 1)
-        print(">> " + newFile + ".alphaIsLuminance set to 1")
 
         cmds.setAttr(newFile + ".fileTextureName", textureFile, type="string")
         cmds.setAttr(newFile + ".cs", colorSpace, type="string")
-        print(">> " + newFile + ".cs set to " + colorSpace)
-        print(" ")
 
+    @profiled("AutoShaderDialog.normalMap")
     def normalMap(self, textureFile, material):
-        print("normalMap()")
         # if a file texture is already connected to this input, update it
         # otherwise, delete it
         input = "normalCamera"
@@ -665,25 +651,18 @@ class AutoShaderDialog(QtWidgets.QDialog):
         cmds.connectAttr(newPlacer + ".outUvFilterSize", newFile + ".uvFilterSize")
         for i in connections:
             cmds.connectAttr(newPlacer + "." + i, newFile + "." + i)
-        print("Connecting normal map...")
         bumpNode = cmds.shadingNode("bump2d", asUtility=1, icm=True)
         cmds.connectAttr(newFile + ".outAlpha", bumpNode + ".bumpValue", f=1)
         cmds.connectAttr(bumpNode + ".outNormal", material + "." + input, f=1)
         cmds.setAttr(bumpNode + ".bumpInterp", 1)
-        print(">> " + newFile + " set to tangent space normals")
         cmds.setAttr(bumpNode + ".aiFlipG", 0)
-        print(">> " + newFile + ".FlipRG set to 0")
         cmds.setAttr(bumpNode + ".aiFlipR", 0)
         cmds.setAttr(newFile + ".alphaIsLuminance", 0)
-        print(">> " + newFile + ".alphaIsLuminance set to 0")
 
         cmds.setAttr(newFile + ".fileTextureName", textureFile, type="string")
         cmds.setAttr(newFile + ".cs", colorSpace, type="string")
-        print(">> " + newFile + ".cs set to " + colorSpace)
-        print(" ")
 
     def base_color_btn_clicked(self):
-        print("base_color_btn_clicked()")
         qfd = QtWidgets.QFileDialog()
 
         texture_path = qfd.getOpenFileName(
@@ -696,7 +675,6 @@ class AutoShaderDialog(QtWidgets.QDialog):
         self.update_buttons_icons()
 
     def metalness_btn_clicked(self):
-        print("metalness_btn_clicked()")
         qfd = QtWidgets.QFileDialog()
 
         texture_path = qfd.getOpenFileName(
@@ -709,7 +687,6 @@ class AutoShaderDialog(QtWidgets.QDialog):
         self.update_buttons_icons()
 
     def specular_btn_clicked(self):
-        print("specular_btn_clicked()")
         qfd = QtWidgets.QFileDialog()
 
         texture_path = qfd.getOpenFileName(
@@ -722,7 +699,6 @@ class AutoShaderDialog(QtWidgets.QDialog):
         self.update_buttons_icons()
 
     def normal_btn_clicked(self):
-        print("normal_btn_clicked()")
         qfd = QtWidgets.QFileDialog()
 
         texture_path = qfd.getOpenFileName(
@@ -734,8 +710,8 @@ class AutoShaderDialog(QtWidgets.QDialog):
         self.texture_files_path["normal"] = texture_path
         self.update_buttons_icons()
 
+    @profiled("AutoShaderDialog.import_textures_is_clicked")
     def import_textures_is_clicked(self):
-        print("import_textures_is_clicked()")
         qfd = QtWidgets.QFileDialog()
         # setup options qfiledialog
         qfd.setFileMode(QtWidgets.QFileDialog.DirectoryOnly)
@@ -751,15 +727,13 @@ class AutoShaderDialog(QtWidgets.QDialog):
 
         abs_filepaths = []
         abs_filepaths = self.get_abs_filepaths_in_folder(self.maps_path)
-        print(abs_filepaths)
         self.associate_texture_paths(abs_filepaths)
 
         self.update_buttons_icons()
 
+    @profiled("AutoShaderDialog.update_buttons_icons")
     def update_buttons_icons(self):
-        print("update_buttons_icons()")
         for key, value in self.texture_files_path.items():
-            print(key, value)
             if key == "color":
                 self.base_color_img_btn.setIcon(QtGui.QIcon(f"{value}"))
                 self.base_color_img_btn.setIconSize(QtCore.QSize(128, 128))
@@ -774,7 +748,6 @@ class AutoShaderDialog(QtWidgets.QDialog):
                 self.normal_img_btn.setIconSize(QtCore.QSize(128, 128))
 
     def get_values_from_UI(self):
-        print("get_values_from_UI()")
         self.map_prefix = self.map_prefix_le.text()
         self.map_suffix = self.map_suffix_le.text()
         self.map_type = self.map_type_combobox.currentText()
@@ -787,34 +760,23 @@ class AutoShaderDialog(QtWidgets.QDialog):
         self.specular_filter = self.specular_le.text() if self.specular_checkbox.isChecked() else ""
         self.normal_filter = self.normal_le.text() if self.normal_checkbox.isChecked() else ""
 
-        print(self.map_prefix, self.map_suffix, self.map_type)
-        print(self.selected_is_checked, self.all_is_checked)
-        print(
-            self.color_filter,
-            self.metalness_filter,
-            self.specular_filter,
-            self.normal_filter,
-        )
-
+    @profiled("AutoShaderDialog.get_abs_filepaths_in_folder")
     def get_abs_filepaths_in_folder(self, folder_path):
-        print("get_files_in_folder()")
         abs_filepaths = []
         for dirpath, _, filenames in os.walk(folder_path):
             for f in filenames:
                 fpath = os.path.abspath(os.path.join(dirpath, f))
                 abs_filepaths.append(fpath)
 
-        print("abs_filepaths")
         return abs_filepaths
 
+    @profiled("AutoShaderDialog.associate_texture_paths")
     def associate_texture_paths(self, texture_filepaths):
-        print("associate_texture_paths()")
         # get values
         color_full_re = self.color_regex_le.text() + "$"
         metalness_full_re = self.metalness_regex_le.text() + "$"
         specular_full_re = self.specular_regex_le.text() + "$"
         normal_full_re = self.normal_regex_le.text() + "$"
-        print(color_full_re, metalness_full_re, specular_full_re, normal_full_re)
         # regex
         color_re = re.compile(rf"{color_full_re}")
         metalness_re = re.compile(rf"{metalness_full_re}$")
@@ -833,21 +795,11 @@ class AutoShaderDialog(QtWidgets.QDialog):
         #     rf"{self.map_prefix}*{self.normal_filter}*{self.map_suffix}*{self.map_type}$"
         # )
 
-        print(color_re)
-        print(metalness_re)
-        print(specular_re)
-        print(normal_re)
-
         for file in texture_filepaths:
-            print(f"-- FILE: {file} --")
             color_search = color_re.search(file)
             metalness_search = metalness_re.search(file)
             specular_search = specular_re.search(file)
             normal_search = normal_re.search(file)
-            print(color_search)
-            print(metalness_search)
-            print(specular_search)
-            print(normal_search)
             if color_search:
                 self.texture_files_path["color"] = file
             if metalness_search:
@@ -856,7 +808,6 @@ class AutoShaderDialog(QtWidgets.QDialog):
                 self.texture_files_path["specular"] = file
             if normal_search:
                 self.texture_files_path["normal"] = file
-        print(self.texture_files_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+"""Stand-in for maya.OpenMaya, imported but unused by the tools"""
@@ -0,0 +1,16 @@
+"""In-memory stand-in for maya.OpenMayaUI.MQtUtil"""
+
+from shiboken2 import getCppPointer
+
+from PySide2 import QtWidgets
+
+_main_window = None
+
+
+class MQtUtil(object):
+    @staticmethod
+    def mainWindow():
+        global _main_window
+        if _main_window is None:
+            _main_window = QtWidgets.QWidget()
+        return getCppPointer(_main_window)[0]
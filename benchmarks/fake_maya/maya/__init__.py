@@ -0,0 +1,5 @@
+"""In-memory stand-in for the subset of Maya used by the tools, for the benchmarks.
+
+Only the commands, arguments and API classes the tools call are implemented. Every
+node lives in maya._scene.SCENE, which also counts the calls made to the fake.
+"""
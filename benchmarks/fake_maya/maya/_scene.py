@@ -0,0 +1,439 @@
+"""In-memory scene shared by the fake maya.cmds and maya.api.OpenMaya modules"""
+
+import itertools
+import uuid as uuid_module
+
+LIGHT_TYPES = [
+    "ambientLight",
+    "directionalLight",
+    "pointLight",
+    "spotLight",
+    "areaLight",
+    "volumeLight",
+    "aiAreaLight",
+    "aiMeshLight",
+    "aiPhotometricLight",
+    "aiSkyDomeLight",
+]
+
+# (type, default, min, max)
+COMMON_LIGHT_ATTRIBUTES = {
+    "color": ("float3", (1.0, 1.0, 1.0), None, None),
+    "intensity": ("float", 1.0, None, None),
+    "aiExposure": ("float", 0.0, None, None),
+    "aiUseColorTemperature": ("bool", False, None, None),
+    "aiColorTemperature": ("float", 6500.0, 0.0, None),
+    "aiSamples": ("long", 1, 0, 100),
+    "aiNormalize": ("bool", True, None, None),
+    "aiCastShadows": ("bool", True, None, None),
+    "aiShadowDensity": ("float", 1.0, 0.0, 1.0),
+    "aiShadowColor": ("float3", (0.0, 0.0, 0.0), None, None),
+    "aiCastVolumetricShadows": ("bool", True, None, None),
+    "aiVolumeSamples": ("long", 2, 0, 100),
+    "aiCamera": ("float", 1.0, 0.0, None),
+    "aiTransmission": ("float", 1.0, 0.0, None),
+    "aiDiffuse": ("float", 1.0, 0.0, None),
+    "aiSpecular": ("float", 1.0, 0.0, None),
+    "aiSss": ("float", 1.0, 0.0, None),
+    "aiIndirect": ("float", 1.0, 0.0, None),
+    "aiVolume": ("float", 1.0, 0.0, None),
+    "aiMaxBounces": ("long", 999, 0, None),
+}
+EMIT_ATTRIBUTES = {
+    "emitDiffuse": ("bool", True, None, None),
+    "emitSpecular": ("bool", True, None, None),
+    "decayRate": ("enum", 0, 0, 3),
+}
+TYPE_ATTRIBUTES = {
+    "ambientLight": {"ambientShade": ("float", 0.45, 0.0, 1.0)},
+    "directionalLight": {"aiAngle": ("float", 0.0, 0.0, 180.0)},
+    "pointLight": {"aiRadius": ("float", 0.0, 0.0, None)},
+    "spotLight": {
+        "coneAngle": ("doubleAngle", 40.0, 0.0057, 179.9943),
+        "penumbraAngle": ("doubleAngle", 0.0, -179.9943, 179.9943),
+        "dropoff": ("double", 0.0, 0.0, None),
+        "aiRadius": ("float", 0.0, 0.0, None),
+        "aiRoundness": ("float", 0.0, 0.0, 1.0),
+        "aiAspectRatio": ("float", 1.0, 0.0, None),
+        "aiLensRadius": ("float", 0.0, 0.0, None),
+    },
+    "areaLight": {
+        "normalize": ("bool", True, None, None),
+        "aiResolution": ("long", 512, 1, None),
+        "aiSpread": ("float", 1.0, 0.0, 1.0),
+    },
+    "volumeLight": {"lightShape": ("enum", 0, 0, 3), "aiRadius": ("float", 0.0, 0.0, None)},
+    "aiAreaLight": {
+        "exposure": ("float", 0.0, None, None),
+        "aiSpread": ("float", 1.0, 0.0, 1.0),
+        "aiResolution": ("long", 512, 1, None),
+        "aiRoundness": ("float", 0.0, 0.0, 1.0),
+        "aiSoftEdge": ("float", 0.0, 0.0, 1.0),
+    },
+    "aiMeshLight": {"exposure": ("float", 0.0, None, None), "lightVisible": ("bool", False, None, None)},
+    "aiPhotometricLight": {"exposure": ("float", 0.0, None, None), "aiRadius": ("float", 0.0, 0.0, None)},
+    "aiSkyDomeLight": {
+        "exposure": ("float", 0.0, None, None),
+        "resolution": ("long", 1000, 1, None),
+        "format": ("enum", 1, 0, 2),
+        "portalMode": ("enum", 1, 0, 2),
+        "aiAovIndirect": ("bool", False, None, None),
+    },
+}
+TRANSFORM_ATTRIBUTES = {
+    "visibility": ("bool", True, None, None),
+    "translate": ("double3", (0.0, 0.0, 0.0), None, None),
+    "rotate": ("double3", (0.0, 0.0, 0.0), None, None),
+    "scale": ("double3", (1.0, 1.0, 1.0), None, None),
+}
+SHADING_ATTRIBUTES = {
+    "aiStandardSurface": {
+        "outColor": ("float3", (0.0, 0.0, 0.0), None, None),
+        "baseColor": ("float3", (0.8, 0.8, 0.8), None, None),
+        "metalness": ("float", 0.0, 0.0, 1.0),
+        "specularRoughness": ("float", 0.2, 0.0, 1.0),
+        "normalCamera": ("float3", (0.0, 0.0, 0.0), None, None),
+    },
+    "file": {
+        "outColor": ("float3", (0.0, 0.0, 0.0), None, None),
+        "outAlpha": ("float", 0.0, None, None),
+        "alphaIsLuminance": ("bool", False, None, None),
+        "fileTextureName": ("string", "", None, None),
+        "colorSpace": ("string", "sRGB", None, None),
+    },
+    "place2dTexture": {"outUV": ("float2", (0.0, 0.0), None, None)},
+    "bump2d": {
+        "bumpValue": ("float", 0.0, None, None),
+        "outNormal": ("float3", (0.0, 0.0, 0.0), None, None),
+        "bumpInterp": ("enum", 0, 0, 2),
+        "aiFlipR": ("bool", True, None, None),
+        "aiFlipG": ("bool", True, None, None),
+    },
+    "shadingEngine": {"surfaceShader": ("float3", (0.0, 0.0, 0.0), None, None)},
+    "mesh": {},
+}
+ATTRIBUTE_ALIASES = {"cs": "colorSpace"}
+# every other attribute used by the texture network is accepted as a generic float
+GENERIC_ATTRIBUTE = ("float", 0.0, None, None)
+
+
+def node_type_attributes(node_type):
+    if node_type == "transform":
+        return TRANSFORM_ATTRIBUTES
+    if node_type in LIGHT_TYPES:
+        attributes = dict(COMMON_LIGHT_ATTRIBUTES)
+        if node_type not in ("ambientLight", "aiSkyDomeLight", "aiMeshLight", "aiAreaLight", "aiPhotometricLight"):
+            attributes.update(EMIT_ATTRIBUTES)
+        attributes.update(TYPE_ATTRIBUTES.get(node_type, {}))
+        return attributes
+    return SHADING_ATTRIBUTES.get(node_type, {})
+
+
+class Node(object):
+    def __init__(self, scene, name, node_type, parent=None):
+        self.scene = scene
+        self.name = name
+        self.node_type = node_type
+        self.parent = parent
+        self.children = []
+        self.uuid = str(uuid_module.UUID(int=next(scene.uuid_counter))).upper()
+        self.definitions = node_type_attributes(node_type)
+        self.values = {attr: definition[1] for attr, definition in self.definitions.items()}
+        self.alive = True
+        if parent is not None:
+            parent.children.append(self)
+
+    def definition(self, attr):
+        attr = ATTRIBUTE_ALIASES.get(attr, attr)
+        if attr in self.definitions:
+            return self.definitions[attr]
+        if self.node_type not in LIGHT_TYPES and self.node_type != "transform":
+            return GENERIC_ATTRIBUTE
+        return None
+
+
+class Scene(object):
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.nodes = {}
+        self.uuid_counter = itertools.count(1)
+        self.name_counter = {}
+        self.selection = []
+        self.connections = []
+        self.stats = {}
+        self.attribute_callbacks = {}  # node -> {id: (fn, client_data)}
+        self.name_callbacks = {}
+        self.removal_callbacks = {}
+        self.node_added_callbacks = {}  # id -> (fn, node_type, client_data)
+        self.node_removed_callbacks = {}
+        self.callback_counter = itertools.count(1)
+        self.undo_queue = []  # undoable plug-in commands
+        self.redo_queue = []
+        self.script_jobs = {}
+        self.job_counter = itertools.count(1)
+        self.undo_chunks = 0
+        self.locked_plugs = set()  # (node, attribute) locked with setAttr -lock
+
+    def count(self, name):
+        self.stats[name] = self.stats.get(name, 0) + 1
+
+    def unique_name(self, base):
+        if base not in self.nodes:
+            return base
+        index = self.name_counter.get(base, 0)
+        while True:
+            index += 1
+            candidate = f"{base}{index}"
+            if candidate not in self.nodes:
+                self.name_counter[base] = index
+                return candidate
+
+    def create_node(self, node_type, name=None, parent=None):
+        name = self.unique_name(name or f"{node_type}1")
+        node = Node(self, name, node_type, parent)
+        self.nodes[name] = node
+        for fn, type_filter, client_data in list(self.node_added_callbacks.values()):
+            if type_filter in (None, node_type) or (type_filter == "light" and node_type in LIGHT_TYPES):
+                fn(MObjectProxy(node), client_data)
+        self.emit_event("DagObjectCreated" if parent is not None or node_type == "transform" else "")
+        return node
+
+    def create_light(self, light_type, name):
+        transform = self.create_node("transform", name)
+        return self.create_node(light_type, f"{name}Shape", transform)
+
+    def delete_node(self, node):
+        for child in list(node.children):
+            self.delete_node(child)
+        for fn, client_data in list(self.removal_callbacks.get(node, {}).values()):
+            fn(MObjectProxy(node), None, client_data)
+        for fn, type_filter, client_data in list(self.node_removed_callbacks.values()):
+            if type_filter in (None, node.node_type) or (type_filter == "light" and node.node_type in LIGHT_TYPES):
+                fn(MObjectProxy(node), client_data)
+        node.alive = False
+        self.nodes.pop(node.name, None)
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        self.attribute_callbacks.pop(node, None)
+        self.name_callbacks.pop(node, None)
+        self.removal_callbacks.pop(node, None)
+
+    def rename(self, node, new_name):
+        old_name = node.name
+        self.nodes.pop(old_name)
+        node.name = self.unique_name(new_name)
+        self.nodes[node.name] = node
+        # the callbacks registered on a null object watch every node
+        callbacks = list(self.name_callbacks.get(node, {}).values()) + list(self.name_callbacks.get(None, {}).values())
+        for fn, client_data in callbacks:
+            fn(MObjectProxy(node), old_name, client_data)
+        return node.name
+
+    def find(self, name):
+        if "|" in name:
+            name = name.rsplit("|", 1)[-1]
+        node = self.nodes.get(name)
+        if node is None:
+            for candidate in self.nodes.values():
+                if candidate.uuid == name:
+                    return candidate
+            raise RuntimeError(f"No object matches name: {name}")
+        return node
+
+    def split_plug(self, plug_name):
+        node_name, attr = plug_name.split(".", 1)
+        return self.find(node_name), ATTRIBUTE_ALIASES.get(attr, attr)
+
+    def get_value(self, node, attr):
+        if attr in node.values:
+            return node.values[attr]
+        if attr[:-1] in node.values and attr[-1] in "RGBXYZ":
+            parent_value = node.values[attr[:-1]]
+            return parent_value["RGBXYZ".index(attr[-1]) % 3]
+        definition = node.definition(attr)
+        if definition is None:
+            raise ValueError(f"No object matches name: {node.name}.{attr}")
+        return definition[1]
+
+    def set_value(self, node, attr, value):
+        if node.definition(attr) is None and attr[:-1] not in node.values:
+            raise RuntimeError(f"No object matches name: {node.name}.{attr}")
+        if (node, attr) in self.locked_plugs:
+            raise RuntimeError(f"The attribute '{node.name}.{attr}' is locked or connected and cannot be modified.")
+        if attr[:-1] in node.values and attr[-1] in "RGBXYZ" and attr not in node.values:
+            parent_value = list(node.values[attr[:-1]])
+            parent_value["RGBXYZ".index(attr[-1]) % 3] = value
+            node.values[attr[:-1]] = tuple(parent_value)
+        else:
+            node.values[attr] = value
+        self.attribute_changed(node, attr)
+
+    def attribute_changed(self, node, attr):
+        for fn, client_data in list(self.attribute_callbacks.get(node, {}).values()):
+            fn(MNodeMessageConstants.kAttributeSet, MPlugProxy(node, attr), MPlugProxy(node, attr), client_data)
+        for job_id, job in list(self.script_jobs.items()):
+            if job[0] == "attributeChange" and job[1] == f"{node.name}.{attr}":
+                job[2]()
+
+    def emit_event(self, event):
+        if not event:
+            return
+        for job_id, job in list(self.script_jobs.items()):
+            if job[0] == "event" and job[1] == event:
+                job[2]()
+
+
+class MNodeMessageConstants(object):
+    kConnectionMade = 1 << 0
+    kConnectionBroken = 1 << 1
+    kAttributeEval = 1 << 2
+    kAttributeSet = 1 << 3
+    kAttributeLocked = 1 << 4
+    kAttributeUnlocked = 1 << 5
+    kAttributeAdded = 1 << 6
+    kAttributeRemoved = 1 << 7
+    kAttributeRenamed = 1 << 8
+    kAttributeKeyable = 1 << 9
+    kAttributeUnkeyable = 1 << 10
+    kIncomingDirection = 1 << 11
+    kAttributeArrayAdded = 1 << 12
+    kAttributeArrayRemoved = 1 << 13
+    kOtherPlugSet = 1 << 14
+
+
+class MObjectProxy(object):
+    """Stand-in for MObject: a pointer to a scene node"""
+
+    def __init__(self, node=None):
+        self.node = node
+
+    def isNull(self):
+        return self.node is None
+
+    def __eq__(self, other):
+        return isinstance(other, MObjectProxy) and other.node is self.node
+
+    def __hash__(self):
+        return id(self.node)
+
+
+class MPlugProxy(object):
+    def __init__(self, node, attr, child_index=None):
+        self.scene_node = node
+        self.attr = attr
+        self.child_index = child_index
+
+    @property
+    def isNull(self):
+        return self.scene_node is None
+
+    @property
+    def isCompound(self):
+        definition = self.scene_node.definition(self.attr)
+        return self.child_index is None and definition is not None and definition[0] in ("float3", "double3")
+
+    @property
+    def isChild(self):
+        return self.child_index is not None
+
+    def parent(self):
+        return MPlugProxy(self.scene_node, self.attr)
+
+    def numChildren(self):
+        return 3 if self.isCompound else 0
+
+    def child(self, index):
+        return MPlugProxy(self.scene_node, self.attr, index)
+
+    def node(self):
+        return MObjectProxy(self.scene_node)
+
+    def name(self):
+        return f"{self.scene_node.name}.{self.partialName()}"
+
+    def partialName(self, includeNodeName=False, includeNonMandatoryIndices=False, includeInstancedIndices=False,
+                    useAlias=False, useFullAttributePath=False, useLongNames=False):
+        name = self.attr
+        if self.child_index is not None:
+            suffix = "RGB" if self.scene_node.definition(self.attr)[0] == "float3" else "XYZ"
+            name = f"{self.attr}{suffix[self.child_index]}"
+        if includeNodeName:
+            return f"{self.scene_node.name}.{name}"
+        return name
+
+    def _value(self):
+        self.scene_node.scene.count("api.getValue")
+        value = self.scene_node.scene.get_value(self.scene_node, self.attr)
+        if self.child_index is not None:
+            return value[self.child_index]
+        return value
+
+    def _set(self, value):
+        scene = self.scene_node.scene
+        scene.count("api.setValue")
+        if self.child_index is not None:
+            current = list(scene.get_value(self.scene_node, self.attr))
+            current[self.child_index] = value
+            value = tuple(current)
+        scene.set_value(self.scene_node, self.attr, value)
+
+    def asDouble(self):
+        return float(self._value())
+
+    def asFloat(self):
+        return float(self._value())
+
+    def asBool(self):
+        return bool(self._value())
+
+    def asInt(self):
+        return int(self._value())
+
+    def asShort(self):
+        return int(self._value())
+
+    def asString(self):
+        return str(self._value())
+
+    def asMAngle(self):
+        from maya.api.OpenMaya import MAngle
+
+        return MAngle(self._value(), MAngle.kDegrees)
+
+    def asMDistance(self):
+        from maya.api.OpenMaya import MDistance
+
+        return MDistance(self._value())
+
+    @property
+    def isLocked(self):
+        return (self.scene_node, self.attr) in self.scene_node.scene.locked_plugs
+
+    # the fake attributes are never connected
+    isDestination = False
+
+    def setDouble(self, value):
+        self._set(float(value))
+
+    def setFloat(self, value):
+        self._set(float(value))
+
+    def setBool(self, value):
+        self._set(bool(value))
+
+    def setInt(self, value):
+        self._set(int(value))
+
+    def setShort(self, value):
+        self._set(int(value))
+
+    def setMAngle(self, angle):
+        self._set(angle.asUnits(angle.kDegrees))
+
+    def setMDistance(self, distance):
+        self._set(distance.value)
+
+
+SCENE = Scene()
@@ -0,0 +1,372 @@
+"""In-memory stand-in for the subset of maya.api.OpenMaya used by the tools"""
+
+from maya._scene import SCENE, MNodeMessageConstants, MObjectProxy, MPlugProxy
+
+maya_useNewAPI = True
+
+MObject = MObjectProxy
+MObject.kNullObj = MObjectProxy()
+MPlug = MPlugProxy
+
+
+class MFn(object):
+    kInvalid = 0
+    kDependencyNode = 4
+    kDagNode = 107
+    kLight = 302
+    kTransform = 110
+
+
+class MUuid(object):
+    def __init__(self, value=""):
+        self.value = value
+
+    def asString(self):
+        return self.value
+
+
+class MObjectHandle(object):
+    def __init__(self, obj=None):
+        self.obj = obj
+
+    def isValid(self):
+        return self.obj is not None and self.obj.node is not None and self.obj.node.alive
+
+    def isAlive(self):
+        return self.isValid()
+
+    def object(self):
+        return self.obj
+
+    def hashCode(self):
+        return id(self.obj.node)
+
+
+class MDagPath(object):
+    def __init__(self, other=None):
+        self.path = list(other.path) if other is not None else []
+
+    @staticmethod
+    def getAPathTo(obj):
+        path = MDagPath()
+        node = obj.node
+        while node is not None:
+            path.path.insert(0, node)
+            node = node.parent
+        return path
+
+    def isValid(self):
+        if not self.path or not all(node.alive for node in self.path):
+            return False
+        return all(child.parent is parent for parent, child in zip(self.path, self.path[1:]))
+
+    def node(self):
+        return MObjectProxy(self.path[-1])
+
+    def transform(self):
+        for node in reversed(self.path):
+            if node.node_type == "transform":
+                return MObjectProxy(node)
+        return MObjectProxy(self.path[0])
+
+    def pop(self, num=1):
+        del self.path[-num:]
+        return self
+
+    def partialPathName(self):
+        return self.path[-1].name
+
+    def fullPathName(self):
+        return "|" + "|".join(node.name for node in self.path)
+
+    def length(self):
+        return len(self.path)
+
+    def isInstanced(self):
+        return False
+
+
+class MSelectionList(object):
+    def __init__(self):
+        self.items = []
+
+    def add(self, name):
+        SCENE.count("api.MSelectionList.add")
+        self.items.append(SCENE.find(name))
+        return self
+
+    def length(self):
+        return len(self.items)
+
+    def getDependNode(self, index):
+        return MObjectProxy(self.items[index])
+
+    def getDagPath(self, index):
+        return MDagPath.getAPathTo(MObjectProxy(self.items[index]))
+
+
+class MFnDependencyNode(object):
+    def __init__(self, obj=None):
+        self.obj = obj
+
+    @property
+    def typeName(self):
+        return self.obj.node.node_type
+
+    def name(self):
+        return self.obj.node.name
+
+    def uuid(self):
+        return MUuid(self.obj.node.uuid)
+
+    def hasAttribute(self, name):
+        return self.obj.node.definition(name) is not None
+
+    def findPlug(self, name, want_networked_plug=False):
+        SCENE.count("api.findPlug")
+        node = self.obj.node
+        if node.definition(name) is None:
+            raise RuntimeError(f"(kInvalidParameter): Cannot find plug {name}")
+        return MPlugProxy(node, name)
+
+
+class MFnDagNode(MFnDependencyNode):
+    def parent(self, index=0):
+        return MObjectProxy(self.obj.node.parent)
+
+    def parentCount(self):
+        return 1 if self.obj.node.parent is not None else 0
+
+    def getPath(self):
+        return MDagPath.getAPathTo(self.obj)
+
+
+class MAngle(object):
+    kInvalid = 0
+    kRadians = 1
+    kDegrees = 2
+
+    def __init__(self, value=0.0, unit=kDegrees):
+        self.value = value
+        self.unit = unit
+
+    @staticmethod
+    def uiUnit():
+        return MAngle.kDegrees
+
+    def asUnits(self, unit):
+        return self.value
+
+
+class MDistance(object):
+    kCentimeters = 6
+
+    def __init__(self, value=0.0, unit=kCentimeters):
+        self.value = value
+
+    @staticmethod
+    def uiUnit():
+        return MDistance.kCentimeters
+
+    def asUnits(self, unit):
+        return self.value
+
+
+class MGlobal(object):
+    @staticmethod
+    def displayInfo(message):
+        SCENE.count("api.MGlobal.displayInfo")
+        print(message)
+
+    @staticmethod
+    def displayWarning(message):
+        SCENE.count("api.MGlobal.displayWarning")
+        print("Warning: " + message)
+
+
+def _register(registry, key, fn, client_data):
+    callback_id = next(SCENE.callback_counter)
+    registry.setdefault(key, {})[callback_id] = (fn, client_data)
+    return callback_id
+
+
+class MMessage(object):
+    @staticmethod
+    def removeCallback(callback_id):
+        for registry in (SCENE.attribute_callbacks, SCENE.name_callbacks, SCENE.removal_callbacks):
+            for callbacks in registry.values():
+                callbacks.pop(callback_id, None)
+        SCENE.node_added_callbacks.pop(callback_id, None)
+        SCENE.node_removed_callbacks.pop(callback_id, None)
+
+    @staticmethod
+    def removeCallbacks(callback_ids):
+        for callback_id in callback_ids:
+            MMessage.removeCallback(callback_id)
+
+
+class MNodeMessage(MNodeMessageConstants, MMessage):
+    @staticmethod
+    def addAttributeChangedCallback(obj, fn, clientData=None):
+        SCENE.count("api.addAttributeChangedCallback")
+        return _register(SCENE.attribute_callbacks, obj.node, fn, clientData)
+
+    @staticmethod
+    def addNameChangedCallback(obj, fn, clientData=None):
+        return _register(SCENE.name_callbacks, obj.node, fn, clientData)
+
+    @staticmethod
+    def addNodePreRemovalCallback(obj, fn, clientData=None):
+        return _register(SCENE.removal_callbacks, obj.node, fn, clientData)
+
+    @staticmethod
+    def addNodeAboutToDeleteCallback(obj, fn, clientData=None):
+        return _register(SCENE.removal_callbacks, obj.node, fn, clientData)
+
+
+class MDGMessage(MMessage):
+    @staticmethod
+    def addNodeAddedCallback(fn, nodeType="dependNode", clientData=None):
+        callback_id = next(SCENE.callback_counter)
+        SCENE.node_added_callbacks[callback_id] = (fn, None if nodeType == "dependNode" else nodeType, clientData)
+        return callback_id
+
+    @staticmethod
+    def addNodeRemovedCallback(fn, nodeType="dependNode", clientData=None):
+        callback_id = next(SCENE.callback_counter)
+        SCENE.node_removed_callbacks[callback_id] = (fn, None if nodeType == "dependNode" else nodeType, clientData)
+        return callback_id
+
+
+class MDagMessage(MMessage):
+    @staticmethod
+    def addParentAddedCallback(fn, clientData=None):
+        return next(SCENE.callback_counter)
+
+    @staticmethod
+    def addParentAddedDagPathCallback(dag_path, fn, clientData=None):
+        return next(SCENE.callback_counter)
+
+    @staticmethod
+    def addParentRemovedDagPathCallback(dag_path, fn, clientData=None):
+        return next(SCENE.callback_counter)
+
+    @staticmethod
+    def addInstanceAddedDagPathCallback(dag_path, fn, clientData=None):
+        return next(SCENE.callback_counter)
+
+    @staticmethod
+    def addInstanceRemovedDagPathCallback(dag_path, fn, clientData=None):
+        return next(SCENE.callback_counter)
+
+
+class MDGModifier(object):
+    def __init__(self):
+        self.operations = []
+        self.previous_values = []
+
+    def newPlugValueDouble(self, plug, value):
+        self.operations.append((plug, "setDouble", value))
+
+    def newPlugValueFloat(self, plug, value):
+        self.operations.append((plug, "setFloat", value))
+
+    def newPlugValueBool(self, plug, value):
+        self.operations.append((plug, "setBool", value))
+
+    def newPlugValueInt(self, plug, value):
+        self.operations.append((plug, "setInt", value))
+
+    def newPlugValueShort(self, plug, value):
+        self.operations.append((plug, "setShort", value))
+
+    def newPlugValueMAngle(self, plug, value):
+        self.operations.append((plug, "setMAngle", value))
+
+    def newPlugValueMDistance(self, plug, value):
+        self.operations.append((plug, "setMDistance", value))
+
+    def doIt(self):
+        SCENE.count("api.MDGModifier.doIt")
+        # like Maya, the modifier keeps the values it replaces for its undo
+        self.previous_values = []
+        for plug, setter, value in self.operations:
+            self.previous_values.append((plug, SCENE.get_value(plug.scene_node, plug.attr)))
+            getattr(plug, setter)(value)
+
+    def undoIt(self):
+        SCENE.count("api.MDGModifier.undoIt")
+        for plug, value in reversed(self.previous_values):
+            SCENE.set_value(plug.scene_node, plug.attr, value)
+
+
+class MArgList(object):
+    def __init__(self, flags=None):
+        self.flags = flags or {}  # {"long flag name" : value}, from the keyword arguments
+
+
+class MSyntax(object):
+    kString = 5
+
+    def __init__(self):
+        self.flags = {}  # {"-short" : "-long"}
+
+    def addFlag(self, short_name, long_name, *arg_types):
+        self.flags[short_name] = long_name
+
+
+class MArgDatabase(object):
+    def __init__(self, syntax, args):
+        self.values = {}
+        for short_name, long_name in syntax.flags.items():
+            for name in (short_name, long_name):
+                if name.lstrip("-") in args.flags:
+                    self.values[short_name] = self.values[long_name] = args.flags[name.lstrip("-")]
+
+    def isFlagSet(self, name):
+        return name in self.values
+
+    def flagArgumentString(self, name, index):
+        return str(self.values[name])
+
+
+class MPxCommand(object):
+    def __init__(self):
+        self._syntax = MSyntax()
+        self._result = None
+
+    def isUndoable(self):
+        return False
+
+    def syntax(self):
+        return self._syntax
+
+    def setResult(self, result):
+        self._result = result
+
+
+class MFnPlugin(object):
+    def __init__(self, obj=None, vendor="", version="", apiVersion="Any"):
+        pass
+
+    def registerCommand(self, name, creator, syntax=None):
+        import maya.cmds
+
+        def command(**kwargs):
+            SCENE.count(f"cmds.{name}")
+            instance = creator()
+            if syntax is not None:
+                instance._syntax = syntax()
+            instance.doIt(MArgList(kwargs))
+            if instance.isUndoable():
+                SCENE.undo_queue.append(instance)
+            return instance._result
+
+        command.__name__ = name
+        setattr(maya.cmds, name, command)
+
+    def deregisterCommand(self, name):
+        import maya.cmds
+
+        if hasattr(maya.cmds, name):
+            delattr(maya.cmds, name)
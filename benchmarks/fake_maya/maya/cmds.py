@@ -0,0 +1,371 @@
+"""In-memory stand-in for the subset of maya.cmds used by the tools"""
+
+import fnmatch
+import importlib.util
+import os
+
+from maya._scene import LIGHT_TYPES, SCENE, node_type_attributes
+
+_loaded_plugins = {}  # {"plug-in path" : module}
+
+
+def _counted(function):
+    def wrapper(*args, **kwargs):
+        SCENE.count(f"cmds.{function.__name__}")
+        return function(*args, **kwargs)
+
+    wrapper.__name__ = function.__name__
+    return wrapper
+
+
+def _flatten(items):
+    result = []
+    for item in items:
+        if isinstance(item, (list, tuple)):
+            result.extend(_flatten(item))
+        else:
+            result.append(item)
+    return result
+
+
+def _resolve_names(args):
+    return [SCENE.find(name) for name in _flatten(args)]
+
+
+@_counted
+def ls(*args, **kwargs):
+    node_type = kwargs.get("type", kwargs.get("typ"))
+    selection = kwargs.get("sl", kwargs.get("selection", False))
+    if selection:
+        nodes = [node for node in SCENE.selection if node.alive]
+    elif args:
+        nodes = []
+        for name in _flatten(args):
+            if any(char in name for char in "*?"):
+                nodes.extend(node for node in SCENE.nodes.values() if fnmatch.fnmatch(node.name, name))
+            else:
+                try:
+                    nodes.append(SCENE.find(name))
+                except RuntimeError:
+                    pass
+    else:
+        nodes = list(SCENE.nodes.values())
+    if node_type:
+        types = set(_flatten([node_type]))
+        if "light" in types:
+            types.update(LIGHT_TYPES)
+        nodes = [node for node in nodes if node.node_type in types]
+    if kwargs.get("uuid"):
+        return [node.uuid for node in nodes]
+    if kwargs.get("showType", kwargs.get("st", False)):
+        return [item for node in nodes for item in (node.name, node.node_type)]
+    return [node.name for node in nodes]
+
+
+@_counted
+def listNodeTypes(classification):
+    if classification == "light":
+        return list(LIGHT_TYPES)
+    return []
+
+
+@_counted
+def listRelatives(*args, **kwargs):
+    nodes = _resolve_names(args)
+    result = []
+    wanted_type = kwargs.get("type")
+    for node in nodes:
+        if kwargs.get("parent", kwargs.get("p", False)):
+            related = [node.parent] if node.parent is not None else []
+        else:
+            related = list(node.children)
+        result.extend(item.name for item in related if wanted_type in (None, item.node_type))
+    return result or None
+
+
+@_counted
+def objectType(name, **kwargs):
+    return SCENE.find(name).node_type
+
+
+@_counted
+def getAttr(plug_name, *extra_objects, **kwargs):
+    # like Maya, extra positional objects (None here) are accepted and ignored
+    node, attr = SCENE.split_plug(plug_name)
+    if kwargs.get("typ") or kwargs.get("type"):
+        definition = node.definition(attr)
+        if definition is None:
+            if attr[:-1] in node.values:
+                return "float"
+            raise ValueError(f"No object matches name: {plug_name}")
+        return definition[0]
+    value = SCENE.get_value(node, attr)
+    if isinstance(value, tuple):
+        return [value]
+    return value
+
+
+@_counted
+def setAttr(plug_name, *values, **kwargs):
+    node, attr = SCENE.split_plug(plug_name)
+    if "lock" in kwargs or "l" in kwargs:
+        lock = kwargs.get("lock", kwargs.get("l"))
+        if lock:
+            SCENE.locked_plugs.add((node, attr))
+        else:
+            SCENE.locked_plugs.discard((node, attr))
+        if not values:
+            return
+    values = _flatten(values)
+    if len(values) == 1:
+        value = values[0]
+    else:
+        value = tuple(values)
+    SCENE.set_value(node, attr, value)
+
+
+@_counted
+def attributeQuery(attr, node=None, **kwargs):
+    # -type queries the static attributes of a node type instead of a node
+    if kwargs.get("type"):
+        definition = node_type_attributes(kwargs["type"]).get(attr)
+    else:
+        definition = SCENE.find(node).definition(attr)
+    if kwargs.get("exists"):
+        return definition is not None
+    if definition is None:
+        raise RuntimeError(f"Attribute {attr} does not exist on {node}")
+    attr_type, default, min_value, max_value = definition
+    if kwargs.get("mne") or kwargs.get("minExists"):
+        return min_value is not None
+    if kwargs.get("mxe") or kwargs.get("maxExists"):
+        return max_value is not None
+    if kwargs.get("min") or kwargs.get("minimum"):
+        return [min_value]
+    if kwargs.get("max") or kwargs.get("maximum"):
+        return [max_value]
+    if kwargs.get("sme") or kwargs.get("softMinExists"):
+        return False
+    if kwargs.get("sxe") or kwargs.get("softMaxExists"):
+        return False
+    if kwargs.get("softRange") or kwargs.get("range"):
+        return [min_value or 0.0, max_value or 0.0]
+    if kwargs.get("listDefault") or kwargs.get("ld"):
+        return list(default) if isinstance(default, tuple) else [default]
+    if kwargs.get("listEnum") or kwargs.get("le"):
+        return ["A:B:C"] if attr_type == "enum" else None
+    if kwargs.get("attributeType") or kwargs.get("at"):
+        return {"float3": "float3", "double3": "double3"}.get(attr_type, attr_type)
+    if kwargs.get("listChildren") or kwargs.get("lc"):
+        if attr_type in ("float3", "double3"):
+            suffix = "RGB" if attr_type == "float3" else "XYZ"
+            return [attr + char for char in suffix]
+        return None
+    if kwargs.get("listParent") or kwargs.get("lp"):
+        return None
+    return None
+
+
+@_counted
+def attributeInfo(*args, **kwargs):
+    attributes = ["message", "caching", "frozen", "isHistoricallyInteresting", "nodeState"]
+    for attr, definition in node_type_attributes(kwargs.get("type")).items():
+        attributes.append(attr)
+        if definition[0] in ("float3", "double3"):
+            suffix = "RGB" if definition[0] == "float3" else "XYZ"
+            attributes.extend(attr + char for char in suffix)
+    return attributes
+
+
+@_counted
+def listAttr(*args, **kwargs):
+    node = _resolve_names(args)[0]
+    if kwargs.get("userDefined", kwargs.get("ud", False)):
+        # the fake nodes have no dynamic attributes
+        return None
+    attributes = ["message", "caching", "frozen", "isHistoricallyInteresting", "nodeState"]
+    for attr, definition in node.definitions.items():
+        attributes.append(attr)
+        if definition[0] in ("float3", "double3"):
+            suffix = "RGB" if definition[0] == "float3" else "XYZ"
+            attributes.extend(attr + char for char in suffix)
+    return attributes
+
+
+@_counted
+def scriptJob(**kwargs):
+    if "kill" in kwargs:
+        SCENE.script_jobs.pop(kwargs["kill"], None)
+        return None
+    if "exists" in kwargs:
+        return kwargs["exists"] in SCENE.script_jobs
+    if "killAll" in kwargs:
+        SCENE.script_jobs.clear()
+        return None
+    job_id = next(SCENE.job_counter)
+    if "attributeChange" in kwargs:
+        plug_name, callback = kwargs["attributeChange"]
+        SCENE.script_jobs[job_id] = ("attributeChange", plug_name, callback)
+    elif "event" in kwargs:
+        event, callback = kwargs["event"]
+        SCENE.script_jobs[job_id] = ("event", event, callback)
+    elif "nodeDeleted" in kwargs:
+        node_name, callback = kwargs["nodeDeleted"]
+        SCENE.script_jobs[job_id] = ("nodeDeleted", node_name, callback)
+    elif "nodeNameChanged" in kwargs:
+        node_name, callback = kwargs["nodeNameChanged"]
+        SCENE.script_jobs[job_id] = ("nodeNameChanged", node_name, callback)
+    else:
+        SCENE.script_jobs[job_id] = ("other", None, None)
+    return job_id
+
+
+@_counted
+def evalDeferred(command=None, **kwargs):
+    if callable(command):
+        command()
+
+
+@_counted
+def select(*args, **kwargs):
+    if kwargs.get("clear"):
+        SCENE.selection = []
+        return
+    SCENE.selection = _resolve_names(args)
+
+
+@_counted
+def about(**kwargs):
+    if "version" in kwargs or "v" in kwargs:
+        return "2022"
+    return False
+
+
+@_counted
+def pluginInfo(*args, **kwargs):
+    if args and args[0] != "mtoa":
+        return args[0] in _loaded_plugins if kwargs.get("loaded") else None
+    if kwargs.get("version"):
+        return "5.0.0"
+    if kwargs.get("path"):
+        return "/opt/fake/mtoa/plug-ins/mtoa.so"
+    if kwargs.get("query") and kwargs.get("loaded"):
+        return True
+    return None
+
+
+@_counted
+def getModulePath(moduleName=None):
+    return "/opt/fake/mtoa"
+
+
+@_counted
+def undoInfo(**kwargs):
+    if kwargs.get("openChunk"):
+        SCENE.undo_chunks += 1
+    return None
+
+
+@_counted
+def colorEditor(**kwargs):
+    if kwargs.get("query"):
+        if kwargs.get("result"):
+            return False
+        return [1.0, 1.0, 1.0]
+    return None
+
+
+@_counted
+def shadingNode(node_type, **kwargs):
+    return SCENE.create_node(node_type, kwargs.get("name")).name
+
+
+@_counted
+def createNode(node_type, **kwargs):
+    parent = SCENE.find(kwargs["parent"]) if kwargs.get("parent") else None
+    return SCENE.create_node(node_type, kwargs.get("name") or kwargs.get("n"), parent).name
+
+
+@_counted
+def sets(*args, **kwargs):
+    return SCENE.create_node("shadingEngine", kwargs.get("name")).name
+
+
+@_counted
+def connectAttr(source, destination, **kwargs):
+    SCENE.split_plug(source)
+    SCENE.split_plug(destination)
+    SCENE.connections.append((source, destination))
+
+
+@_counted
+def hyperShade(*args, **kwargs):
+    return None
+
+
+@_counted
+def delete(*args, **kwargs):
+    for node in _resolve_names(args):
+        if node.alive:
+            SCENE.delete_node(node)
+
+
+@_counted
+def rename(old_name, new_name, **kwargs):
+    return SCENE.rename(SCENE.find(old_name), new_name)
+
+
+@_counted
+def objExists(name):
+    try:
+        SCENE.split_plug(name) if "." in name else SCENE.find(name)
+    except (RuntimeError, ValueError):
+        return False
+    return True
+
+
+@_counted
+def namespaceInfo(*args, **kwargs):
+    return ":"
+
+
+@_counted
+def loadPlugin(*args, **kwargs):
+    # a Python plug-in file is imported and initialized, like Maya does
+    for path in _flatten(args):
+        if not path.endswith(".py") or path in _loaded_plugins:
+            continue
+        spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(path))[0], path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.initializePlugin(None)
+        _loaded_plugins[path] = module
+    return None
+
+
+@_counted
+def undo(**kwargs):
+    if SCENE.undo_queue:
+        command = SCENE.undo_queue.pop()
+        command.undoIt()
+        SCENE.redo_queue.append(command)
+
+
+@_counted
+def redo(**kwargs):
+    if SCENE.redo_queue:
+        command = SCENE.redo_queue.pop()
+        command.redoIt()
+        SCENE.undo_queue.append(command)
+
+
+@_counted
+def warning(*args, **kwargs):
+    return None
+
+
+@_counted
+def internalVar(**kwargs):
+    import tempfile
+
+    return tempfile.gettempdir() + "/"
@@ -0,0 +1,178 @@
+"""Headless benchmarks of the light and shading tools.
+
+The tools run outside of Maya against benchmarks/fake_maya, an in-memory stand-in for the
+subset of maya.cmds and maya.api.OpenMaya they use. Every fake command and API entry point
+is counted, so each operation reports its wall time and the number of Maya calls it issues:
+the call counts are what transfers to a real session, the times only compare runs made on
+the same machine.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scales 10 100 1000 --json results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# the Maya icon resources do not exist outside of Maya
+os.environ.setdefault("QT_LOGGING_RULES", "qt.svg.warning=false")
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "fake_maya"))
+
+from PySide2 import QtWidgets  # noqa: E402
+
+from maya._scene import SCENE  # noqa: E402
+
+import scene_generator  # noqa: E402
+
+DEFAULT_SCALES = [10, 100, 1000, 10000]
+MAX_EXPANDED_LIGHTS = 50  # LightItems are only built for expanded lights, as in the tool
+MAX_COPY_DESTINATIONS = 500
+
+
+class Measure:
+    """Wall time and fake Maya calls of the code run inside the with block"""
+
+    def __init__(self, results, scale, operation, items):
+        self.results = results
+        self.scale = scale
+        self.operation = operation
+        self.items = items
+
+    def __enter__(self):
+        # the reports printed by the tools would bury the results table
+        self.silence = contextlib.redirect_stdout(io.StringIO())
+        self.silence.__enter__()
+        SCENE.stats.clear()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = time.perf_counter() - self.start
+        self.silence.__exit__(None, None, None)
+        self.results.append(
+            {
+                "scale": self.scale,
+                "operation": self.operation,
+                "items": self.items,
+                "time": elapsed,
+                "maya_calls": sum(SCENE.stats.values()),
+                "calls": dict(sorted(SCENE.stats.items())),
+                "error": None if exc_type is None else f"{exc_type.__name__}: {exc_value}",
+            }
+        )
+        # an operation failing at one scale must not stop the others
+        return True
+
+
+def bench_light_manager(results, scale, lights):
+    import light_manager
+
+    panel = light_manager.LightPanel()
+    with Measure(results, scale, "LightPanel.refresh_lights", len(lights)):
+        panel.refresh_lights()
+        QtWidgets.QApplication.processEvents()
+
+    expanded = panel.light_model.uuids[:MAX_EXPANDED_LIGHTS]
+    with Measure(results, scale, "expand lights (LightItem creation)", len(expanded)):
+        for uuid in expanded:
+            panel.light_view.expand(panel.light_model.get_index(uuid))
+        QtWidgets.QApplication.processEvents()
+
+    editors = list(panel.light_view.itemDelegate().editors.values())
+    with Measure(results, scale, "LightItem.update_values", len(editors)):
+        for editor in editors:
+            editor.update_values()
+
+    panel.clear_lights()
+    panel.deleteLater()
+
+
+def bench_copy_lights(results, scale, lights):
+    import copy_lights
+
+    dialog = copy_lights.CopyLightDialog()
+    # the dialog builds its light index and fills the lists from it when shown
+    with Measure(results, scale, "CopyLightDialog LightIndex.build + lists", len(lights)):
+        dialog.light_index.build()
+
+    source = lights[0]
+    destinations = lights[1 : MAX_COPY_DESTINATIONS + 1]
+    attributes = dialog.listing_attributes(source)
+    with Measure(results, scale, "CopyLightDialog.copy_arguments", len(destinations)):
+        dialog.copy_arguments(source, attributes, destinations)
+    dialog.deleteLater()
+
+
+def bench_autoshader(results, scale, meshes, textures, texture_root):
+    import autoshader
+
+    dialog = autoshader.AutoShaderDialog()
+    with Measure(results, scale, "AutoShaderDialog.get_abs_filepaths_in_folder", len(textures)):
+        file_paths = dialog.get_abs_filepaths_in_folder(texture_root)
+
+    dialog.updateRegexUI()
+    with Measure(results, scale, "AutoShaderDialog.associate_texture_paths", len(file_paths)):
+        dialog.associate_texture_paths(file_paths)
+
+    SCENE.selection = [SCENE.find(mesh) for mesh in meshes]
+    with Measure(results, scale, "AutoShaderDialog.import_btn_clicked", len(meshes)):
+        dialog.import_btn_clicked()
+    dialog.deleteLater()
+
+
+def run(scales):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    results = []
+    for scale in scales:
+        texture_root = tempfile.mkdtemp(prefix="autoshader_bench_")
+        try:
+            lights, meshes, textures = scene_generator.generate_scene(scale, scale, texture_root)
+            bench_light_manager(results, scale, lights)
+            bench_copy_lights(results, scale, lights)
+            bench_autoshader(results, scale, meshes, textures, texture_root)
+        finally:
+            shutil.rmtree(texture_root, ignore_errors=True)
+        app.processEvents()
+    return results
+
+
+def format_results(results):
+    lines = [f"{'scale':>6}  {'operation':<55}{'items':>7}{'time (s)':>11}{'maya calls':>12}"]
+    for result in results:
+        line = (
+            f"{result['scale']:>6}  {result['operation']:<55}{result['items']:>7}"
+            f"{result['time']:>11.4f}{result['maya_calls']:>12,}"
+        )
+        if result["error"]:
+            line += f"  FAILED {result['error']}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="number of lights and meshes")
+    parser.add_argument("--json", help="also write the results, with the calls per command, to this file")
+    args = parser.parse_args()
+
+    results = run(args.scales)
+    print(format_results(results))
+    if args.json:
+        with open(args.json, "w") as results_file:
+            json.dump(results, results_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Synthetic scenes for the benchmarks: lights of mixed types and textured meshes"""
+
+import os
+
+from maya._scene import LIGHT_TYPES, SCENE
+
+TEXTURE_MAPS = ["BaseColor", "Metalness", "Roughness", "Normal"]
+
+
+def create_lights(count):
+    """Create count lights cycling over every light type, return their shape names"""
+    shapes = []
+    for index in range(count):
+        light_type = LIGHT_TYPES[index % len(LIGHT_TYPES)]
+        shape = SCENE.create_light(light_type, f"{light_type}_{index:05d}")
+        # vary the values a little so copies are real changes
+        shape.values["intensity"] = 1.0 + index % 7
+        shape.values["aiSamples"] = 1 + index % 4
+        shapes.append(shape.name)
+    return shapes
+
+
+def create_meshes(count):
+    """Create count mesh transforms with their shape, return the transform names"""
+    meshes = []
+    for index in range(count):
+        transform = SCENE.create_node("transform", f"asset_{index:05d}_GEO")
+        SCENE.create_node("mesh", f"{transform.name}Shape", transform)
+        meshes.append(transform.name)
+    return meshes
+
+
+def create_texture_folder(root, meshes, extension=".png"):
+    """Write one empty texture file per map and per mesh, one sub folder per mesh.
+    Returns: the absolute path of every texture file
+    """
+    file_paths = []
+    for mesh in meshes:
+        folder = os.path.join(root, mesh)
+        os.makedirs(folder, exist_ok=True)
+        for map_name in TEXTURE_MAPS:
+            file_path = os.path.abspath(os.path.join(folder, f"{mesh}_{map_name}{extension}"))
+            open(file_path, "w").close()
+            file_paths.append(file_path)
+    return file_paths
+
+
+def generate_scene(light_count, mesh_count, texture_root=None):
+    """Reset the fake scene and fill it.
+    Args:
+        light_count (int): number of lights, of mixed types
+        mesh_count (int): number of meshes
+        texture_root (str): folder receiving the texture files, no textures when None
+    Returns: (light shapes, mesh transforms, texture file paths)
+    """
+    SCENE.reset()
+    lights = create_lights(light_count)
+    meshes = create_meshes(mesh_count)
+    textures = create_texture_folder(texture_root, meshes) if texture_root else []
+    return lights, meshes, textures
@@ -0,0 +1,112 @@
+# Author: Guillaume Cournet
+# Date: April 13, 2023
+
+"""copyLightAttributes: undoable command writing many light attributes in one DG modifier pass.
+
+The writes come as a JSON plan, a list of [plug, value, attribute type] where the type is the
+one returned by cmds.getAttr(type=True) and the value is in the UI units, like setAttr expects.
+Every value is queued on one MDGModifier and applied in a single pass: the whole copy is one
+undo step, and the modifier keeps the previous values, so undo and redo never query Maya.
+The command returns the plugs it could not write (missing, locked or connected).
+
+Usage, from the script editor:
+    cmds.loadPlugin("C:/tools/copy_light_attributes_cmd.py")
+    cmds.copyLightAttributes(plan=json.dumps([["pointLightShape1.intensity", 2.0, "float"]]))
+"""
+
+import json
+
+import maya.api.OpenMaya as om2
+
+
+def maya_useNewAPI():
+    """The plug-in uses the Maya Python API 2.0"""
+    pass
+
+
+class CopyLightAttributesCmd(om2.MPxCommand):
+    COMMAND_NAME = "copyLightAttributes"
+    PLAN_FLAG = "-p"
+    PLAN_FLAG_LONG = "-plan"
+    COMPOUND_TYPES = ["double3", "float3"]
+    INTEGER_TYPES = ["long", "short", "byte", "char", "enum"]
+
+    def __init__(self):
+        super(CopyLightAttributesCmd, self).__init__()
+        self.modifier = om2.MDGModifier()
+        self.failed = []
+
+    @staticmethod
+    def creator():
+        return CopyLightAttributesCmd()
+
+    @classmethod
+    def create_syntax(cls):
+        syntax = om2.MSyntax()
+        syntax.addFlag(cls.PLAN_FLAG, cls.PLAN_FLAG_LONG, om2.MSyntax.kString)
+        return syntax
+
+    def isUndoable(self):
+        return True
+
+    def doIt(self, args):
+        arg_data = om2.MArgDatabase(self.syntax(), args)
+        if not arg_data.isFlagSet(self.PLAN_FLAG):
+            raise RuntimeError(f"{self.COMMAND_NAME}: the {self.PLAN_FLAG_LONG} flag is required")
+        plan = json.loads(arg_data.flagArgumentString(self.PLAN_FLAG, 0))
+
+        nodes = {}  # {"node" : MFnDependencyNode}, each node is found once
+        for plug_name, value, attr_type in plan:
+            plug = self.find_plug(plug_name, nodes)
+            if plug is None or plug.isLocked or plug.isDestination:
+                self.failed.append(plug_name)
+                continue
+            self.add_write(plug, value, attr_type)
+        self.redoIt()
+
+    def redoIt(self):
+        self.modifier.doIt()
+        self.setResult(self.failed)
+
+    def undoIt(self):
+        self.modifier.undoIt()
+
+    @staticmethod
+    def find_plug(plug_name, nodes):
+        node_name, _, attr_name = plug_name.partition(".")
+        try:
+            node_fn = nodes.get(node_name)
+            if node_fn is None:
+                selection = om2.MSelectionList()
+                selection.add(node_name)
+                node_fn = nodes[node_name] = om2.MFnDependencyNode(selection.getDependNode(0))
+            return node_fn.findPlug(attr_name, False)
+        except RuntimeError:
+            return None
+
+    def add_write(self, plug, value, attr_type):
+        if attr_type in self.COMPOUND_TYPES:
+            for index, child_value in enumerate(value):
+                self.modifier.newPlugValueDouble(plug.child(index), child_value)
+        elif attr_type == "bool":
+            self.modifier.newPlugValueBool(plug, bool(value))
+        elif attr_type in self.INTEGER_TYPES:
+            self.modifier.newPlugValueInt(plug, int(value))
+        elif attr_type == "doubleAngle":
+            self.modifier.newPlugValueMAngle(plug, om2.MAngle(value, om2.MAngle.uiUnit()))
+        elif attr_type == "doubleLinear":
+            self.modifier.newPlugValueMDistance(plug, om2.MDistance(value, om2.MDistance.uiUnit()))
+        else:
+            self.modifier.newPlugValueDouble(plug, value)
+
+
+def initializePlugin(plugin):
+    plugin_fn = om2.MFnPlugin(plugin, "Guillaume Cournet", "1.0")
+    plugin_fn.registerCommand(
+        CopyLightAttributesCmd.COMMAND_NAME, CopyLightAttributesCmd.creator, CopyLightAttributesCmd.create_syntax
+    )
+
+
+def uninitializePlugin(plugin):
+    plugin_fn = om2.MFnPlugin(plugin)
+    plugin_fn.deregisterCommand(CopyLightAttributesCmd.COMMAND_NAME)
@@ -4,12 +4,56 @@
 from PySide2 import QtCore
 from PySide2 import QtWidgets
 from shiboken2 import wrapInstance
+import fnmatch
 import itertools
+import json
+import math
+import operator
+import os
+import re
 from PySide2 import QtGui
 
 # import maya.OpenMaya as om
+import maya.api.OpenMaya as om2
 import maya.OpenMayaUI as omui
 import maya.cmds as cmds
+import sys
+
+try:
+    import tool_profiler
+except ImportError:
+    tool_profiler = None
+
+
+profiled = tool_profiler.span if tool_profiler else (lambda name: lambda function: function)
+
+if tool_profiler is not None:
+    tool_profiler.register(sys.modules[__name__])
+
+# the copies run as one undoable copyLightAttributes command when this plug-in file is found
+# next to the tool or on the Python path, else as setAttr calls grouped in an undo chunk
+COPY_COMMAND_PLUGIN_FILE = "copy_light_attributes_cmd.py"
+_copy_command_loaded = None
+
+
+def load_copy_command():
+    """Load the copyLightAttributes plug-in once, return False when its file cannot be found"""
+    global _copy_command_loaded
+    if _copy_command_loaded is None:
+        _copy_command_loaded = False
+        # no __file__ when the tool is pasted in the script editor
+        search_dirs = [os.path.dirname(os.path.abspath(__file__))] if "__file__" in globals() else []
+        for search_dir in search_dirs + sys.path:
+            plugin_path = os.path.join(search_dir, COPY_COMMAND_PLUGIN_FILE)
+            if os.path.isfile(plugin_path):
+                try:
+                    if not cmds.pluginInfo(plugin_path, query=True, loaded=True):
+                        cmds.loadPlugin(plugin_path, quiet=True)
+                    _copy_command_loaded = True
+                except RuntimeError as e:
+                    cmds.warning(f"Cannot load {plugin_path}, the copies use setAttr: {e}")
+                break
+    return _copy_command_loaded
 
 
 def maya_main_window():
@@ -20,6 +64,505 @@ def maya_main_window():
     return wrapInstance(int(main_window_ptr), QtWidgets.QWidget)
 
 
+class SourceLightSnapshot:
+    """Type and value of the copied attributes of the source light, read once for a whole copy"""
+
+    TYPES3_ACCEPTED = ["double3", "float3"]
+    TYPES_ACCEPTED = ["float", "bool", "double", "long", "short", "byte", "enum", "doubleAngle", "doubleLinear"]
+
+    def __init__(self, light_src, attribute_name_list, attribute_types=None):
+        """SourceLightSnapshot Class Constructor to initialize the object.
+        Args:
+            light_src (str): shape of the source light
+            attribute_name_list (list): attributes to copy
+            attribute_types (dict): known {"attribute" : type}, the other types are queried
+        """
+        attribute_types = attribute_types or {}
+        self.light_src = light_src
+        self.attributes = []  # copyable attributes, in the order of attribute_name_list
+        self.unsupported_attributes = []
+        self.types = {}
+        self.values = {}
+        for attribute_name in attribute_name_list:
+            attribute_source = "{0}.{1}".format(light_src, attribute_name)
+            type_attribute = attribute_types.get(attribute_name) or cmds.getAttr(attribute_source, type=True)
+            if type_attribute in self.TYPES3_ACCEPTED:
+                value = tuple(cmds.getAttr(attribute_source)[0])
+            elif type_attribute in self.TYPES_ACCEPTED:
+                value = cmds.getAttr(attribute_source)
+            else:
+                self.unsupported_attributes.append(attribute_name)
+                continue
+            self.attributes.append(attribute_name)
+            self.types[attribute_name] = type_attribute
+            self.values[attribute_name] = value
+
+    def get_unsupported_plugs(self, lights_dest):
+        for light_shape_node in lights_dest:
+            for attribute_name in self.unsupported_attributes:
+                yield "{0}.{1}".format(light_shape_node, attribute_name)
+
+
+class CopyableAttributeCatalog:
+    """Copyable attributes of each light node type, read once per session from the type definition.
+    Only the wanted attributes are kept, with their type and children. The dynamic attributes
+    added on one light are not part of its type, they are listed from the node itself.
+    """
+
+    COMPOUND_TYPES = ["double3", "float3"]
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.node_types = {}  # {"nodeType" : {"attribute" : {"type" : str, "children" : list}}}
+
+    def get(self, node_type, wanted_attributes):
+        catalog = self.node_types.get(node_type)
+        if catalog is None:
+            catalog = self.node_types[node_type] = self.read_node_type(node_type, wanted_attributes)
+        return catalog
+
+    def clear(self):
+        self.node_types = {}
+
+    @profiled("CopyableAttributeCatalog.read_node_type")
+    def read_node_type(self, node_type, wanted_attributes):
+        catalog = {}
+        # the attributes of the type, in definition order, without any node of the type
+        for attr in cmds.attributeInfo(allAttributes=True, type=node_type) or []:
+            if attr not in wanted_attributes or attr in catalog:
+                continue
+            attr_type = cmds.attributeQuery(attr, type=node_type, attributeType=True)
+            children = []
+            if attr_type in self.COMPOUND_TYPES:
+                children = cmds.attributeQuery(attr, type=node_type, listChildren=True) or []
+            catalog[attr] = {"type": attr_type, "children": children}
+        return catalog
+
+    @staticmethod
+    def get_dynamic_attributes(node):
+        """Return the copyable {"attribute" : {"type", "children"}} added on the node itself"""
+        dynamic = {}
+        for attr in cmds.listAttr(node, userDefined=True) or []:
+            # colorR/colorG/colorB are copied through their parent
+            if attr[:-1] in dynamic and dynamic[attr[:-1]]["type"] in CopyableAttributeCatalog.COMPOUND_TYPES:
+                dynamic[attr[:-1]]["children"].append(attr)
+                continue
+            attr_type = cmds.getAttr("{}.{}".format(node, attr), type=True)
+            if attr_type in SourceLightSnapshot.TYPES_ACCEPTED + SourceLightSnapshot.TYPES3_ACCEPTED:
+                dynamic[attr] = {"type": attr_type, "children": []}
+        return dynamic
+
+
+class AttributeMappingTable:
+    """How each copyable attribute of a light node type lands on another light node type.
+    Computed once per (source type, destination type) pair from the catalog of both types:
+    an attribute goes to the attribute of the same name, else to its equivalent of RENAMES
+    (e.g. aiExposure of the Maya lights and exposure of the Arnold lights), converted when
+    the two attribute types differ. The attributes without a compatible equivalent are
+    unsupported for the pair.
+    """
+
+    RENAMES = {
+        "aiExposure": "exposure",
+        "exposure": "aiExposure",
+        "normalize": "aiNormalize",
+        "aiNormalize": "normalize",
+        "resolution": "aiResolution",
+        "aiResolution": "resolution",
+    }
+    FLOAT_TYPES = ["float", "double", "doubleLinear"]
+    INTEGER_TYPES = ["long", "short", "byte"]
+    MISSING = "missing"
+    INCOMPATIBLE = "incompatible type"
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.mappings = {}  # {(source type, destination type) : (mapping, unsupported)}
+
+    def get(self, source_type, dest_type, wanted_attributes):
+        """Return the mapping of a pair of light node types, computed on first use.
+        Returns: {"source attribute" : (destination attribute, destination type, converter)},
+            {"source attribute" : reason it is not copied}
+        """
+        key = (source_type, dest_type)
+        if key not in self.mappings:
+            catalog = CopyableAttributeCatalog.instance()
+            self.mappings[key] = self.map_attributes(
+                catalog.get(source_type, wanted_attributes), catalog.get(dest_type, wanted_attributes)
+            )
+        return self.mappings[key]
+
+    def clear(self):
+        self.mappings = {}
+
+    @classmethod
+    def map_attributes(cls, source_attributes, dest_attributes):
+        mapping = {}
+        unsupported = {}
+        for attr, info in source_attributes.items():
+            dest_attr = attr if attr in dest_attributes else cls.RENAMES.get(attr)
+            if dest_attr not in dest_attributes:
+                unsupported[attr] = cls.MISSING
+                continue
+            dest_type = dest_attributes[dest_attr]["type"]
+            converter = cls.get_converter(info["type"], dest_type)
+            # the fields of an enum only match on the attribute itself
+            if converter is None or (dest_type == "enum" and dest_attr != attr):
+                unsupported[attr] = cls.INCOMPATIBLE
+                continue
+            mapping[attr] = (dest_attr, dest_type, converter)
+        return mapping, unsupported
+
+    @classmethod
+    def get_converter(cls, source_type, dest_type):
+        """Return the function converting a value of the source type to the destination type, None if none"""
+        compound_types = SourceLightSnapshot.TYPES3_ACCEPTED
+        if source_type == dest_type or (source_type in compound_types and dest_type in compound_types):
+            return cls.keep_value
+        if source_type in compound_types or dest_type in compound_types:
+            return None
+        # getAttr and setAttr use the UI angle unit, the float angles of Arnold are in degrees
+        if source_type == "doubleAngle":
+            return cls.angle_to_degrees if dest_type in cls.FLOAT_TYPES else None
+        if dest_type == "doubleAngle":
+            return cls.degrees_to_angle if source_type in cls.FLOAT_TYPES else None
+        if dest_type == "bool":
+            return bool
+        if dest_type in cls.INTEGER_TYPES:
+            return cls.to_integer
+        if dest_type in cls.FLOAT_TYPES:
+            return float
+        return None
+
+    @staticmethod
+    def keep_value(value):
+        return value
+
+    @staticmethod
+    def to_integer(value):
+        return int(round(value))
+
+    @staticmethod
+    def angle_to_degrees(value):
+        return math.degrees(value) if cmds.currentUnit(query=True, angle=True) == "rad" else value
+
+    @staticmethod
+    def degrees_to_angle(value):
+        return math.radians(value) if cmds.currentUnit(query=True, angle=True) == "rad" else value
+
+    def get_compatibility(self, source_type, dest_type, attributes, wanted_attributes):
+        """Return the attributes copied as is, the ones renamed or converted, and the unsupported ones"""
+        mapping, unsupported = self.get(source_type, dest_type, wanted_attributes)
+        direct, converted, missing = [], [], []
+        for attr in attributes:
+            if attr in mapping:
+                dest_attr, _, converter = mapping[attr]
+                (direct if dest_attr == attr and converter is self.keep_value else converted).append(attr)
+            elif attr in unsupported:
+                missing.append(attr)
+        return direct, converted, missing
+
+
+class IndexedLight:
+    """One light of the LightIndex: its names, node type and the plugs read by the rules"""
+
+    def __init__(self, handle, node_type, uuid):
+        self.handle = handle
+        self.node_type = node_type
+        self.uuid = uuid
+        self.plugs = {}  # {"attribute" : MPlug or None when the light has no such attribute}
+        self.names = None
+        self.refresh_names()
+
+    def is_valid(self):
+        return self.handle.isValid() and self.handle.isAlive()
+
+    def refresh_names(self):
+        """Read the names of the light again, return True when one of them changed"""
+        dag_path = om2.MDagPath.getAPathTo(self.handle.object())
+        shape = dag_path.partialPathName()
+        # every node of the path, a rename or a reparent of one of them can change the names
+        path_names = dag_path.fullPathName().split("|")[1:]
+        transform_path = om2.MDagPath(dag_path)
+        transform_path.pop()
+        names = (shape, transform_path.partialPathName(), path_names)
+        if names == self.names:
+            return False
+        self.names = names
+        self.shape, self.transform, self.path_names = names
+        self.parent = path_names[-3] if len(path_names) > 2 else ""
+        self.namespace = path_names[-2].rpartition(":")[0] if len(path_names) > 1 else ""
+        return True
+
+    def get_value(self, attr_name, attr_type=None):
+        """Return the value of a numeric attribute read through the API, None when the light has none"""
+        if attr_name not in self.plugs:
+            try:
+                self.plugs[attr_name] = om2.MFnDependencyNode(self.handle.object()).findPlug(attr_name, False)
+            except RuntimeError:
+                self.plugs[attr_name] = None
+        plug = self.plugs[attr_name]
+        if plug is None or plug.isCompound:
+            return None
+        # the rules compare angles and distances in the UI units, like getAttr
+        if attr_type == "doubleAngle":
+            return plug.asMAngle().asUnits(om2.MAngle.uiUnit())
+        if attr_type == "doubleLinear":
+            return plug.asMDistance().asUnits(om2.MDistance.uiUnit())
+        return plug.asDouble()
+
+
+class LightIndex(QtCore.QObject):
+    """In-memory index of the lights of the scene, evaluated by the destination rules.
+    Built with a single ls, then kept up to date by callbacks: the lights created or deleted
+    are added or removed, and a light reads its names again only when a node of its path is
+    renamed or reparented. Changes are applied together on a short timer, then reported once
+    with the lights added, removed and renamed.
+    """
+
+    UPDATE_INTERVAL = 50  # milliseconds
+
+    rebuilt = QtCore.Signal()
+    lights_added = QtCore.Signal(list)  # [IndexedLight]
+    lights_removed = QtCore.Signal(list)  # ["uuid"]
+    lights_renamed = QtCore.Signal(list)  # [IndexedLight]
+    changed = QtCore.Signal()  # after the signals above, when at least one light changed
+
+    def __init__(self, parent=None):
+        super(LightIndex, self).__init__(parent)
+        self.lights = {}  # {"uuid" : IndexedLight}, in scene order
+        self.lights_by_name = {}  # {"node name in the path" : {"uuid"}}
+        self.callback_ids = []
+        self.added_handles = []  # lights created since the last update, parented once the command is over
+        self.removed_uuids = []
+        self.renamed_uuids = set()
+
+        self.update_timer = QtCore.QTimer(self)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.setInterval(self.UPDATE_INTERVAL)
+        self.update_timer.timeout.connect(self.update)
+
+    @profiled("LightIndex.build")
+    def build(self):
+        self.lights = {}
+        self.lights_by_name = {}
+        self.added_handles = []
+        self.removed_uuids = []
+        self.renamed_uuids = set()
+        shape_names = cmds.ls(type=cmds.listNodeTypes("light"))
+        if shape_names:
+            selection = om2.MSelectionList()
+            for shape_name in shape_names:
+                selection.add(shape_name)
+            for index in range(selection.length()):
+                self.add_light(selection.getDependNode(index))
+        self.rebuilt.emit()
+        self.changed.emit()
+
+    def add_light(self, node):
+        node_fn = om2.MFnDependencyNode(node)
+        uuid = node_fn.uuid().asString()
+        if uuid in self.lights:
+            return None
+        light = self.lights[uuid] = IndexedLight(om2.MObjectHandle(node), node_fn.typeName, uuid)
+        self.add_names(light)
+        return light
+
+    def add_names(self, light):
+        for name in light.path_names:
+            self.lights_by_name.setdefault(name, set()).add(light.uuid)
+
+    def remove_names(self, light):
+        for name in light.path_names:
+            uuids = self.lights_by_name.get(name)
+            if uuids is not None:
+                uuids.discard(light.uuid)
+                if not uuids:
+                    del self.lights_by_name[name]
+
+    def find(self, rule):
+        """Return the IndexedLight matching a LightRule, in scene order"""
+        return [light for light in self.lights.values() if light.is_valid() and rule.matches(light)]
+
+    def has_callbacks(self):
+        return bool(self.callback_ids)
+
+    def create_callbacks(self):
+        self.delete_callbacks()
+        for node_type in cmds.listNodeTypes("light") or []:
+            self.callback_ids.append(om2.MDGMessage.addNodeAddedCallback(self.on_light_added, node_type))
+            self.callback_ids.append(om2.MDGMessage.addNodeRemovedCallback(self.on_light_removed, node_type))
+        # renames and reparents of any node, only the lights with that node in their path are read again
+        self.callback_ids.append(om2.MNodeMessage.addNameChangedCallback(om2.MObject.kNullObj, self.on_name_changed))
+        self.callback_ids.append(om2.MDagMessage.addParentAddedCallback(self.on_parent_added))
+
+    def delete_callbacks(self):
+        if self.callback_ids:
+            om2.MMessage.removeCallbacks(self.callback_ids)
+        self.callback_ids = []
+        self.update_timer.stop()
+
+    def on_light_added(self, node, client_data):
+        self.added_handles.append(om2.MObjectHandle(node))
+        self.update_timer.start()
+
+    def on_light_removed(self, node, client_data):
+        light = self.lights.pop(om2.MFnDependencyNode(node).uuid().asString(), None)
+        if light is not None:
+            self.remove_names(light)
+            self.removed_uuids.append(light.uuid)
+            self.update_timer.start()
+
+    def on_name_changed(self, node, previous_name, client_data):
+        self.mark_renamed(previous_name)
+
+    def on_parent_added(self, child_path, parent_path, client_data):
+        self.mark_renamed(child_path.fullPathName().rsplit("|", 1)[-1])
+
+    def mark_renamed(self, name):
+        uuids = self.lights_by_name.get(name)
+        if uuids:
+            self.renamed_uuids.update(uuids)
+            self.update_timer.start()
+
+    @profiled("LightIndex.update")
+    def update(self):
+        added = []
+        added_handles, self.added_handles = self.added_handles, []
+        for handle in added_handles:
+            if handle.isValid() and handle.isAlive():
+                light = self.add_light(handle.object())
+                if light is not None:
+                    added.append(light)
+        renamed = []
+        renamed_uuids, self.renamed_uuids = self.renamed_uuids, set()
+        for uuid in renamed_uuids:
+            light = self.lights.get(uuid)
+            if light is None or light in added or not light.is_valid():
+                continue
+            self.remove_names(light)
+            if light.refresh_names():
+                renamed.append(light)
+            self.add_names(light)
+        removed, self.removed_uuids = self.removed_uuids, []
+
+        if removed:
+            self.lights_removed.emit(removed)
+        if added:
+            self.lights_added.emit(added)
+        if renamed:
+            self.lights_renamed.emit(renamed)
+        if removed or added or renamed:
+            self.changed.emit()
+
+
+class LightRule:
+    """Destination rule evaluated on the LightIndex.
+    Alternatives are separated by "|", the terms of an alternative must all match:
+        aiAreaLight or type:aiAreaLight     node type of the light
+        name:^rim_                          regex searched in the transform name
+        parent:KEY_*                        glob on the parent group of the transform
+        ns:shot010*                         glob on the namespace, "ns:" for no namespace
+        aiSamples<2                         attribute predicate, with < <= > >= = !=
+    Any other word is a regex searched in the transform name.
+    Example: "aiAreaLight aiSamples<2 | parent:KEY_GRP"
+    """
+
+    PREDICATE_RE = re.compile(r"^(\w+)(<=|>=|!=|<|>|=)(.+)$")
+    OPERATORS = {
+        "<": operator.lt,
+        "<=": operator.le,
+        ">": operator.gt,
+        ">=": operator.ge,
+        "=": operator.eq,
+        "!=": operator.ne,
+    }
+    VALUE_WORDS = {"true": 1.0, "on": 1.0, "false": 0.0, "off": 0.0}
+
+    def __init__(self, text="", node_types=None, attribute_types=None):
+        """LightRule Class Constructor to initialize the object.
+        Args:
+            text (str): the rule, see the class description
+            node_types (set): node types of the lights, a bare word among them matches the type
+            attribute_types (function): returns the {"attribute" : type} of a node type, for the units
+        Raises:
+            ValueError: invalid regex or predicate value
+        """
+        self.text = text
+        self.node_types = node_types or set()
+        self.attribute_types = attribute_types
+        self.alternatives = []  # [[(kind, data)]]
+        for alternative in text.split("|"):
+            terms = [self.parse_term(term) for term in alternative.split()]
+            if terms:
+                self.alternatives.append(terms)
+
+    def parse_term(self, term):
+        kind, _, data = term.partition(":")
+        if kind == "type" and data:
+            return ("type", data)
+        if kind == "name" and data:
+            return ("name", self.compile_regex(data))
+        if kind == "parent" and data:
+            return ("parent", data)
+        if kind == "ns":
+            return ("namespace", data)
+        match = self.PREDICATE_RE.match(term)
+        if match:
+            attr_name, operator_name, value = match.groups()
+            value = self.VALUE_WORDS.get(value.lower(), value)
+            try:
+                value = float(value)
+            except ValueError:
+                raise ValueError(f"{term}: {value} is not a number")
+            return ("predicate", (attr_name, self.OPERATORS[operator_name], value))
+        if term in self.node_types:
+            return ("type", term)
+        return ("name", self.compile_regex(term))
+
+    @staticmethod
+    def compile_regex(pattern):
+        try:
+            return re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"{pattern}: {e}")
+
+    def is_empty(self):
+        return not self.alternatives
+
+    def matches(self, light):
+        return any(all(self.match_term(light, term) for term in terms) for terms in self.alternatives)
+
+    def match_term(self, light, term):
+        kind, data = term
+        if kind == "type":
+            return light.node_type == data
+        if kind == "name":
+            return data.search(light.transform.rsplit("|", 1)[-1]) is not None
+        if kind == "parent":
+            return fnmatch.fnmatchcase(light.parent, data)
+        if kind == "namespace":
+            return fnmatch.fnmatchcase(light.namespace, data) if data else not light.namespace
+        attr_name, compare, value = data
+        attr_type = self.attribute_types(light.node_type).get(attr_name) if self.attribute_types else None
+        current = light.get_value(attr_name, attr_type)
+        return current is not None and compare(current, value)
+
+
 class CopyLightDialog(QtWidgets.QDialog):
     # constant to keep clean code
     # double values to get the right aspect ratio!
@@ -52,6 +595,11 @@ class CopyLightDialog(QtWidgets.QDialog):
     BTN_BACKGROUND_COLOR = "#00743F"
     FONT_COLOR_DESC = "#F2A104"
     FONT_COLOR_TITLE = "white"
+    # Color of the destination lights, by compatibility with the source light
+    COMPATIBLE_COLOR = "#7FD88F"
+    CONVERTED_COLOR = "#F2A104"
+    INCOMPATIBLE_COLOR = "#E0605A"
+    RULE_INTERVAL = 250  # milliseconds after the last keystroke
     # Font for the widgets
     FONT_SIZE_TITLE = "17"
     FONT_SIZE_LABEL = "12"
@@ -72,14 +620,18 @@ class CopyLightDialog(QtWidgets.QDialog):
             <br>
             <li>Click the copy button</li>
             <br>
-            <li>If you create a new light click on the update button to make her appear</li>
+            <li>Or type a destination rule, e.g. aiAreaLight aiSamples&lt;2 | parent:KEY_GRP,
+            and click the copy to rule button</li>
         </ul>"""
     )
 
     def __init__(self, parent=maya_main_window()):
-        print("init()")
         super(CopyLightDialog, self).__init__(parent)
         self.create_all_list_wanted_attr()
+        # the lists and the destination rules read the lights from the index, kept up to date by callbacks
+        self.light_index = LightIndex(self)
+        self.lights_items_in_scene = []
+        self.light_rule = LightRule()
         self.setWindowTitle("LIGHTS COPY ATTRIBUTES")
         # self.setFixedWidth(220)
         # self.setWindowFlags(self.windowFlags() ^ QtCore.Qt.WindowContextHelpButtonHint)
@@ -87,11 +639,7 @@ class CopyLightDialog(QtWidgets.QDialog):
         self.create_layout()
         self.create_connections()
         self.custom_set_style_sheet()
-
-        self.populate_lights_items_in_scene_list()
-        self.populate_lights_src_wdg_list()
-        self.populate_lights_dest_wdg_list()
-        print(self.lights_items_in_scene)
+        # the lists are filled when the dialog is shown, from the light index built then
 
         # ["1920x1080 (1080p)", 1920.0, 1080.0],
         # ["lightTransformName", "lightShapeName"],
@@ -102,7 +650,6 @@ class CopyLightDialog(QtWidgets.QDialog):
         # self.populate_lights_dest_list()
 
     def custom_set_style_sheet(self):
-        print("function style for widget")
         self.setStyleSheet("background-color : #192E5B;")
         self.set_style_sheet_list_wdg(self.attributes_src_list_wdg, self.THIRD_BACKGROUND_COLOR, self.FONT_LIST)
         self.set_style_sheet_list_wdg(self.lights_src_list_wdg, self.SECOND_BACKGROUND_COLOR, self.FONT_LIST)
@@ -126,6 +673,11 @@ class CopyLightDialog(QtWidgets.QDialog):
         self.set_style_sheet_btn(self.update_btn_wdg, self.BTN_BACKGROUND_COLOR, self.FONT_LABEL_DESC)
         self.set_style_sheet_btn(self.update_btn_wdg, self.BTN_BACKGROUND_COLOR, self.FONT_LABEL_DESC)
         self.set_style_sheet_btn(self.close_btn, self.BTN_BACKGROUND_COLOR, self.FONT_LABEL_DESC)
+        self.set_style_sheet_btn(self.select_rule_btn, self.BTN_BACKGROUND_COLOR, self.FONT_LABEL_DESC)
+        self.set_style_sheet_btn(self.copy_rule_btn, self.BTN_BACKGROUND_COLOR, self.FONT_LABEL_DESC)
+        self.set_style_sheet_Desc_Label_wdg(
+            self.rule_count_lbl, self.FONT_COLOR_TITLE, self.FONT_LABEL_DESC, self.FONT_SIZE_LABEL
+        )
 
     def set_style_sheet_list_wdg(self, wdg_list, background_color, font_type):
         wdg_list.setFont(font_type)
@@ -439,6 +991,17 @@ class CopyLightDialog(QtWidgets.QDialog):
 
         self.close_btn = QtWidgets.QPushButton("Close")
 
+        # destination rule, matched against the light index
+        self.rule_le = QtWidgets.QLineEdit()
+        self.rule_le.setPlaceholderText("Destination rule: aiAreaLight aiSamples<2 | parent:KEY_GRP | name:^rim_")
+        self.rule_le.setClearButtonEnabled(True)
+        self.rule_count_lbl = QtWidgets.QLabel()
+        self.select_rule_btn = QtWidgets.QPushButton("Select")
+        self.copy_rule_btn = QtWidgets.QPushButton(">>Copy to Rule>>")
+        self.rule_timer = QtCore.QTimer(self)
+        self.rule_timer.setSingleShot(True)
+        self.rule_timer.setInterval(self.RULE_INTERVAL)
+
     def create_layout(self):
         main_layout = QtWidgets.QVBoxLayout(self)
 
@@ -476,8 +1039,15 @@ class CopyLightDialog(QtWidgets.QDialog):
         list_layout.addLayout(light_dest_layout)
         list_layout.addStretch()
 
+        rule_layout = QtWidgets.QHBoxLayout()
+        rule_layout.addWidget(self.rule_le)
+        rule_layout.addWidget(self.rule_count_lbl)
+        rule_layout.addWidget(self.select_rule_btn)
+        rule_layout.addWidget(self.copy_rule_btn)
+
         main_layout.addLayout(title_layout)
         main_layout.addLayout(list_layout)
+        main_layout.addLayout(rule_layout)
         main_layout.addLayout(button_layout)
 
     def create_connections(self):
@@ -485,43 +1055,143 @@ class CopyLightDialog(QtWidgets.QDialog):
         # self.close_btn.clicked.connect(self.close)
         self.copy_btn_wdg.clicked.connect(self.on_click_copy_attributes)
         self.lights_src_list_wdg.itemClicked.connect(self.display_attributes_src_light)
-        self.update_btn_wdg.clicked.connect(self.update_ui)
+        self.attributes_src_list_wdg.itemSelectionChanged.connect(self.update_dest_compatibility)
+        self.update_btn_wdg.clicked.connect(self.rebuild_light_index)
+        self.close_btn.clicked.connect(self.close)
+        self.rule_le.textChanged.connect(self.rule_timer.start)
+        self.rule_timer.timeout.connect(self.apply_rule)
+        self.select_rule_btn.clicked.connect(self.select_rule_lights)
+        self.copy_rule_btn.clicked.connect(self.on_click_copy_to_rule)
+        self.light_index.rebuilt.connect(self.update_ui)
+        self.light_index.lights_added.connect(self.add_light_rows)
+        self.light_index.lights_removed.connect(self.remove_light_rows)
+        self.light_index.lights_renamed.connect(self.rename_light_rows)
+        self.light_index.changed.connect(self.apply_rule)
 
+    @profiled("CopyLightDialog.populate_lights_items_in_scene_list")
     def populate_lights_items_in_scene_list(self):
-        self.lights_shapes = self.get_lights_in_scene()
-        # populate dict
-        for shape_name in self.lights_shapes:
-            transform_name = self.get_transform_name(shape_name)
-            print(transform_name, shape_name)
-            self.lights_items_in_scene.append([transform_name, shape_name])
+        self.lights_items_in_scene = [
+            [light.transform, light.shape, light.node_type, light.uuid]
+            for light in self.light_index.lights.values()
+            if light.is_valid()
+        ]
 
+    @profiled("CopyLightDialog.update_ui")
     def update_ui(self):
-        print("update_ui()")
-        self.lights_items_in_scene = []
+        # the lists are filled again from the whole index once it is rebuilt, the selected lights stay selected
+        selected_src = [item.data(QtCore.Qt.UserRole)[0] for item in self.lights_src_list_wdg.selectedItems()]
+        selected_dest = [item.data(QtCore.Qt.UserRole)[0] for item in self.lights_dest_list_wdg.selectedItems()]
         self.lights_src_list_wdg.clear()
         self.lights_dest_list_wdg.clear()
         self.populate_lights_items_in_scene_list()
         self.populate_lights_src_wdg_list()
         self.populate_lights_dest_wdg_list()
+        self.select_list_items(self.lights_src_list_wdg, selected_src)
+        self.select_list_items(self.lights_dest_list_wdg, selected_dest)
+        self.update_dest_compatibility()
+
+    def rebuild_light_index(self):
+        self.light_index.build()
+
+    def create_light_row(self, transform, shape, node_type, uuid):
+        lst_wdg_item = QtWidgets.QListWidgetItem(transform)
+        lst_wdg_item.setData(QtCore.Qt.UserRole, [shape, node_type, uuid])
+        return lst_wdg_item
+
+    @profiled("CopyLightDialog.add_light_rows")
+    def add_light_rows(self, lights):
+        for light in lights:
+            self.lights_items_in_scene.append([light.transform, light.shape, light.node_type, light.uuid])
+            self.lights_src_list_wdg.addItem(
+                self.create_light_row(light.transform, light.shape, light.node_type, light.uuid)
+            )
+            dest_item = self.create_light_row(light.transform, light.shape, light.node_type, light.uuid)
+            self.lights_dest_list_wdg.addItem(dest_item)
+            self.update_dest_item_compatibility(dest_item, *self.get_compatibility_source())
+
+    @profiled("CopyLightDialog.remove_light_rows")
+    def remove_light_rows(self, uuids):
+        uuids = set(uuids)
+        self.lights_items_in_scene = [item for item in self.lights_items_in_scene if item[3] not in uuids]
+        for list_wdg in [self.lights_src_list_wdg, self.lights_dest_list_wdg]:
+            for row in reversed(range(list_wdg.count())):
+                if list_wdg.item(row).data(QtCore.Qt.UserRole)[2] in uuids:
+                    list_wdg.takeItem(row)
+
+    @profiled("CopyLightDialog.rename_light_rows")
+    def rename_light_rows(self, lights):
+        lights = {light.uuid: light for light in lights}
+        for item in self.lights_items_in_scene:
+            light = lights.get(item[3])
+            if light is not None:
+                item[0], item[1] = light.transform, light.shape
+        for list_wdg in [self.lights_src_list_wdg, self.lights_dest_list_wdg]:
+            for row in range(list_wdg.count()):
+                item = list_wdg.item(row)
+                shape, node_type, uuid = item.data(QtCore.Qt.UserRole)
+                light = lights.get(uuid)
+                if light is not None:
+                    item.setText(light.transform)
+                    item.setData(QtCore.Qt.UserRole, [light.shape, node_type, uuid])
+
+    def select_list_items(self, list_wdg, shapes):
+        shapes = set(shapes)
+        for row in range(list_wdg.count()):
+            item = list_wdg.item(row)
+            item.setSelected(item.data(QtCore.Qt.UserRole)[0] in shapes)
+
+    def get_attribute_types(self, node_type):
+        catalog = CopyableAttributeCatalog.instance().get(node_type, self.all_wanted_attributes)
+        return {attr: info["type"] for attr, info in catalog.items()}
+
+    @profiled("CopyLightDialog.apply_rule")
+    def apply_rule(self):
+        """Parse the destination rule and display how many lights it matches"""
+        node_types = set(cmds.listNodeTypes("light") or [])
+        try:
+            self.light_rule = LightRule(self.rule_le.text(), node_types, self.get_attribute_types)
+        except ValueError as e:
+            self.light_rule = LightRule()
+            self.rule_count_lbl.setText("invalid rule")
+            self.rule_count_lbl.setToolTip(str(e))
+            return
+        self.rule_count_lbl.setToolTip("")
+        if self.light_rule.is_empty():
+            self.rule_count_lbl.setText("")
+        else:
+            self.rule_count_lbl.setText(f"{len(self.get_rule_lights())} lights")
+
+    def get_rule_lights(self):
+        """Return the shapes of the lights matching the destination rule"""
+        if self.light_rule.is_empty():
+            return []
+        return [light.shape for light in self.light_index.find(self.light_rule)]
+
+    def select_rule_lights(self):
+        self.apply_rule()
+        self.select_list_items(self.lights_dest_list_wdg, self.get_rule_lights())
+
+    @profiled("CopyLightDialog.on_click_copy_to_rule")
+    def on_click_copy_to_rule(self):
+        self.apply_rule()
+        light_src_items = self.lights_src_list_wdg.selectedItems()
+        if not light_src_items or self.light_rule.is_empty():
+            cmds.warning("Select a source light and type a destination rule")
+            return
+        shape_light_src = light_src_items[0].data(QtCore.Qt.UserRole)[0]
+        attr_names_list = [x.text() for x in self.attributes_src_list_wdg.selectedItems()]
+        shapes_lights_dest = [shape for shape in self.get_rule_lights() if shape != shape_light_src]
+        self.copy_arguments(shape_light_src, attr_names_list, shapes_lights_dest)
 
     def populate_lights_src_wdg_list(self):
-        print("populate_lights_src_list")
         for l_src_item in self.lights_items_in_scene:
-            lst_wdg_item = QtWidgets.QListWidgetItem(l_src_item[0])
-            print(l_src_item)
-            lst_wdg_item.setData(QtCore.Qt.UserRole, [l_src_item[1]])
-            self.lights_src_list_wdg.addItem(lst_wdg_item)
+            self.lights_src_list_wdg.addItem(self.create_light_row(*l_src_item))
 
     def populate_lights_dest_wdg_list(self):
-        print("populate_lights_src_list")
         for l_src_item in self.lights_items_in_scene:
-            lst_wdg_item = QtWidgets.QListWidgetItem(l_src_item[0])
-            print(l_src_item)
-            lst_wdg_item.setData(QtCore.Qt.UserRole, [l_src_item[1]])
-            self.lights_dest_list_wdg.addItem(lst_wdg_item)
+            self.lights_dest_list_wdg.addItem(self.create_light_row(*l_src_item))
 
     def populate_attrs_list(self, attrs):
-        print("populate_attrs_list")
         self.attributes_src_list_wdg.clear()
         for attr in attrs:
             lst_wdg_item = QtWidgets.QListWidgetItem(attr)
@@ -531,134 +1201,213 @@ class CopyLightDialog(QtWidgets.QDialog):
             # )
             self.attributes_src_list_wdg.addItem(lst_wdg_item)
 
+    @profiled("CopyLightDialog.display_attributes_src_light")
     def display_attributes_src_light(self, item):
-        print("display_attributes_src_light()")
-
-        light_transform = item.text()
         item_data = item.data(QtCore.Qt.UserRole)
         light_shape = item_data[0]
         attrs = self.listing_attributes(light_shape)
-        print(len(attrs), light_transform, attrs)
         self.populate_attrs_list(attrs)
+        self.update_dest_compatibility()
+
+    def update_dest_compatibility(self):
+        """Color each destination light by how the selected attributes (all of them by default) copy to its type:
+        green when copied as is, orange when some are renamed or converted, red when some cannot be copied.
+        """
+        source_type, attributes = self.get_compatibility_source()
+        for row in range(self.lights_dest_list_wdg.count()):
+            self.update_dest_item_compatibility(self.lights_dest_list_wdg.item(row), source_type, attributes)
+
+    def get_compatibility_source(self):
+        """Return the source light type, None without source, and the attributes the colors are computed for"""
+        source_items = self.lights_src_list_wdg.selectedItems()
+        attributes = [item.text() for item in self.attributes_src_list_wdg.selectedItems()]
+        if not attributes:
+            attributes_list_wdg = self.attributes_src_list_wdg
+            attributes = [attributes_list_wdg.item(row).text() for row in range(attributes_list_wdg.count())]
+        source_type = source_items[0].data(QtCore.Qt.UserRole)[1] if source_items else None
+        return source_type, attributes
 
+    def update_dest_item_compatibility(self, item, source_type, attributes):
+        if source_type is None:
+            item.setData(QtCore.Qt.ForegroundRole, None)
+            item.setToolTip("")
+            return
+        dest_type = item.data(QtCore.Qt.UserRole)[1]
+        direct, converted, missing = AttributeMappingTable.instance().get_compatibility(
+            source_type, dest_type, attributes, self.all_wanted_attributes
+        )
+        color = self.COMPATIBLE_COLOR
+        if missing:
+            color = self.INCOMPATIBLE_COLOR
+        elif converted:
+            color = self.CONVERTED_COLOR
+        item.setForeground(QtGui.QColor(color))
+        tooltip = [f"{dest_type}: {len(direct)} copied"]
+        if converted:
+            tooltip.append("renamed or converted: " + ", ".join(converted))
+        if missing:
+            tooltip.append("not copied: " + ", ".join(missing))
+        item.setToolTip("\n".join(tooltip))
+
+    @profiled("CopyLightDialog.on_click_copy_attributes")
     def on_click_copy_attributes(self):
-        print("copy_attributes()")
 
         light_src_item = self.lights_src_list_wdg.selectedItems()[0]
         shape_light_src = light_src_item.data(QtCore.Qt.UserRole)[0]
-        print(shape_light_src)
         lights_dest_items = self.lights_dest_list_wdg.selectedItems()
         shapes_lights_dest = [x.data(QtCore.Qt.UserRole)[0] for x in lights_dest_items]
-        print(shapes_lights_dest)
         attrs_items = self.attributes_src_list_wdg.selectedItems()
         attr_names_list = [x.text() for x in attrs_items]
-        print(attr_names_list)
 
         self.copy_arguments(shape_light_src, attr_names_list, shapes_lights_dest)
 
+    @profiled("CopyLightDialog.copy_arguments")
     def copy_arguments(self, light_src, attribute_name_list, lights_dest):
-        types3_accepted = ["double3", "float3"]
-        types_accepted = ["float", "bool", "double"]
-        print("in copy argument")
-        print(light_src, attribute_name_list, lights_dest)
-        attr_not_in_dest_light = []
-        attr_copy_success_dest_light = []
-        for light_shape_node in lights_dest:
-            light_dest_attr = self.listing_attributes(light_shape_node)
-            for attribute_name in attribute_name_list:
-                if (
-                    attribute_name in light_dest_attr or attribute_name == "exposure" or attribute_name == "aiExposure"
-                ):  #  and self.check_list_arg(list_attr_light_src,attribute_name):
-                    attribute_dest = "{0}.{1}".format(light_shape_node, attribute_name)
-                    attribute_source = "{0}.{1}".format(light_src, attribute_name)
-                    type_attribute = cmds.getAttr(attribute_source, type=True)
-                    try:
-                        if attribute_name == "aiExposure" and "exposure" in light_dest_attr:
-                            cmds.setAttr(
-                                light_shape_node + "." + "exposure", cmds.getAttr(light_src + "." + attribute_name)
-                            )
-                            attr_copy_success_dest_light.append("{0}.{1}".format(light_shape_node, attribute_name))
-                        elif attribute_name == "exposure" and "aiExposure" in light_dest_attr:
-                            cmds.setAttr(
-                                light_shape_node + "." + "aiExposure", cmds.getAttr(light_src + "." + attribute_name)
-                            )
-                            attr_copy_success_dest_light.append("{0}.{1}".format(light_shape_node, attribute_name))
-                        elif type_attribute in types3_accepted:
-                            d0 = cmds.getAttr(attribute_source)[0][0]
-                            d1 = cmds.getAttr(attribute_source)[0][1]
-                            d2 = cmds.getAttr(attribute_source)[0][2]
-                            cmds.getAttr(
-                                attribute_source, cmds.setAttr(attribute_dest, d0, d1, d2, type=type_attribute)
-                            )
-                        elif type_attribute in types_accepted:
-                            print(cmds.getAttr(light_shape_node + "." + attribute_name))
-                            cmds.setAttr(
-                                light_shape_node + "." + attribute_name, cmds.getAttr(light_src + "." + attribute_name)
-                            )
-                            attr_copy_success_dest_light.append("{0}.{1}".format(light_shape_node, attribute_name))
-                        else:
-                            print("attribute type not recognized : " + type_attribute)
-                    except RuntimeError:
-                        print("type not supported")
-                        attr_not_in_dest_light.append("{0}.{1}".format(light_shape_node, attribute_name))
-                else:
-                    print("Attribute " + attribute_name + " don't exist in : " + light_shape_node)
-                    attr_not_in_dest_light.append("{0}.{1}".format(light_shape_node, attribute_name))
-        print("not copy attributes")
-        print(attr_not_in_dest_light)
-        print("copy attributes success")
-        print(attr_copy_success_dest_light)
-
-    def check_list_arg(self, list_attr_light, argument):
-        if argument not in list_attr_light:
-            print("attribut not in the src list : " + str(argument))
-            return False
+        """Copy the attributes of the source light on the destination lights.
+        Returns: (copied plugs, plugs not copied)
+        """
+        # the source is read once, each destination only gets the writes it can take
+        catalog = CopyableAttributeCatalog.instance()
+        source_type = cmds.objectType(light_src)
+        source_attributes = self.get_copyable_attributes(light_src, source_type)
+        # attributes added on the source itself can only be found on the destinations themselves
+        dynamic_attributes = set(source_attributes) - set(catalog.get(source_type, self.all_wanted_attributes))
+        source = SourceLightSnapshot(
+            light_src,
+            attribute_name_list,
+            {attr: info["type"] for attr, info in source_attributes.items()},
+        )
+        attr_not_in_dest_light = list(source.get_unsupported_plugs(lights_dest))
+        writes = []
+        lights_by_type = {}
+        for light_shape_node, node_type in self.get_node_types(lights_dest):
+            lights_by_type.setdefault(node_type, []).append(light_shape_node)
+        # the mapping of each destination type is resolved once for all its lights
+        for node_type, light_shape_nodes in lights_by_type.items():
+            mapping, _ = AttributeMappingTable.instance().get(source_type, node_type, self.all_wanted_attributes)
+            if dynamic_attributes & set(source.attributes):
+                for light_shape_node in light_shape_nodes:
+                    dynamic_mapping = self.get_dynamic_mapping(source, dynamic_attributes, light_shape_node, node_type)
+                    light_mapping = dict(mapping, **dynamic_mapping)
+                    plan, skipped = self.compile_write_plan(source, [light_shape_node], light_mapping)
+                    writes.extend(plan)
+                    attr_not_in_dest_light.extend(skipped)
+            else:
+                plan, skipped = self.compile_write_plan(source, light_shape_nodes, mapping)
+                writes.extend(plan)
+                attr_not_in_dest_light.extend(skipped)
+        copied, failed = self.execute_write_plan(writes)
+        attr_not_in_dest_light.extend(failed)
+        # a count only, a copy to hundreds of lights would flood the script editor with plug names
+        message = f"Copy light attributes: {len(copied)} copied on {len(lights_dest)} lights"
+        if attr_not_in_dest_light:
+            om2.MGlobal.displayWarning(f"{message}, {len(attr_not_in_dest_light)} not copied")
         else:
-            print("Attribut in the src list : " + str(argument))
-            return True
+            om2.MGlobal.displayInfo(message)
+        return copied, attr_not_in_dest_light
+
+    def get_node_types(self, nodes):
+        """Return [(node, node type)] with a single ls call"""
+        if not nodes:
+            return []
+        names_and_types = cmds.ls(nodes, showType=True)
+        return list(zip(names_and_types[0::2], names_and_types[1::2]))
+
+    def get_dynamic_mapping(self, source, dynamic_attributes, light_shape_node, node_type):
+        """Return the mapping of the attributes added on the source light, to one destination light"""
+        catalog = CopyableAttributeCatalog.instance()
+        dest_attributes = dict(
+            catalog.get(node_type, self.all_wanted_attributes), **catalog.get_dynamic_attributes(light_shape_node)
+        )
+        source_attributes = {
+            attr: {"type": source.types[attr]} for attr in source.attributes if attr in dynamic_attributes
+        }
+        mapping, _ = AttributeMappingTable.map_attributes(source_attributes, dest_attributes)
+        return mapping
 
+    def compile_write_plan(self, source, light_shape_nodes, mapping):
+        """Return the writes of the source values on lights of the same node type.
+        Args:
+            source (SourceLightSnapshot): the attributes of the source light
+            light_shape_nodes (list): shapes of the destination lights
+            mapping (dict): {"source attribute" : (destination attribute, type, converter)} of their type
+        Returns: [(destination plug, value, type, copied plug)], [plugs not copied]
+        """
+        # each value is converted once for all the lights
+        converted = []
+        unmapped = []
+        for attribute_name in source.attributes:
+            if attribute_name not in mapping:
+                unmapped.append(attribute_name)
+                continue
+            dest_attribute, dest_type, converter = mapping[attribute_name]
+            converted.append((attribute_name, dest_attribute, converter(source.values[attribute_name]), dest_type))
+
+        writes = []
+        skipped = []
+        for light_shape_node in light_shape_nodes:
+            for attribute_name, dest_attribute, value, dest_type in converted:
+                writes.append(
+                    (
+                        "{0}.{1}".format(light_shape_node, dest_attribute),
+                        value,
+                        dest_type,
+                        "{0}.{1}".format(light_shape_node, attribute_name),
+                    )
+                )
+            skipped.extend("{0}.{1}".format(light_shape_node, attribute_name) for attribute_name in unmapped)
+        return writes, skipped
+
+    def execute_write_plan(self, writes):
+        """Run every write of the plan as one undo step.
+        Returns: [copied plugs], [plugs not copied]
+        """
+        copied = []
+        failed = []
+        if not writes:
+            return copied, failed
+        if load_copy_command():
+            # a single command and DG modifier pass, undone and redone from the values it keeps
+            plan = [[plug, value, attribute_type] for plug, value, attribute_type, _ in writes]
+            failed_plugs = set(cmds.copyLightAttributes(plan=json.dumps(plan)) or [])
+            for plug, _, _, copied_plug in writes:
+                (failed if plug in failed_plugs else copied).append(copied_plug)
+            return copied, failed
+        cmds.undoInfo(openChunk=True, chunkName="Copy Light Attributes")
+        try:
+            for plug, value, attribute_type, copied_plug in writes:
+                try:
+                    if attribute_type in SourceLightSnapshot.TYPES3_ACCEPTED:
+                        cmds.setAttr(plug, *value, type=attribute_type)
+                    else:
+                        cmds.setAttr(plug, value)
+                    copied.append(copied_plug)
+                except RuntimeError:
+                    # locked or connected attribute
+                    failed.append(copied_plug)
+        finally:
+            cmds.undoInfo(closeChunk=True)
+        return copied, failed
+
+    def get_copyable_attributes(self, node, node_type=None):
+        """Return the {"attribute" : {"type", "children"}} of a light: its type catalog and its dynamic attributes"""
+        node_type = node_type or cmds.objectType(node)
+        attributes = dict(CopyableAttributeCatalog.instance().get(node_type, self.all_wanted_attributes))
+        attributes.update(CopyableAttributeCatalog.get_dynamic_attributes(node))
+        return attributes
+
+    @profiled("CopyLightDialog.listing_attributes")
     def listing_attributes(self, node):
-        print("in listing attribute!!")
-        print(node)
-        # debug_attrs = [
-        #     "publishedNodeInfo.publishedNode",
-        #     "publishedNodeInfo.isHierarchicalNode",
-        #     "publishedNodeInfo.publishedNodeType",
-        #     "instObjGroups.objectGroups.objectGrpCompList",
-        #     "instObjGroups.objectGroups.objectGroupId",
-        #     "instObjGroups.objectGroups.objectGrpColor" "renderLayerInfo.renderLayerId",
-        #     "instObjGroups.objectGroups.objectGrpColor",
-        #     "renderLayerInfo.renderLayerId",
-        #     "renderLayerInfo.renderLayerRenderable" "renderLayerInfo.renderLayerColor",
-        #     "renderLayerInfo.renderLayerRenderable",
-        #     "renderLayerInfo.renderLayerColor",
-        #     "compInstObjGroups.compObjectGroups.compObjectGrpCompList",
-        #     "compInstObjGroups.compObjectGroups.compObjectGroupId",
-        #     "componentTags.componentTagName",
-        #     "componentTags.componentTagContents",
-        # ]
-
-        types_not_allowed = ["message", "TdataCompound", "attributeAlias"]
-        attrs = cmds.listAttr(node)
-        list_attrs_of_light = []
-        print(attrs)
-        for attr in attrs:
-            if attr in self.all_wanted_attributes:
-                type = cmds.getAttr("{}.{}".format(node, attr), typ=True)
-                if type in types_not_allowed:
-                    print("type not allowed :" + type)
-                lastChar = attr[-1]
-                if lastChar == "R" or lastChar == "G" or lastChar == "B":
-                    print("don't use ColorR etc... instead use Color attribute")
-                else:
-                    list_attrs_of_light.append(attr)
-        return list_attrs_of_light
-
-    def get_lights_in_scene(self):
-        return cmds.ls(type=cmds.listNodeTypes("light"))
-
-    def get_transform_name(self, shape_name):
-        return cmds.listRelatives(shape_name, parent=True)[0]
+        return list(self.get_copyable_attributes(node))
+
+    def showEvent(self, event):
+        # the callbacks are detached while the dialog is hidden, the changes made meanwhile are read by a rebuild
+        if not self.light_index.has_callbacks():
+            self.light_index.create_callbacks()
+            self.rebuild_light_index()
+
+    def hideEvent(self, event):
+        self.light_index.delete_callbacks()
 
     # def set_output_res(self, item):
     #     # we get dit and height: [1280.0, 720.0] ... [960.0, 540.0] with data() method
@@ -1,6 +1,15 @@
 # Author: Guillaume Cournet
 # Date: April 13, 2023
 
+import fnmatch
+import json
+import math
+import operator
+import os
+import re
+import sys
+from collections import Counter
+from contextlib import contextmanager
 from functools import partial
 
 
@@ -9,10 +18,16 @@ from PySide2 import QtGui
 from PySide2 import QtWidgets
 from shiboken2 import wrapInstance
 
+import maya.api.OpenMaya as om2
 import maya.cmds as cmds
 import maya.mel as mel
 import maya.OpenMayaUI as omui
 
+try:
+    import tool_profiler
+except ImportError:
+    tool_profiler = None
+
 FONT_LIST = QtGui.QFont("Turis Light")
 FONT_LABEL_DESC = QtGui.QFont("Retro Computer")
 MAIN_BACKGROUND_COLOR = "#192E5B"
@@ -25,53 +40,74 @@ FONT_COLOR_TITLE = "white"
 FONT_SIZE_TITLE = "17"
 FONT_SIZE_LABEL = "12"
 FONT_SIZE_DESC = "13"
-
-
-def set_style_sheet_Desc_Label_wdg(wdg_list, font_color, font_type, font_size):
-    wdg_list.setFont(font_type)
-    wdg_list.setStyleSheet(
-        f"""
-                            color : {font_color};
-                            font-size : {font_size}px;
-                            """
-    )
-
-
-def set_style_sheet_title_wdg(wdg_list, font_type_title, font_size_title):
-    wdg_list.setFont(font_type_title)
-    wdg_list.setStyleSheet(
-        f"""
-                            font-size : {font_size_title}px;
-                            """
-    )
-
-
-def set_style_sheet_btn(wdg_btn, background_color, font_type):
-    wdg_btn.setFont(font_type)
-    wdg_btn.setStyleSheet(
-        f"""
-                            QPushButton{{
-                                        background-color : {background_color};
-                                        border-radius : 3px;
-                                        padding: 5px
-                                        }}
-                            QPushButton:hover{{
-                                        background-color :{THIRD_BACKGROUND_COLOR};
-                                        color : {MAIN_BACKGROUND_COLOR}
-                                        }}
-                        """
-    )
-
-
-def set_style_sheet_double_spine_box_edit(wdg_edit):
-    wdg_edit.setStyleSheet(
-        f"""
-                        QDoubleSpinBox:focus{{
-                            background-color : white;
-                            color : black;
-                        }} 
-    """
-    )
+SPINBOX_TYPES = [
+    "float",
+    "long",
+    "double",
+    "int",
+    "doubleAngle",
+]
+# attribute types read_plug_value can read
+READABLE_TYPES = SPINBOX_TYPES + ["bool", "short", "byte", "char", "enum", "doubleLinear", "float3", "double3"]
+# writes per second to Maya while a value is scrubbed, the last value always lands on release
+SCRUB_MAX_RATE = 15
+# keep the attribute metadata between sessions, in the Maya user prefs folder
+PERSIST_ATTRIBUTE_METADATA = True
+ATTRIBUTE_METADATA_FILE_NAME = "light_manager_attribute_metadata.json"
+
+
+profiled = tool_profiler.span if tool_profiler else (lambda name: lambda function: function)
+
+if tool_profiler is not None:
+    tool_profiler.register(sys.modules[__name__])
+
+
+# theme of the Light Manager, set once on the dialog: the widgets are styled by object name
+# and by dynamic properties, Qt parses it a single time instead of once per widget
+LIGHT_PANEL_STYLE_SHEET = f"""
+LightPanel, QTreeView {{
+    background-color : {MAIN_BACKGROUND_COLOR};
+}}
+QLabel#titleLabel {{
+    font-family : "{FONT_LABEL_DESC.family()}";
+    font-size : {FONT_SIZE_TITLE}px;
+}}
+QLabel#sectionLabel, QLabel#attributeLabel {{
+    font-family : "{FONT_LIST.family()}";
+    font-size : {FONT_SIZE_DESC}px;
+    color : {FONT_COLOR_TITLE};
+}}
+QLabel#sectionLabel {{
+    color : {FONT_COLOR_DESC};
+}}
+QPushButton#actionButton {{
+    font-family : "{FONT_LABEL_DESC.family()}";
+    background-color : {BTN_BACKGROUND_COLOR};
+    border-radius : 3px;
+    padding : 5px;
+}}
+QPushButton#actionButton:hover {{
+    background-color : {THIRD_BACKGROUND_COLOR};
+    color : {MAIN_BACKGROUND_COLOR};
+}}
+QPushButton#lightTypeButton:hover {{
+    background-color : {SECOND_BACKGROUND_COLOR};
+    border-radius : 5px;
+}}
+QDoubleSpinBox:focus {{
+    background-color : white;
+    color : black;
+}}
+LightItem[odd="true"] {{
+    background-color : {SECOND_BACKGROUND_COLOR};
+}}
+LightItem[odd="false"] {{
+    background-color : {SECOND_BACKGROUND_CLOSE_COLOR};
+}}
+QWidget#containerContent[colored="true"] {{
+    background-color : rgb(0, 0, 73);
+}}
+"""
 
 
 def maya_main_window():
@@ -82,6 +118,87 @@ def maya_main_window():
     return wrapInstance(int(main_window_ptr), QtWidgets.QWidget)
 
 
+class LightIconCache:
+    """Icons of the light types, shared by every row and LightItem.
+    Each icon is built once per type. The Arnold icons folder is resolved once, from the
+    location of the loaded MtoA module, and the Maya light icon is used when it is missing.
+    """
+
+    MAYA_ICONS = {
+        "ambientLight": ":ambientLight.svg",
+        "directionalLight": ":directionalLight.svg",
+        "pointLight": ":pointLight.svg",
+        "spotLight": ":spotLight.svg",
+        "areaLight": ":areaLight.svg",
+    }
+    ARNOLD_ICONS = {
+        "aiAreaLight": "AreaLightShelf.png",
+        "aiMeshLight": "MeshLightShelf.png",
+        "aiPhotometricLight": "PhotometricLightShelf.png",
+        "aiSkyDomeLight": "SkyDomeLightShelf.png",
+    }
+    DEFAULT_ICON = ":Light.png"
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.icons = {}  # {"nodeType" : QIcon}
+        self.arnold_icon_dir = None
+        self.arnold_icon_dir_resolved = False
+
+    def get(self, light_type):
+        icon = self.icons.get(light_type)
+        if icon is None:
+            icon = self.icons[light_type] = QtGui.QIcon(self.get_icon_path(light_type))
+        return icon
+
+    def get_icon_path(self, light_type):
+        if light_type in self.MAYA_ICONS:
+            return self.MAYA_ICONS[light_type]
+        if light_type in self.ARNOLD_ICONS and self.get_arnold_icon_dir() is not None:
+            icon_path = os.path.join(self.get_arnold_icon_dir(), self.ARNOLD_ICONS[light_type])
+            if os.path.isfile(icon_path):
+                return icon_path
+        return self.DEFAULT_ICON
+
+    def get_arnold_icon_dir(self):
+        """Return the icons folder of MtoA, None when MtoA is not loaded"""
+        if not self.arnold_icon_dir_resolved:
+            self.arnold_icon_dir_resolved = True
+            self.arnold_icon_dir = self.find_arnold_icon_dir()
+        return self.arnold_icon_dir
+
+    @staticmethod
+    def find_arnold_icon_dir():
+        if not cmds.pluginInfo("mtoa", query=True, loaded=True):
+            return None
+        module_dirs = []
+        try:
+            module_dirs.append(cmds.getModulePath(moduleName="mtoa"))
+        except RuntimeError:
+            # MtoA loaded without its module file, its folder holds plug-ins/mtoa
+            pass
+        plugin_path = cmds.pluginInfo("mtoa", query=True, path=True)
+        if plugin_path:
+            module_dirs.append(os.path.dirname(os.path.dirname(plugin_path)))
+        for module_dir in module_dirs:
+            icon_dir = os.path.join(module_dir, "icons")
+            if os.path.isdir(icon_dir):
+                return icon_dir
+        return None
+
+
+def get_light_type_icon(light_type):
+    """Return the icon displayed for a light node type"""
+    return LightIconCache.instance().get(light_type)
+
+
 class Header(QtWidgets.QWidget):
     """Header class for collapsible group"""
 
@@ -98,6 +215,8 @@ class Header(QtWidgets.QWidget):
         #                     background-color : {SECOND_BACKGROUND_COLOR};
         #                     }}""")
         self.content = content_widget
+        # called once on the first expand, to build the content only when it is shown
+        self.content_builder = None
         self.expand_ico = QtGui.QPixmap(":teDownArrow.png")
         self.collapse_ico = QtGui.QPixmap(":teRightArrow.png")
 
@@ -133,6 +252,9 @@ class Header(QtWidgets.QWidget):
         self.expand() if not self.content.isVisible() else self.collapse()
 
     def expand(self):
+        if self.content_builder is not None:
+            content_builder, self.content_builder = self.content_builder, None
+            content_builder()
         self.content.setVisible(True)
         self.icon.setPixmap(self.expand_ico)
 
@@ -162,10 +284,8 @@ class Container(QtWidgets.QWidget):
         layout = QtWidgets.QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         self._content_widget = QtWidgets.QWidget()
-        if color_background:
-            self._content_widget.setStyleSheet(
-                ".QWidget{background-color: rgb(73, 73, 73); " "margin-left: 2px; margin-right: 2px}"
-            )
+        self._content_widget.setObjectName("containerContent")
+        self._content_widget.setProperty("colored", color_background)
         self.header = Header(name, self._content_widget)
         layout.addWidget(self.header)
         layout.addWidget(self._content_widget)
@@ -203,11 +323,9 @@ class Container(QtWidgets.QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setAlignment(QtCore.Qt.AlignTop)
         self._content_widget = QtWidgets.QWidget()
-
-        if color_background:
-            self._content_widget.setStyleSheet(
-                ".QWidget{background-color: rgb(0, 0, 73); " "margin-left: 0px; margin-right: 0px}"
-            )
+        # colored by the theme of the dialog
+        self._content_widget.setObjectName("containerContent")
+        self._content_widget.setProperty("colored", color_background)
         self.header = Header(name, self._content_widget)
         layout.addWidget(self.header)
         layout.addWidget(self._content_widget)
@@ -224,88 +342,225 @@ class Container(QtWidgets.QWidget):
         """
         return self._content_widget
 
+    def set_content_builder(self, content_builder):
+        """Build the content lazily, the first time the container is expanded
+        Args:
+            content_builder (callable): function filling the content widget
+        """
+        if self._content_widget.isVisible():
+            content_builder()
+        else:
+            self.header.content_builder = content_builder
+
 
 class CustomColorButton(QtWidgets.QWidget):
+    """Color swatch painted by Qt, the color is kept on the widget.
+    Maya's color editor is only opened when the swatch is clicked, so creating
+    and reading the button never goes through a colorSliderGrp.
+    A middle mouse drag scrubs the brightness of the color.
+    """
 
     color_changed = QtCore.Signal(QtGui.QColor)
+    scrub_started = QtCore.Signal()
+    color_scrubbed = QtCore.Signal(QtGui.QColor)
+    scrub_finished = QtCore.Signal()
+
+    BRIGHTNESS_PER_PIXEL = 0.005
 
     def __init__(self, color=QtCore.Qt.white, parent=None):
         super(CustomColorButton, self).__init__(parent)
 
         self.setObjectName("CustomColorButton")
+        self.setCursor(QtCore.Qt.PointingHandCursor)
 
-        self.create_control()
+        self._color = QtGui.QColor(color)
+        self.drag_origin = None  # (mouse x, color) when the drag started
 
         self.set_size(50, 14)
-        self.set_color(color)
-
-    def create_control(self):
-        """1) Create the colorSliderGrp"""
-        window = cmds.window()
-        color_slider_name = cmds.colorSliderGrp()
-
-        """ 2) Find the colorSliderGrp widget """
-        self._color_slider_obj = omui.MQtUtil.findControl(color_slider_name)
-        if self._color_slider_obj:
-            self._color_slider_widget = wrapInstance(int(self._color_slider_obj), QtWidgets.QWidget)
-
-            """ 3) Reparent the colorSliderGrp widget to this widget """
-            main_layout = QtWidgets.QVBoxLayout(self)
-            main_layout.setObjectName("main_layout")
-            main_layout.setContentsMargins(0, 0, 0, 0)
-            main_layout.addWidget(self._color_slider_widget)
-
-            """ 4) Identify/store the colorSliderGrp�s child widgets (and hide if necessary)  """
-            # children = self._color_slider_widget.children()
-            # for child in children:
-            #     # print(child)
-            #     # print(child.objectName())
-            # # print("---")
-
-            self._slider_widget = self._color_slider_widget.findChild(QtWidgets.QWidget, "slider")
-            if self._slider_widget:
-                self._slider_widget.hide()
-
-            self._color_widget = self._color_slider_widget.findChild(QtWidgets.QWidget, "port")
-
-            cmds.colorSliderGrp(
-                self.get_full_name(),
-                e=True,
-                changeCommand=partial(self.on_color_changed),
-            )
-
-        cmds.deleteUI(window, window=True)
-
-    def get_full_name(self):
-        return omui.MQtUtil.fullName(int(self._color_slider_obj))
 
     def set_size(self, width, height):
-        self._color_slider_widget.setFixedWidth(width)
-        self._color_widget.setFixedHeight(height)
+        self.setFixedSize(width, height)
 
     def set_color(self, color):
+        """Display a color, without emitting color_changed (used to follow Maya)"""
         color = QtGui.QColor(color)
-        if color != self.get_color():
-            cmds.colorSliderGrp(
-                self.get_full_name(),
-                e=True,
-                rgbValue=(color.redF(), color.greenF(), color.blueF()),
-            )
-            self.on_color_changed()
+        if color != self._color:
+            self._color = color
+            self.update()
 
     def get_color(self):
-        color_values = cmds.colorSliderGrp(self._color_slider_widget.objectName(), q=True, rgbValue=True)
-        color = cmds.colorSliderGrp(self.get_full_name(), q=True, rgbValue=True)
-        self.setStyleSheet(
-            f"background-color : rgb({str(color_values[0]*255)},{color_values[1]*255},{color_values[2]*255});"
-        )
-        color = QtGui.QColor(color[0] * 255, color[1] * 255, color[2] * 255)
-        return color
+        return QtGui.QColor(self._color)
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.setPen(QtGui.QColor(QtCore.Qt.black))
+        painter.setBrush(self._color)
+        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+
+    def mousePressEvent(self, event):
+        if event.button() == QtCore.Qt.MiddleButton:
+            self.drag_origin = (event.globalPos().x(), QtGui.QColor(self._color))
+            self.scrub_started.emit()
+        super(CustomColorButton, self).mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self.drag_origin is not None:
+            origin_x, origin_color = self.drag_origin
+            hue, saturation, value, _ = origin_color.getHsvF()
+            value = min(max(value + (event.globalPos().x() - origin_x) * self.BRIGHTNESS_PER_PIXEL, 0.0), 1.0)
+            color = QtGui.QColor.fromHsvF(hue, saturation, value)
+            if color != self._color:
+                self._color = color
+                self.update()
+                self.color_scrubbed.emit(self.get_color())
+        super(CustomColorButton, self).mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == QtCore.Qt.MiddleButton and self.drag_origin is not None:
+            self.drag_origin = None
+            self.scrub_finished.emit()
+        elif event.button() == QtCore.Qt.LeftButton and self.rect().contains(event.pos()):
+            self.open_color_editor()
+        super(CustomColorButton, self).mouseReleaseEvent(event)
+
+    def open_color_editor(self):
+        cmds.colorEditor(rgbValue=(self._color.redF(), self._color.greenF(), self._color.blueF()))
+        if not cmds.colorEditor(query=True, result=True):
+            return
+        rgb = cmds.colorEditor(query=True, rgb=True)
+        color = QtGui.QColor.fromRgbF(rgb[0], rgb[1], rgb[2])
+        if color != self._color:
+            self._color = color
+            self.update()
+            self.on_color_changed()
 
     def on_color_changed(self, *args):
         self.color_changed.emit(self.get_color())
 
 
+class ScrubSpinBox(QtWidgets.QDoubleSpinBox):
+    """Double spinbox whose value can be scrubbed with a middle mouse drag or the mouse wheel.
+    A gesture emits scrub_started, then valueChanged while it lasts, then scrub_finished.
+    Typed values still only commit on editingFinished.
+    """
+
+    scrub_started = QtCore.Signal()
+    scrub_finished = QtCore.Signal()
+
+    PIXELS_PER_STEP = 4
+    WHEEL_GESTURE_TIMEOUT = 400  # milliseconds without a wheel step ending the gesture
+
+    def __init__(self, parent=None):
+        super(ScrubSpinBox, self).__init__(parent)
+        self.scrubbing = False
+        self.drag_origin = None  # (mouse x, value) when the drag started
+
+        self.wheel_timer = QtCore.QTimer(self)
+        self.wheel_timer.setSingleShot(True)
+        self.wheel_timer.setInterval(self.WHEEL_GESTURE_TIMEOUT)
+        self.wheel_timer.timeout.connect(self.finish_scrub)
+        # the line edit covers the spinbox and receives its mouse events
+        self.lineEdit().installEventFilter(self)
+
+    def start_scrub(self):
+        if not self.scrubbing:
+            self.scrubbing = True
+            self.scrub_started.emit()
+
+    def finish_scrub(self):
+        self.wheel_timer.stop()
+        if self.scrubbing:
+            self.scrubbing = False
+            self.scrub_finished.emit()
+
+    def eventFilter(self, watched, event):
+        if event.type() == QtCore.QEvent.MouseButtonPress and event.button() == QtCore.Qt.MiddleButton:
+            self.drag_origin = (event.globalPos().x(), self.value())
+            self.start_scrub()
+            return True
+        if event.type() == QtCore.QEvent.MouseMove and self.drag_origin is not None:
+            origin_x, origin_value = self.drag_origin
+            steps = (event.globalPos().x() - origin_x) // self.PIXELS_PER_STEP
+            self.setValue(origin_value + steps * self.singleStep())
+            return True
+        if event.type() == QtCore.QEvent.MouseButtonRelease and self.drag_origin is not None:
+            if event.button() == QtCore.Qt.MiddleButton:
+                self.drag_origin = None
+                self.finish_scrub()
+                return True
+        return super(ScrubSpinBox, self).eventFilter(watched, event)
+
+    def wheelEvent(self, event):
+        self.start_scrub()
+        super(ScrubSpinBox, self).wheelEvent(event)
+        self.wheel_timer.start()
+
+
+class AttributeScrubber(QtCore.QObject):
+    """Live edit of one attribute during an interactive gesture.
+    The values pushed while scrubbing are written at most max_rate times per second,
+    the latest one winning, and the whole gesture is a single undo chunk closed on release.
+    """
+
+    def __init__(self, write, max_rate=SCRUB_MAX_RATE, parent=None):
+        """AttributeScrubber Class Constructor to initialize the object.
+        Args:
+            write (function): write(attribute, value) sending a value to Maya
+            max_rate (int): maximum number of writes per second
+        """
+        super(AttributeScrubber, self).__init__(parent)
+        self.write = write
+        self.attr_name = None  # attribute being scrubbed
+        self.has_pending = False
+        self.pending_value = None
+        self.last_value = None
+
+        self.write_timer = QtCore.QTimer(self)
+        self.write_timer.setSingleShot(True)
+        self.write_timer.setInterval(int(1000 / max_rate))
+        self.write_timer.timeout.connect(self.write_pending)
+
+    def is_scrubbing(self, attr_name=None):
+        return self.attr_name is not None and attr_name in (None, self.attr_name)
+
+    def begin(self, attr_name):
+        if self.attr_name is not None:
+            self.end()
+        self.attr_name = attr_name
+        cmds.undoInfo(openChunk=True, chunkName=f"Light Manager: scrub {attr_name}")
+
+    def push(self, value):
+        """Queue the latest value of the gesture, written now if the last write is old enough"""
+        if self.attr_name is None:
+            return
+        self.pending_value = value
+        self.has_pending = True
+        if not self.write_timer.isActive():
+            self.write_pending()
+
+    def write_pending(self):
+        if not self.has_pending:
+            return
+        value, self.pending_value, self.has_pending = self.pending_value, None, False
+        if value != self.last_value:
+            self.last_value = value
+            self.write(self.attr_name, value)
+        # the next value waits for the interval
+        self.write_timer.start()
+
+    def end(self):
+        if self.attr_name is None:
+            return
+        self.write_timer.stop()
+        try:
+            self.write_pending()
+        finally:
+            self.write_timer.stop()
+            cmds.undoInfo(closeChunk=True)
+            self.attr_name = None
+            self.last_value = None
+
+
 class LightTransformShapeNodes:
     def __init__(self):
         self.dictLights = {}
@@ -335,6 +590,1080 @@ class LightTransformShapeNodes:
         verificationList = cmds.listAttr(light)
 
 
+class AttributeMetadata:
+    """Static description of one attribute of a node type: type, ranges, default and enum fields"""
+
+    FIELDS = ["type", "min", "max", "soft_min", "soft_max", "default", "enum_fields"]
+
+    def __init__(self, type=None, min=None, max=None, soft_min=None, soft_max=None, default=None, enum_fields=None):
+        self.type = type
+        self.min = min
+        self.max = max
+        self.soft_min = soft_min
+        self.soft_max = soft_max
+        self.default = default
+        self.enum_fields = enum_fields
+
+    @classmethod
+    def query(cls, node_name, attr_name):
+        """Query the metadata of an attribute on one node of the wanted type.
+        Returns: AttributeMetadata, None when the node has no such attribute
+        """
+        if not cmds.attributeQuery(attr_name, node=node_name, exists=True):
+            return None
+        metadata = cls(type=cmds.getAttr(f"{node_name}.{attr_name}", typ=True))
+        if metadata.type in SPINBOX_TYPES:
+            if cmds.attributeQuery(attr_name, node=node_name, mne=True):
+                metadata.min = cmds.attributeQuery(attr_name, node=node_name, min=True)[0]
+            if cmds.attributeQuery(attr_name, node=node_name, mxe=True):
+                metadata.max = cmds.attributeQuery(attr_name, node=node_name, max=True)[0]
+            if cmds.attributeQuery(attr_name, node=node_name, softMinExists=True):
+                metadata.soft_min = cmds.attributeQuery(attr_name, node=node_name, softMin=True)[0]
+            if cmds.attributeQuery(attr_name, node=node_name, softMaxExists=True):
+                metadata.soft_max = cmds.attributeQuery(attr_name, node=node_name, softMax=True)[0]
+        if metadata.type == "enum":
+            enum_names = cmds.attributeQuery(attr_name, node=node_name, listEnum=True)
+            metadata.enum_fields = enum_names[0].split(":") if enum_names else []
+        if metadata.type != "message":
+            default = cmds.attributeQuery(attr_name, node=node_name, listDefault=True)
+            if default:
+                metadata.default = default[0] if len(default) == 1 else list(default)
+        return metadata
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field: data.get(field) for field in cls.FIELDS})
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+class AttributeMetadataCache:
+    """Process-wide cache of AttributeMetadata keyed by (node type, attribute).
+    Attribute types, ranges and defaults do not depend on the light instance, so they
+    are queried on the first node of a type and shared with every other one. When
+    PERSIST_ATTRIBUTE_METADATA is on, the cache is also saved to disk under a key made
+    of the Maya and Arnold versions, and a new session starts from that file. New entries
+    only mark the cache dirty, the file is written once by save_if_dirty() at the end of
+    the snapshot or of the pass that queried them.
+    """
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls(persistent=PERSIST_ATTRIBUTE_METADATA)
+        return cls._instance
+
+    def __init__(self, persistent=False):
+        self.metadata = {}  # {"nodeType" : {"attribute" : AttributeMetadata or None}}
+        self.persistent = persistent
+        self.dirty = False
+        self.file_path = None
+        self.version_key = None
+        if self.persistent:
+            self.file_path = os.path.join(cmds.internalVar(userPrefDir=True), ATTRIBUTE_METADATA_FILE_NAME)
+            self.version_key = self.get_version_key()
+            self.load()
+
+    @staticmethod
+    def get_version_key():
+        # the attribute definitions change with Maya and with MtoA
+        arnold_version = "none"
+        if cmds.pluginInfo("mtoa", query=True, loaded=True):
+            arnold_version = cmds.pluginInfo("mtoa", query=True, version=True)
+        return f"maya{cmds.about(version=True)}_mtoa{arnold_version}"
+
+    def get(self, node_type, attr_name):
+        """Return the cached metadata, None when unknown or when the type has no such attribute"""
+        return self.metadata.get(node_type, {}).get(attr_name)
+
+    @profiled("AttributeMetadataCache.get_attributes")
+    def get_attributes(self, node_type, attributes, node_name):
+        """Return the metadata of the attributes of a node type, querying only the unknown ones.
+        Args:
+            node_type (str): type of the node
+            attributes (list): names of the wanted attributes
+            node_name (str): a node of this type, used to query the missing attributes
+        Returns: {attribute name: AttributeMetadata}, attributes missing on the type are left out
+        """
+        type_metadata = self.metadata.setdefault(node_type, {})
+        missing_attributes = [attr_name for attr_name in attributes if attr_name not in type_metadata]
+        for attr_name in missing_attributes:
+            type_metadata[attr_name] = AttributeMetadata.query(node_name, attr_name)
+        if missing_attributes:
+            self.dirty = True
+        return {
+            attr_name: type_metadata[attr_name] for attr_name in attributes if type_metadata[attr_name] is not None
+        }
+
+    def clear(self):
+        self.metadata = {}
+        self.save()
+
+    def load(self):
+        if not self.file_path or not os.path.isfile(self.file_path):
+            return
+        try:
+            with open(self.file_path, "r") as cache_file:
+                data = json.load(cache_file).get(self.version_key, {})
+        except (IOError, ValueError) as e:
+            cmds.warning(f"Cannot read the attribute metadata cache {self.file_path}: {e}")
+            return
+        for node_type, type_data in data.items():
+            self.metadata[node_type] = {
+                attr_name: AttributeMetadata.from_dict(attr_data) if attr_data is not None else None
+                for attr_name, attr_data in type_data.items()
+            }
+
+    def save_if_dirty(self):
+        if self.dirty:
+            self.save()
+
+    def save(self):
+        self.dirty = False
+        if not self.persistent:
+            return
+        # other Maya/Arnold versions sharing the prefs folder keep their own entry
+        data = {}
+        if os.path.isfile(self.file_path):
+            try:
+                with open(self.file_path, "r") as cache_file:
+                    data = json.load(cache_file)
+            except (IOError, ValueError):
+                data = {}
+        data[self.version_key] = {
+            node_type: {
+                attr_name: metadata.to_dict() if metadata is not None else None
+                for attr_name, metadata in type_metadata.items()
+            }
+            for node_type, type_metadata in self.metadata.items()
+        }
+        try:
+            with open(self.file_path, "w") as cache_file:
+                json.dump(data, cache_file, indent=1)
+        except IOError as e:
+            cmds.warning(f"Cannot write the attribute metadata cache {self.file_path}: {e}")
+
+
+def read_plug_value(plug, attr_type):
+    """Read a plug through the API, returning the same value cmds.getAttr would"""
+    if attr_type in ("float3", "double3"):
+        return tuple(plug.child(i).asDouble() for i in range(plug.numChildren()))
+    if attr_type == "bool":
+        return plug.asBool()
+    if attr_type in ("long", "short", "byte", "char", "enum"):
+        return plug.asInt()
+    if attr_type == "doubleAngle":
+        return plug.asMAngle().asUnits(om2.MAngle.uiUnit())
+    if attr_type == "doubleLinear":
+        return plug.asMDistance().asUnits(om2.MDistance.uiUnit())
+    return plug.asDouble()
+
+
+class LightTypePlan:
+    """Everything a LightItem of one node type needs, compiled once per type.
+    The plan lists the attributes read for each light with their metadata (the displayed ones
+    and the ones of the rig statistics), the widget kind and range of each attribute of the
+    dedicated section, and the plugs to watch.
+    Plans are built from LightItem.TYPE_SECTIONS: supporting a new light type
+    only takes a new entry in that registry.
+    """
+
+    _plans = {}  # {"nodeType" : LightTypePlan}
+
+    @classmethod
+    def get(cls, light_type, node_name=None):
+        """Return the plan of a node type, compiled on first use.
+        Args:
+            light_type (str): node type of the light
+            node_name (str): a node of this type, to query the attribute metadata not cached yet
+        """
+        plan = cls._plans.get(light_type)
+        if plan is None:
+            plan = cls._plans[light_type] = cls(light_type, node_name)
+        return plan
+
+    @profiled("LightTypePlan")
+    def __init__(self, light_type, node_name=None):
+        self.light_type = light_type
+        self.supported = light_type in LightItem.SUPPORTED_TYPES
+        self.emits = self.supported and light_type in LightItem.EMIT_TYPES
+
+        section_title, section_table = LightItem.TYPE_SECTIONS.get(light_type, (None, []))
+        self.generic_attributes = []
+        if self.supported:
+            self.generic_attributes.extend(["intensity", "color"])
+            if self.emits:
+                self.generic_attributes.extend(["emitDiffuse", "emitSpecular"])
+        read_attributes = list(self.generic_attributes)
+        if self.supported:
+            for attr_name, _ in section_table:
+                if attr_name not in read_attributes:
+                    read_attributes.append(attr_name)
+        # the rig statistics need the samples and shadows of every light, displayed or not
+        for attr_name in LightRigStats.READ_ATTRIBUTES:
+            if attr_name not in read_attributes:
+                read_attributes.append(attr_name)
+
+        # {"attribute" : AttributeMetadata}, also the plugs watched by the dispatcher
+        if node_name is not None:
+            self.attribute_info = AttributeMetadataCache.instance().get_attributes(
+                light_type, read_attributes, node_name
+            )
+        else:
+            metadata_cache = AttributeMetadataCache.instance()
+            self.attribute_info = {
+                attr_name: metadata_cache.get(light_type, attr_name)
+                for attr_name in read_attributes
+                if metadata_cache.get(light_type, attr_name) is not None
+            }
+
+        # [(attribute, widget kind, min, max)] of the dedicated section, in table order
+        self.section_title = None
+        self.section_attributes = []
+        if self.supported:
+            for attr_name, _ in section_table:
+                metadata = self.attribute_info.get(attr_name)
+                widget_kind = self.get_widget_kind(metadata)
+                if widget_kind is None:
+                    continue
+                self.section_attributes.append((attr_name, widget_kind, metadata.min, metadata.max))
+            if self.section_attributes:
+                self.section_title = section_title
+
+    def add_read_attributes(self, attributes, node_name):
+        """Also read these attributes for the lights of the type, e.g. the ones of a filter predicate.
+        Args:
+            attributes (list): names of the attributes
+            node_name (str): a node of this type, to query the attribute metadata not cached yet
+        Returns: the attributes added, the ones missing on the type or already read are left out
+        """
+        wanted = [attr_name for attr_name in attributes if attr_name not in self.attribute_info]
+        if not wanted:
+            return []
+        added = []
+        for attr_name, metadata in AttributeMetadataCache.instance().get_attributes(
+            self.light_type, wanted, node_name
+        ).items():
+            # read_plug_value only reads numeric plugs
+            if metadata.type in READABLE_TYPES:
+                self.attribute_info[attr_name] = metadata
+                added.append(attr_name)
+        return added
+
+    @staticmethod
+    def get_widget_kind(metadata):
+        if metadata is None:
+            return None
+        if metadata.type == "bool":
+            return "checkbox"
+        if metadata.type in SPINBOX_TYPES:
+            return "spinbox"
+        return None
+
+
+class LightData:
+    """Identity and displayed attribute values of one light, read through the API.
+    The identity (path, shape and transform names, plugs) is cached from the node handle and
+    only read again by refresh_identity(), on rename, reparent or instancing of the light.
+    """
+
+    def __init__(self, dag_path, plan):
+        """LightData Class Constructor to initialize the object.
+        Args:
+            dag_path (om2.MDagPath): path to the light shape
+            plan (LightTypePlan): plan of the node type of the light
+        """
+        self.dag_path = dag_path
+        self.handle = om2.MObjectHandle(dag_path.node())
+        dep_fn = om2.MFnDependencyNode(dag_path.node())
+        self.uuid = dep_fn.uuid().asString()
+        self.light_type = dep_fn.typeName
+        self.plan = plan
+        self.attribute_info = plan.attribute_info
+        self.values = {}
+
+        self.refresh_identity()
+        self.refresh()
+
+    def is_valid(self):
+        return self.handle.isValid() and self.handle.isAlive()
+
+    def get_dag_path(self):
+        # a reparented node invalidates the stored path, find a new one from the node itself
+        if not self.dag_path.isValid():
+            self.refresh_identity()
+        return self.dag_path
+
+    def refresh_identity(self):
+        """Re-read the path, the names and the plugs of the light, after a rename, reparent or instancing"""
+        if not self.is_valid():
+            return False
+        self.dag_path = om2.MDagPath.getAPathTo(self.handle.object())
+        transform_path = om2.MDagPath(self.dag_path)
+        transform_path.pop()
+        self.shape_name = self.dag_path.partialPathName()
+        self.transform_name = transform_path.partialPathName()
+        self.transform_handle = om2.MObjectHandle(transform_path.node())
+        self.instanced = self.dag_path.isInstanced()
+        self.shape_fn = om2.MFnDependencyNode(self.handle.object())
+        self.plugs = {
+            "visibility": om2.MFnDependencyNode(self.transform_handle.object()).findPlug("visibility", False)
+        }  # {"attribute" : MPlug}, filled on first read
+        return True
+
+    def get_plug(self, attr_name):
+        plug = self.plugs.get(attr_name)
+        if plug is None:
+            plug = self.plugs[attr_name] = self.shape_fn.findPlug(attr_name, False)
+        return plug
+
+    def refresh(self, attributes=None):
+        """Re-read the values of the given attributes (all of them by default) from the cached plugs"""
+        if not self.is_valid():
+            return False
+        if attributes is None:
+            attributes = list(self.attribute_info.keys()) + ["visibility"]
+        for attr_name in attributes:
+            if attr_name == "visibility":
+                self.values["visibility"] = self.plugs["visibility"].asBool()
+            elif attr_name in self.attribute_info:
+                self.values[attr_name] = read_plug_value(self.get_plug(attr_name), self.attribute_info[attr_name].type)
+        return True
+
+    def get_value(self, attr_name):
+        return self.values.get(attr_name)
+
+    def get_attribute_type(self, attr_name):
+        metadata = self.attribute_info.get(attr_name)
+        return metadata.type if metadata else None
+
+    def get_attribute_range(self, attr_name):
+        metadata = self.attribute_info.get(attr_name)
+        return (metadata.min, metadata.max) if metadata else (None, None)
+
+
+class LightSceneSnapshot:
+    """One pass over the lights of the scene collecting everything the panel displays.
+    Instead of letting every widget query Maya, the shapes are listed once, their
+    attribute types and ranges come from the LightTypePlan of their node type, and
+    every value is read through a single API iteration.
+    """
+
+    @profiled("LightSceneSnapshot")
+    def __init__(self, shape_names=None):
+        """LightSceneSnapshot Class Constructor to initialize the object.
+        Args:
+            shape_names (list): light shapes to read, all the lights of the scene by default
+        """
+        if shape_names is None:
+            shape_names = cmds.ls(type=cmds.listNodeTypes("light"))
+        self.lights = []
+        self.lights_by_uuid = {}
+
+        if not shape_names:
+            return
+        selection = om2.MSelectionList()
+        for shape_name in shape_names:
+            selection.add(shape_name)
+        for index in range(selection.length()):
+            dag_path = selection.getDagPath(index)
+            light_type = om2.MFnDependencyNode(dag_path.node()).typeName
+            plan = LightTypePlan.get(light_type, dag_path.partialPathName())
+            light_data = LightData(dag_path, plan)
+            self.lights.append(light_data)
+            self.lights_by_uuid[light_data.uuid] = light_data
+        # the metadata of the node types met for the first time, written once for the whole snapshot
+        AttributeMetadataCache.instance().save_if_dirty()
+
+    def get(self, uuid):
+        return self.lights_by_uuid.get(uuid)
+
+
+class LightCallbackDispatcher:
+    """Central dispatcher for the Maya callbacks of every displayed light.
+    Each light gets one node-level attribute-changed callback on its shape and one
+    on its transform (for the visibility). Changes are collected as dirty
+    (uuid, attribute) pairs and flushed on a coalescing timer: each dirty light is
+    re-read once, then its listeners only refresh the attributes that changed.
+    Changes made by the tools themselves, inside tool_edit(), are already in the
+    snapshots: they are delivered to the listeners without re-reading Maya.
+    A listener implements on_attributes_changed(uuid, attributes),
+    on_name_changed(uuid) and on_node_deleted(uuid).
+    """
+
+    FLUSH_INTERVAL = 30  # milliseconds
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.lights = {}  # {"uuid" : LightData}
+        self.listeners = {}  # {"uuid" : [listener, ...]}
+        self.callback_ids = {}  # {"uuid" : [callback id, ...]}
+        self.dirty_attributes = {}  # {"uuid" : set of attribute names}
+        self.edited_attributes = {}  # {"uuid" : set of attribute names} changed inside tool_edit()
+        self.editing = 0  # depth of the tool_edit() blocks
+        self.renamed_lights = set()  # renamed, reparented or instanced
+        self.deleted_lights = set()
+
+        self.flush_timer = QtCore.QTimer()
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(self.FLUSH_INTERVAL)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def subscribe(self, light_data, listener):
+        """Watch a light for a listener.
+        Returns: the LightData every listener of the light shares. When the light is already watched
+        for another listener, that one is kept, updated with the values just read, so a new snapshot
+        never leaves a listener on a LightData the dispatcher no longer refreshes.
+        """
+        uuid = light_data.uuid
+        self.listeners.setdefault(uuid, []).append(listener)
+        tracked_data = self.lights.get(uuid)
+        if tracked_data is None:
+            self.lights[uuid] = light_data
+            self.add_callbacks(light_data)
+            return light_data
+        if tracked_data is not light_data:
+            tracked_data.values.update(light_data.values)
+        return tracked_data
+
+    def unsubscribe(self, uuid, listener):
+        listeners = self.listeners.get(uuid, [])
+        if listener in listeners:
+            listeners.remove(listener)
+        if not listeners:
+            self.remove_callbacks(uuid)
+            self.listeners.pop(uuid, None)
+            self.lights.pop(uuid, None)
+            self.dirty_attributes.pop(uuid, None)
+            self.edited_attributes.pop(uuid, None)
+
+    def add_callbacks(self, light_data):
+        uuid = light_data.uuid
+        dag_path = light_data.get_dag_path()
+        shape_object = dag_path.node()
+        transform_object = dag_path.transform()
+        transform_path = om2.MDagPath(dag_path)
+        transform_path.pop()
+        self.callback_ids[uuid] = [
+            om2.MNodeMessage.addAttributeChangedCallback(shape_object, self.on_shape_attribute_changed, uuid),
+            om2.MNodeMessage.addAttributeChangedCallback(transform_object, self.on_transform_attribute_changed, uuid),
+            om2.MNodeMessage.addNameChangedCallback(shape_object, self.on_name_changed, uuid),
+            om2.MNodeMessage.addNameChangedCallback(transform_object, self.on_name_changed, uuid),
+            om2.MNodeMessage.addNodePreRemovalCallback(shape_object, self.on_node_removed, uuid),
+            # the cached identity of the light only changes on rename, reparent or instancing
+            om2.MDagMessage.addParentAddedDagPathCallback(transform_path, self.on_dag_changed, uuid),
+            om2.MDagMessage.addParentRemovedDagPathCallback(transform_path, self.on_dag_changed, uuid),
+            om2.MDagMessage.addInstanceAddedDagPathCallback(dag_path, self.on_dag_changed, uuid),
+            om2.MDagMessage.addInstanceRemovedDagPathCallback(dag_path, self.on_dag_changed, uuid),
+        ]
+
+    def remove_callbacks(self, uuid):
+        callback_ids = self.callback_ids.pop(uuid, [])
+        if callback_ids:
+            try:
+                om2.MMessage.removeCallbacks(callback_ids)
+            except RuntimeError:
+                # callbacks of a node already gone from the scene
+                pass
+
+    def on_shape_attribute_changed(self, msg, plug, other_plug, uuid):
+        if not msg & (
+            om2.MNodeMessage.kAttributeSet | om2.MNodeMessage.kConnectionMade | om2.MNodeMessage.kConnectionBroken
+        ):
+            return
+        # colorR/colorG/colorB are displayed through their parent
+        if plug.isChild:
+            plug = plug.parent()
+        attr_name = plug.partialName(useLongNames=True)
+        light_data = self.lights.get(uuid)
+        if light_data is not None and attr_name in light_data.attribute_info:
+            self.mark_dirty(uuid, attr_name)
+
+    def on_transform_attribute_changed(self, msg, plug, other_plug, uuid):
+        if msg & om2.MNodeMessage.kAttributeSet and plug.partialName(useLongNames=True) == "visibility":
+            self.mark_dirty(uuid, "visibility")
+
+    @contextmanager
+    def tool_edit(self):
+        """Tag the attribute changes made inside the block as edits of the tools.
+        The writer stores the new values in the LightData, the callbacks it triggers then
+        only update the widgets showing these attributes and never query Maya again.
+        """
+        self.editing += 1
+        try:
+            yield
+        finally:
+            self.editing -= 1
+
+    def on_name_changed(self, node, previous_name, uuid):
+        self.renamed_lights.add(uuid)
+        self.flush_timer.start()
+
+    def on_dag_changed(self, child_path, parent_path, uuid):
+        # a new path or a new instance renames the light like a rename does
+        self.renamed_lights.add(uuid)
+        self.flush_timer.start()
+
+    def on_node_removed(self, node, modifier, uuid):
+        # delivered on the next flush, once the node is really gone from the scene
+        self.deleted_lights.add(uuid)
+        self.flush_timer.start()
+
+    def mark_dirty(self, uuid, attr_name):
+        dirty_attributes = self.edited_attributes if self.editing else self.dirty_attributes
+        dirty_attributes.setdefault(uuid, set()).add(attr_name)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    @profiled("LightCallbackDispatcher.flush")
+    def flush(self):
+        dirty_attributes, self.dirty_attributes = self.dirty_attributes, {}
+        edited_attributes, self.edited_attributes = self.edited_attributes, {}
+        renamed_lights, self.renamed_lights = self.renamed_lights, set()
+        deleted_lights, self.deleted_lights = self.deleted_lights, set()
+
+        for uuid in deleted_lights:
+            for listener in list(self.listeners.get(uuid, [])):
+                listener.on_node_deleted(uuid)
+        for uuid in renamed_lights - deleted_lights:
+            light_data = self.lights.get(uuid)
+            if light_data is None or not light_data.refresh_identity():
+                continue
+            for listener in list(self.listeners.get(uuid, [])):
+                listener.on_name_changed(uuid)
+        for uuid, attributes in dirty_attributes.items():
+            light_data = self.lights.get(uuid)
+            if uuid in deleted_lights or light_data is None or not light_data.refresh(list(attributes)):
+                continue
+            attributes = attributes | edited_attributes.pop(uuid, set())
+            for listener in list(self.listeners.get(uuid, [])):
+                listener.on_attributes_changed(uuid, attributes)
+        for uuid, attributes in edited_attributes.items():
+            if uuid in deleted_lights:
+                continue
+            for listener in list(self.listeners.get(uuid, [])):
+                listener.on_attributes_changed(uuid, attributes)
+
+
+class LightBatchEditor:
+    """Applies one attribute edit to several lights as a single undo step.
+    An edit made on a light that is part of a multi-selection is written to every
+    selected light having the attribute, all the setAttr inside one undo chunk.
+    The mode decides what is written on each light:
+        absolute: the value itself
+        multiply: its current value times the factor
+        add: its current value plus the offset
+        stops: its current value times 2 ** stops
+    The current values come from the LightData snapshots, nothing is read from Maya.
+    """
+
+    ABSOLUTE = "absolute"
+    MULTIPLY = "multiply"
+    ADD = "add"
+    STOPS = "stops"
+    MODES = [ABSOLUTE, MULTIPLY, ADD, STOPS]
+    INTEGER_TYPES = ["long", "short", "byte", "char", "enum", "int"]
+
+    def __init__(self, get_selected_lights):
+        """LightBatchEditor Class Constructor to initialize the object.
+        Args:
+            get_selected_lights (function): returns the LightData of the selected lights
+        """
+        self.get_selected_lights = get_selected_lights
+        self.mode = self.ABSOLUTE
+
+    def edit(self, light_data, attr_name, value):
+        """Write a value edited on one light to the whole selection it belongs to.
+        In a relative mode the edit becomes an amount computed from the previous value of the light,
+        e.g. an intensity edited from 2 to 3 in multiply mode multiplies every selected intensity by 1.5.
+        Returns: False when the light is not part of a multi-selection, nothing is written then
+        """
+        lights = self.get_selected_lights()
+        if len(lights) < 2 or light_data.uuid not in [selected.uuid for selected in lights]:
+            return False
+        mode = self.mode
+        amount = None
+        previous = light_data.get_value(attr_name)
+        if mode != self.ABSOLUTE and previous is not None and not isinstance(value, bool):
+            amount = self.get_amount(previous, value, mode)
+        if amount is None:
+            amount, mode = value, self.ABSOLUTE
+        self.apply(lights, attr_name, amount, mode)
+        return True
+
+    @profiled("LightBatchEditor.apply")
+    def apply(self, lights, attr_name, amount, mode=None):
+        """Write one attribute on several lights, as a single undo step.
+        Args:
+            lights (list): LightData of the lights, the ones without the attribute are skipped
+            attr_name (str): attribute to write, the visibility is written on the transforms
+            amount: value, factor, offset or stops depending on the mode, a tuple for a color
+            mode (str): one of MODES, the current mode by default
+        Returns: number of lights written, the locked or connected plugs are skipped and reported
+        """
+        mode = mode or self.mode
+        writes = []
+        for light_data in lights:
+            if not self.is_compatible(light_data, attr_name) or not light_data.is_valid():
+                continue
+            current = light_data.get_value(attr_name)
+            value = self.compute_value(current, amount, mode, light_data.attribute_info.get(attr_name))
+            if value == current:
+                continue
+            writes.append((light_data, value))
+        if not writes:
+            return 0
+
+        dispatcher = LightCallbackDispatcher.instance()
+        cmds.undoInfo(openChunk=True, chunkName=f"Light Manager: {attr_name} on {len(writes)} lights")
+        try:
+            with dispatcher.tool_edit():
+                failed = self.write_values(attr_name, writes)
+        finally:
+            cmds.undoInfo(closeChunk=True)
+        if failed:
+            # the widgets that already show the edit read the value Maya kept back
+            for light_data in failed:
+                dispatcher.mark_dirty(light_data.uuid, attr_name)
+            names = ", ".join(light_data.shape_name for light_data in failed[:10])
+            if len(failed) > 10:
+                names += ", ..."
+            cmds.warning(f"Light Manager: {attr_name} is locked or connected on {len(failed)} lights: {names}")
+        return len(writes) - len(failed)
+
+    @staticmethod
+    def write_values(attr_name, writes):
+        """Write the values, a plug that cannot be written does not stop the others.
+        Returns: the LightData whose plug could not be written
+        """
+        failed = []
+        for light_data, value in writes:
+            node_name = light_data.transform_name if attr_name == "visibility" else light_data.shape_name
+            try:
+                if isinstance(value, tuple):
+                    cmds.setAttr(f"{node_name}.{attr_name}", *value, type="double3")
+                else:
+                    cmds.setAttr(f"{node_name}.{attr_name}", value)
+            except RuntimeError:
+                failed.append(light_data)
+                continue
+            # the snapshot holds the written value, the dispatcher does not read it back
+            light_data.values[attr_name] = value
+        return failed
+
+    @staticmethod
+    def is_compatible(light_data, attr_name):
+        return attr_name == "visibility" or attr_name in light_data.attribute_info
+
+    @classmethod
+    def get_amount(cls, previous, value, mode):
+        """Return the amount of the mode turning the previous value into the new one, None if there is none"""
+        if isinstance(previous, tuple):
+            amounts = tuple(cls.get_amount(*values, mode) for values in zip(previous, value))
+            return None if None in amounts else amounts
+        if mode == cls.ADD:
+            return value - previous
+        if not previous:
+            return None
+        if mode == cls.MULTIPLY:
+            return value / previous
+        if mode == cls.STOPS:
+            return math.log2(value / previous) if value > 0 and previous > 0 else None
+        return value
+
+    @classmethod
+    def compute_value(cls, current, amount, mode, metadata=None):
+        """Return the value to write on a light, clamped to the range of the attribute"""
+        if isinstance(current, tuple):
+            amounts = amount if isinstance(amount, tuple) else (amount,) * len(current)
+            return tuple(cls.compute_value(*values, mode, metadata) for values in zip(current, amounts))
+        if isinstance(current, bool):
+            # a switch has no relative edit
+            return bool(amount) if mode == cls.ABSOLUTE else current
+        if mode == cls.MULTIPLY:
+            value = current * amount
+        elif mode == cls.ADD:
+            value = current + amount
+        elif mode == cls.STOPS:
+            value = current * 2.0**amount
+        else:
+            value = amount
+        if metadata is not None:
+            if metadata.min is not None:
+                value = max(value, metadata.min)
+            if metadata.max is not None:
+                value = min(value, metadata.max)
+            if metadata.type in cls.INTEGER_TYPES:
+                value = int(round(value))
+        return value
+
+
+class LightFilter:
+    """Filter of the light list, matched against the LightData snapshots without querying Maya.
+    The text is split on spaces, each term being one of:
+        a node type, e.g. pointLight or aiAreaLight
+        an attribute predicate, e.g. aiSamples>3, intensity<0.1 or aiCastShadows=0
+        a name glob matched on the transform and shape names, e.g. key* or *_rim_* (rim alone means *rim*)
+    A light matches when it has one of the node types, one of the names and every predicate.
+    """
+
+    PREDICATE_RE = re.compile(r"^(\w+)(>=|<=|!=|==|=|>|<)(.+)$")
+    OPERATORS = {
+        ">": operator.gt,
+        ">=": operator.ge,
+        "<": operator.lt,
+        "<=": operator.le,
+        "=": operator.eq,
+        "==": operator.eq,
+        "!=": operator.ne,
+    }
+    VALUE_WORDS = {"true": 1, "on": 1, "yes": 1, "false": 0, "off": 0, "no": 0}
+
+    def __init__(self, text="", node_types=()):
+        """LightFilter Class Constructor to initialize the object.
+        Args:
+            text (str): filter typed by the user
+            node_types (list): the light node types, to recognize them in the text
+        """
+        self.text = text
+        self.node_types = set()
+        self.name_patterns = []
+        self.predicates = []  # [(attribute, operator function, value)]
+
+        known_types = {node_type.lower(): node_type for node_type in node_types}
+        for term in text.split():
+            predicate = self.parse_predicate(term)
+            if predicate is not None:
+                self.predicates.append(predicate)
+            elif term.lower() in known_types:
+                self.node_types.add(known_types[term.lower()])
+            elif any(char in term for char in "*?["):
+                self.name_patterns.append(term.lower())
+            else:
+                self.name_patterns.append(f"*{term.lower()}*")
+
+    @classmethod
+    def parse_predicate(cls, term):
+        match = cls.PREDICATE_RE.match(term)
+        if match is None:
+            return None
+        attr_name, operator_name, value = match.groups()
+        value = cls.VALUE_WORDS.get(value.lower(), value)
+        try:
+            value = float(value)
+        except ValueError:
+            return None
+        return attr_name, cls.OPERATORS[operator_name], value
+
+    def is_empty(self):
+        return not (self.node_types or self.name_patterns or self.predicates)
+
+    def get_attributes(self):
+        """Return the attributes the predicates compare"""
+        return list(dict.fromkeys(attr_name for attr_name, _, _ in self.predicates))
+
+    def matches(self, light_data):
+        if self.node_types and light_data.light_type not in self.node_types:
+            return False
+        if self.name_patterns:
+            names = (light_data.transform_name.lower(), light_data.shape_name.lower())
+            if not any(fnmatch.fnmatchcase(name, pattern) for pattern in self.name_patterns for name in names):
+                return False
+        for attr_name, compare, value in self.predicates:
+            light_value = light_data.get_value(attr_name)
+            # colors and missing attributes never match a number
+            if light_value is None or isinstance(light_value, tuple) or not compare(light_value, value):
+                return False
+        return True
+
+
+class LightRigPreset:
+    """Light rig saved to a file and applied back to the same scene or to another one.
+    A preset holds the identity, type, transform and displayed attributes of every light
+    (the intensity, color, emit flags and the attributes of the type tables). Applying it
+    only writes the values that differ from the scene, all of them as one undo step.
+    The lights are matched by UUID, then by name, then by name without namespace.
+    Usage, from the script editor:
+        LightRigPreset.capture().save("C:/tmp/shot_010_key.json")
+        LightRigPreset.load("C:/tmp/shot_010_key.json").apply()
+    """
+
+    VERSION = 1
+    FILE_FILTER = "Light rig preset (*.json)"
+    # {"attribute" : type of its children}, read in the units setAttr expects
+    TRANSFORM_ATTRIBUTES = {"translate": "doubleLinear", "rotate": "doubleAngle", "scale": "double"}
+    TOLERANCE = 1e-6
+
+    def __init__(self, lights=None):
+        """LightRigPreset Class Constructor to initialize the object.
+        Args:
+            lights (list): one dict per light with uuid, name, shape, type, transform and attributes
+        """
+        self.lights = lights or []
+
+    @classmethod
+    @profiled("LightRigPreset.capture")
+    def capture(cls, lights=None):
+        """Return the preset of the given LightData, of every light of the scene by default"""
+        if lights is None:
+            lights = LightSceneSnapshot().lights
+        return cls([cls.get_light_entry(light_data) for light_data in lights if light_data.is_valid()])
+
+    @classmethod
+    def get_light_entry(cls, light_data):
+        transform = cls.read_transform_values(light_data)
+        transform["visibility"] = light_data.get_value("visibility")
+        return {
+            "uuid": light_data.uuid,
+            "name": light_data.transform_name,
+            "shape": light_data.shape_name,
+            "type": light_data.light_type,
+            "transform": transform,
+            "attributes": {attr_name: light_data.get_value(attr_name) for attr_name in light_data.attribute_info},
+        }
+
+    @classmethod
+    def read_transform_values(cls, light_data):
+        transform_fn = om2.MFnDependencyNode(light_data.transform_handle.object())
+        values = {}
+        for attr_name, child_type in cls.TRANSFORM_ATTRIBUTES.items():
+            plug = transform_fn.findPlug(attr_name, False)
+            values[attr_name] = tuple(read_plug_value(plug.child(i), child_type) for i in range(plug.numChildren()))
+        return values
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, "r") as preset_file:
+            data = json.load(preset_file)
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"{file_path} is not a light rig preset of version {cls.VERSION}")
+        return cls(data["lights"])
+
+    def save(self, file_path):
+        # compact, a rig of thousands of lights stays small and fast to read
+        with open(file_path, "w") as preset_file:
+            json.dump({"version": self.VERSION, "lights": self.lights}, preset_file, separators=(",", ":"))
+        return file_path
+
+    @staticmethod
+    def get_short_name(name):
+        return name.rsplit("|", 1)[-1].rsplit(":", 1)[-1]
+
+    def match_lights(self, scene_lights):
+        """Pair every light of the preset with a light of the scene of the same type.
+        Returns: [(preset entry, LightData)], [unmatched preset entry]
+        """
+        by_uuid = {light_data.uuid: light_data for light_data in scene_lights}
+        by_name = {light_data.transform_name: light_data for light_data in scene_lights}
+        by_short_name = {}
+        for light_data in scene_lights:
+            by_short_name.setdefault(self.get_short_name(light_data.transform_name), []).append(light_data)
+
+        matches = []
+        unmatched = []
+        used_uuids = set()
+        for entry in self.lights:
+            candidates = [by_uuid.get(entry["uuid"]), by_name.get(entry["name"])]
+            # a name without namespace only matches when it is not ambiguous
+            short_name_lights = by_short_name.get(self.get_short_name(entry["name"]), [])
+            if len(short_name_lights) == 1:
+                candidates.append(short_name_lights[0])
+            for light_data in candidates:
+                if light_data is None or light_data.uuid in used_uuids:
+                    continue
+                if light_data.light_type == entry["type"]:
+                    matches.append((entry, light_data))
+                    used_uuids.add(light_data.uuid)
+                    break
+            else:
+                unmatched.append(entry)
+        return matches, unmatched
+
+    @classmethod
+    def is_same_value(cls, current, value):
+        if isinstance(value, (list, tuple)):
+            return (
+                isinstance(current, tuple)
+                and len(current) == len(value)
+                and all(cls.is_same_value(*values) for values in zip(current, value))
+            )
+        if current is None or isinstance(value, bool) or isinstance(current, bool):
+            return current == value
+        return abs(current - value) <= cls.TOLERANCE * max(1.0, abs(value))
+
+    def get_writes(self, entry, light_data):
+        """Return the [(plug name, value)] of the light that differ from the preset"""
+        writes = []
+        current_transform = self.read_transform_values(light_data)
+        current_transform["visibility"] = light_data.get_value("visibility")
+        for attr_name, value in entry["transform"].items():
+            if value is not None and not self.is_same_value(current_transform.get(attr_name), value):
+                writes.append((f"{light_data.transform_name}.{attr_name}", value))
+        for attr_name, value in entry["attributes"].items():
+            # attributes unknown to this Maya or MtoA version are skipped
+            if value is None or attr_name not in light_data.attribute_info:
+                continue
+            if not self.is_same_value(light_data.get_value(attr_name), value):
+                writes.append((f"{light_data.shape_name}.{attr_name}", value))
+        return writes
+
+    @profiled("LightRigPreset.apply")
+    def apply(self, lights=None):
+        """Write the preset on the lights of the scene, only the values that differ, as one undo step.
+        Args:
+            lights (list): LightData of the lights to match, every light of the scene by default
+        Returns: {"matched": count, "written": count of values, "failed": [plug names], "unmatched": [light names]}
+        """
+        if lights is None:
+            lights = LightSceneSnapshot().lights
+        matches, unmatched = self.match_lights([light_data for light_data in lights if light_data.is_valid()])
+        writes = []
+        for entry, light_data in matches:
+            writes.extend(self.get_writes(entry, light_data))
+
+        failed = []  # locked, keyed or constrained plugs, the other writes still go through
+        if writes:
+            cmds.undoInfo(openChunk=True, chunkName=f"Light Manager: rig preset on {len(matches)} lights")
+            try:
+                for plug_name, value in writes:
+                    try:
+                        if isinstance(value, (list, tuple)):
+                            cmds.setAttr(plug_name, *value, type="double3")
+                        else:
+                            cmds.setAttr(plug_name, value)
+                    except RuntimeError:
+                        failed.append(plug_name)
+            finally:
+                cmds.undoInfo(closeChunk=True)
+
+        unmatched_names = [entry["name"] for entry in unmatched]
+        if unmatched_names:
+            cmds.warning(f"Light rig preset: no light of the same type for {', '.join(unmatched_names)}")
+        written = len(writes) - len(failed)
+        message = f"Light rig preset: {len(matches)} lights matched, {written} values written"
+        if failed:
+            # the first plugs only, a locked rig would flood the script editor
+            examples = ", ".join(failed[:10]) + (", ..." if len(failed) > 10 else "")
+            cmds.warning(f"{message}, {len(failed)} locked or connected: {examples}")
+        else:
+            om2.MGlobal.displayInfo(message)
+        return {"matched": len(matches), "written": written, "failed": failed, "unmatched": unmatched_names}
+
+
+class LightRigStats:
+    """Statistics of the light rig, for a render cost estimate before sending to the farm.
+    The aggregates are kept from the LightData snapshots light by light: the contribution of
+    each light is stored, so a changed light only removes its old contribution and adds the new one.
+    The sampling cost of a visible light is aiSamples squared, plus aiVolumeSamples squared when it
+    casts volumetric shadows, as Arnold shoots the square of the samples; the relative cost
+    compares it to every visible light at 1 sample.
+    """
+
+    SAMPLE_ATTRIBUTES = ["aiSamples", "aiVolumeSamples"]
+    # read by every LightTypePlan whose type has them, whether its tables display them or not
+    READ_ATTRIBUTES = SAMPLE_ATTRIBUTES + ["aiCastShadows", "aiCastVolumetricShadows"]
+
+    def __init__(self):
+        self.contributions = {}  # {"uuid" : contribution dict}
+        self.type_counts = Counter()
+        self.visible_count = 0
+        self.shadow_count = 0
+        self.volumetric_count = 0
+        self.sample_sums = Counter()
+        self.sample_histograms = {attr_name: Counter() for attr_name in self.SAMPLE_ATTRIBUTES}
+        self.cost = 0.0
+
+    def set_lights(self, lights):
+        self.__init__()
+        for light_data in lights:
+            self.add(light_data)
+
+    def update(self, light_data):
+        self.remove(light_data.uuid)
+        self.add(light_data)
+
+    def add(self, light_data):
+        contribution = self.get_contribution(light_data)
+        self.contributions[light_data.uuid] = contribution
+        self.apply(contribution, 1)
+
+    def remove(self, uuid):
+        contribution = self.contributions.pop(uuid, None)
+        if contribution is not None:
+            self.apply(contribution, -1)
+
+    @classmethod
+    def get_contribution(cls, light_data):
+        visible = bool(light_data.get_value("visibility"))
+        volumetric = bool(light_data.get_value("aiCastVolumetricShadows"))
+        samples = {attr_name: light_data.get_value(attr_name) for attr_name in cls.SAMPLE_ATTRIBUTES}
+        cost = 0.0
+        if visible:
+            cost = (samples["aiSamples"] if samples["aiSamples"] is not None else 1) ** 2
+            if volumetric and samples["aiVolumeSamples"] is not None:
+                cost += samples["aiVolumeSamples"] ** 2
+        return {
+            "type": light_data.light_type,
+            "visible": visible,
+            "shadows": bool(light_data.get_value("aiCastShadows")),
+            "volumetric": volumetric,
+            "samples": samples,
+            "cost": cost,
+        }
+
+    def apply(self, contribution, sign):
+        self.type_counts[contribution["type"]] += sign
+        self.visible_count += sign * contribution["visible"]
+        self.shadow_count += sign * contribution["shadows"]
+        self.volumetric_count += sign * contribution["volumetric"]
+        for attr_name, value in contribution["samples"].items():
+            if value is not None:
+                self.sample_sums[attr_name] += sign * value
+                self.sample_histograms[attr_name][value] += sign
+        self.cost += sign * contribution["cost"]
+
+    def get_relative_cost(self):
+        return self.cost / self.visible_count if self.visible_count else 0.0
+
+    def get_type_group_counts(self):
+        """Return [(group title, {"nodeType" : count})] for the Maya, Arnold and other light types"""
+        groups = [("Maya", LightItem.MAYA_TYPES), ("Arnold", LightItem.ARNOLD_TYPES)]
+        grouped_types = LightItem.MAYA_TYPES + LightItem.ARNOLD_TYPES
+        others = [node_type for node_type in self.type_counts if node_type not in grouped_types]
+        return [
+            (title, {node_type: self.type_counts[node_type] for node_type in node_types if self.type_counts[node_type]})
+            for title, node_types in groups + [("Other", others)]
+        ]
+
+    def to_html(self):
+        light_count = len(self.contributions)
+        lines = [f"<b>{light_count}</b> lights, <b>{self.visible_count}</b> visible"]
+        for title, counts in self.get_type_group_counts():
+            if counts:
+                details = ", ".join(f"{node_type} {count}" for node_type, count in counts.items())
+                lines.append(f"{title}: {details}")
+        lines.append(f"Shadow casting: <b>{self.shadow_count}</b>, volumetric shadows: <b>{self.volumetric_count}</b>")
+        for attr_name in self.SAMPLE_ATTRIBUTES:
+            histogram = self.sample_histograms[attr_name]
+            distribution = "  ".join(f"{value}: {count}" for value, count in sorted(histogram.items()) if count)
+            lines.append(f"{attr_name}: sum <b>{self.sample_sums[attr_name]}</b>  ({distribution or '-'})")
+        lines.append(
+            f"Sampling cost: <b>{self.cost:,.0f}</b>, "
+            f"x{self.get_relative_cost():.1f} vs every visible light at 1 sample"
+        )
+        return "<br>".join(lines)
+
+
 class LightItem(QtWidgets.QWidget):
 
     # SUPPORTED_TYPES = ["ambientLight", "directionalLight", "pointLight", "spotLight"]
@@ -444,42 +1773,48 @@ class LightItem(QtWidgets.QWidget):
         ("aiUseColorTemperature", "bool"),
     ]
 
-    node_deleted = QtCore.Signal(str)
-
-    def __init__(self, shape_name, parent=None):
+    # registry of the dedicated sections: {"nodeType" : (section title, attribute table)}
+    TYPE_SECTIONS = {
+        "directionalLight": ("DIRECTIONAL LIGHT ATTRIBUTES", MAYA_ATTRIBUTES_DIRECTIONALLIGHT),
+        "ambientLight": ("AMBIENT LIGHT ATTRIBUTES", MAYA_ATTRIBUTES_AMBIENTLIGHT),
+        "pointLight": ("POINT LIGHT ATTRIBUTES", MAYA_ATTRIBUTES_POINTLIGHT),
+        "spotLight": ("SPOT LIGHT ATTRIBUTES", MAYA_ATTRIBUTES_SPOTLIGHT),
+        "areaLight": ("AREA LIGHT ATTRIBUTES", MAYA_ATTRIBUTES_AREALIGHT),
+        "aiAreaLight": ("ARNOLD AREA LIGHT ATTRIBUTES", ARNOLD_ATTRIBUTES_AREALIGHT),
+        "aiMeshLight": ("ARNOLD MESH LIGHT ATTRIBUTES", ARNOLD_ATTRIBUTES_MESHLIGHT),
+        "aiSkyDomeLight": ("ARNOLD SKYDOME LIGHT ATTRIBUTES", ARNOLD_ATTRIBUTES_SKYDOMELIGHT),
+        "aiPhotometricLight": ("ARNOLD PHOTOMETRIC LIGHT ATTRIBUTES", ARNOLD_ATTRIBUTES_PHOTOMETRICLIGHT),
+    }
+
+    @profiled("LightItem")
+    def __init__(self, shape_name, parent=None, light_data=None, batch_editor=None):
         super(LightItem, self).__init__(parent)
 
         # self.setFixedHeight(26)
-        self.shape_name = shape_name
-        self.uuid = cmds.ls(shape_name, uuid=True)
+        # every widget is built and filled from the snapshot, read it for this light only when not given
+        if light_data is None:
+            light_data = LightSceneSnapshot([shape_name]).lights[0]
+        self.light_data = light_data
+        # what to build for this light type, compiled once and shared by every light of the type
+        self.plan = light_data.plan
+        self.shape_name = light_data.shape_name
+        self.uuid = light_data.uuid
 
         # debug ui
         # self.minimum_size = 0
 
-        self.script_jobs = []
+        self.dispatcher = LightCallbackDispatcher.instance()
+        # edits of a light part of a multi-selection go to every selected light
+        self.batch_editor = batch_editor
+        # drags on the spinboxes and the color swatch write live, throttled, as one undo step
+        self.scrubber = AttributeScrubber(self.edit_attribute, parent=self)
+        self.type_widgets = []  # [(QLabel, widget)] of the dedicated section, once built
+        self.attribute_widgets = {}  # {"attribute" : (QLabel, widget)} of the dedicated section
 
         self.create_widgets()
         self.create_layout()
         self.create_connections()
-        self.create_script_jobs()
-        self.custom_set_style_sheet()
-
-    def custom_set_style_sheet(self):
-
-        # self.set_style_sheet_Desc_Label_wdg(self.emit_diffuse_cb,self.FONT_COLOR_TITLE,self.FONT_LIST, self.FONT_SIZE_DESC)
-        # self.set_style_sheet_Desc_Label_wdg(self.emit_specular_cb,self.FONT_COLOR_TITLE,self.FONT_LIST, self.FONT_SIZE_DESC)
-        set_style_sheet_Desc_Label_wdg(self.generic_attribute_lbl, FONT_COLOR_DESC, FONT_LIST, FONT_SIZE_DESC)
-        set_style_sheet_Desc_Label_wdg(self.area_light_lbl, FONT_COLOR_DESC, FONT_LIST, FONT_SIZE_DESC)
-        set_style_sheet_Desc_Label_wdg(self.directional_light_lbl, FONT_COLOR_DESC, FONT_LIST, FONT_SIZE_DESC)
-        set_style_sheet_Desc_Label_wdg(self.point_light_lbl, FONT_COLOR_DESC, FONT_LIST, FONT_SIZE_DESC)
-        set_style_sheet_Desc_Label_wdg(self.spot_light_lbl, FONT_COLOR_DESC, FONT_LIST, FONT_SIZE_DESC)
-        set_style_sheet_Desc_Label_wdg(self.ambient_light_lbl, FONT_COLOR_DESC, FONT_LIST, FONT_SIZE_DESC)
-
-        # For arnold widget
-        set_style_sheet_Desc_Label_wdg(self.arnold_area_light_lbl, FONT_COLOR_DESC, FONT_LIST, FONT_SIZE_DESC)
-        set_style_sheet_Desc_Label_wdg(self.arnold_mesh_light_lbl, FONT_COLOR_DESC, FONT_LIST, FONT_SIZE_DESC)
-        set_style_sheet_Desc_Label_wdg(self.arnold_photometric_light_lbl, FONT_COLOR_DESC, FONT_LIST, FONT_SIZE_DESC)
-        set_style_sheet_Desc_Label_wdg(self.arnold_skydome_light_lbl, FONT_COLOR_DESC, FONT_LIST, FONT_SIZE_DESC)
+        self.create_callbacks()
 
     def create_widgets(self):
         # first line header for each light
@@ -489,184 +1824,72 @@ class LightItem(QtWidgets.QWidget):
 
         # widget shown inside collapsible element
         self.generic_attribute_lbl = QtWidgets.QLabel("GENERIC ATTRIBUTES")
-        self.directional_light_lbl = QtWidgets.QLabel("DIRECTIONAL LIGHT ATTRIBUTES")
-        self.ambient_light_lbl = QtWidgets.QLabel("AMBIENT LIGHT ATTRIBUTES")
-        self.point_light_lbl = QtWidgets.QLabel("POINT LIGHT ATTRIBUTES")
-        self.spot_light_lbl = QtWidgets.QLabel("SPOT LIGHT ATTRIBUTES")
-        self.area_light_lbl = QtWidgets.QLabel("AREA LIGHT ATTRIBUTES")
-        self.arnold_area_light_lbl = QtWidgets.QLabel("ARNOLD AREA LIGHT ATTRIBUTES")
-        self.arnold_mesh_light_lbl = QtWidgets.QLabel("ARNOLD MESH LIGHT ATTRIBUTES")
-        self.arnold_skydome_light_lbl = QtWidgets.QLabel("ARNOLD SKYDOME LIGHT ATTRIBUTES")
-        self.arnold_photometric_light_lbl = QtWidgets.QLabel("ARNOLD PHOTOMETRIC LIGHT ATTRIBUTES")
-
-        # Changing background of the icon light button when hover
-        self.light_type_btn.setStyleSheet(
-            f"""
-                                        QPushButton:hover{{
-                                        background-color : #1D65A6;
-                                        border-radius : 5px; 
-                                            }}"""
-        )
+        self.generic_attribute_lbl.setObjectName("sectionLabel")
+
+        # the background of the icon light button changes on hover, see LIGHT_PANEL_STYLE_SHEET
+        self.light_type_btn.setObjectName("lightTypeButton")
 
         self.visiblity_cb = QtWidgets.QCheckBox()
 
         self.transform_name_label = QtWidgets.QLabel("placeholder")
         self.transform_name_label.setFixedWidth(120)
         self.transform_name_label.setAlignment(QtCore.Qt.AlignCenter)
-        set_style_sheet_Desc_Label_wdg(self.transform_name_label, FONT_COLOR_TITLE, FONT_LIST, FONT_SIZE_DESC)
+        self.transform_name_label.setObjectName("attributeLabel")
 
         # light_item_scroll_area = QtWidgets.QScrollArea()
         # light_item_scroll_area.setWidgetResizable(True)
         # light_item_scroll_area.setWidget(self)
 
-        light_type = self.get_light_type()
-        if light_type in self.SUPPORTED_TYPES:
+        if self.plan.supported:
             # print("light_type in self.SUPPORTED_TYPES start")
-            self.intensity_dsb = QtWidgets.QDoubleSpinBox()
+            self.intensity_dsb = ScrubSpinBox()
             # self.intensity_dsb.setRange(0.0, 1000.0)
             self.intensity_dsb.setMinimum(0.0)
             self.intensity_dsb.setMaximum(1000.0)
             # self.intensity_dsb.setDecimals(2)
             self.intensity_dsb.setSingleStep(0.20)
             self.intensity_dsb.setButtonSymbols(QtWidgets.QAbstractSpinBox.NoButtons)
-            set_style_sheet_double_spine_box_edit(self.intensity_dsb)
 
             self.color_btn = CustomColorButton()
             # # print("light_type in self.SUPPORTED_TYPES end")
 
-            if light_type in self.EMIT_TYPES:
+            if self.plan.emits:
                 # # print("light_type in self.EMIT_TYPES start")
                 self.emit_diffuse_cb = QtWidgets.QCheckBox("Emit Diffuse")
                 self.emit_specular_cb = QtWidgets.QCheckBox("Emit Specular")
                 # # print("light_type in self.EMIT_TYPES end")
 
-            # TODO add attributes create widgets
-            if light_type in self.MAYA_TYPES:
-                if light_type == "directionalLight":
-                    self.directional_widgets = []
-
-                    for nameAttr, typeAttr in self.MAYA_ATTRIBUTES_DIRECTIONALLIGHT:
-                        # TODO dynamic types
-                        typeAttr = cmds.getAttr(f"{self.shape_name}.{nameAttr}", typ=True)
-                        print(typeAttr)
-                        self.directional_widgets.append(self.create_tuple_widgetLbl_widgetType(nameAttr, typeAttr))
-                    print(self.directional_widgets)
-                if light_type == "ambientLight":
-                    self.ambient_lights = []
-
-                    for nameAttr, typeAttr in self.MAYA_ATTRIBUTES_AMBIENTLIGHT:
-                        # TODO dynamic types
-                        typeAttr = cmds.getAttr(f"{self.shape_name}.{nameAttr}", typ=True)
-                        print(typeAttr)
-                        self.ambient_lights.append(self.create_tuple_widgetLbl_widgetType(nameAttr, typeAttr))
-                    print(self.ambient_lights)
-
-                if light_type == "pointLight":
-                    self.point_lights = []
-
-                    for nameAttr, typeAttr in self.MAYA_ATTRIBUTES_POINTLIGHT:
-                        # TODO dynamic types
-                        typeAttr = cmds.getAttr(f"{self.shape_name}.{nameAttr}", typ=True)
-                        print(typeAttr)
-                        self.point_lights.append(self.create_tuple_widgetLbl_widgetType(nameAttr, typeAttr))
-                    print(self.point_lights)
-
-                if light_type == "spotLight":
-                    self.spot_lights = []
-
-                    for nameAttr, typeAttr in self.MAYA_ATTRIBUTES_SPOTLIGHT:
-                        # TODO dynamic types
-                        typeAttr = cmds.getAttr(f"{self.shape_name}.{nameAttr}", typ=True)
-                        print(typeAttr)
-                        self.spot_lights.append(self.create_tuple_widgetLbl_widgetType(nameAttr, typeAttr))
-                    print(self.spot_lights)
-
-                if light_type == "areaLight":
-                    self.area_lights = []
-
-                    for nameAttr, typeAttr in self.MAYA_ATTRIBUTES_AREALIGHT:
-                        # TODO dynamic types
-                        typeAttr = cmds.getAttr(f"{self.shape_name}.{nameAttr}", typ=True)
-                        print(typeAttr)
-                        self.area_lights.append(self.create_tuple_widgetLbl_widgetType(nameAttr, typeAttr))
-                    print(self.area_lights)
-
-            if light_type in self.ARNOLD_TYPES:
-                if light_type == "aiAreaLight":
-                    self.area_arnold_widgets = []
-                    for nameAttr, typeAttr in self.ARNOLD_ATTRIBUTES_AREALIGHT:
-                        # TODO dynamic types
-                        typeAttr = cmds.getAttr(f"{self.shape_name}.{nameAttr}", typ=True)
-                        print(typeAttr)
-                        self.area_arnold_widgets.append(self.create_tuple_widgetLbl_widgetType(nameAttr, typeAttr))
-                    # print(self.area_widgets)
-                if light_type == "aiMeshLight":
-                    self.mesh_widgets = []
-                    for nameAttr, typeAttr in self.ARNOLD_ATTRIBUTES_MESHLIGHT:
-                        # TODO dynamic types
-                        typeAttr = cmds.getAttr(f"{self.shape_name}.{nameAttr}", typ=True)
-                        print(typeAttr)
-                        self.mesh_widgets.append(self.create_tuple_widgetLbl_widgetType(nameAttr, typeAttr))
-                    # print(self.mesh_widgets)
-                if light_type == "aiSkyDomeLight":
-                    self.skydome_widgets = []
-                    for nameAttr, typeAttr in self.ARNOLD_ATTRIBUTES_SKYDOMELIGHT:
-                        # TODO dynamic types
-                        typeAttr = cmds.getAttr(f"{self.shape_name}.{nameAttr}", typ=True)
-                        print(typeAttr)
-                        self.skydome_widgets.append(self.create_tuple_widgetLbl_widgetType(nameAttr, typeAttr))
-                    # print(self.skydome_widgets)
-                if light_type == "aiPhotometricLight":
-                    self.photometric_widgets = []
-                    for nameAttr, typeAttr in self.ARNOLD_ATTRIBUTES_PHOTOMETRICLIGHT:
-                        # TODO dynamic types
-                        typeAttr = cmds.getAttr(f"{self.shape_name}.{nameAttr}", typ=True)
-                        print(typeAttr)
-                        self.photometric_widgets.append(self.create_tuple_widgetLbl_widgetType(nameAttr, typeAttr))
-                    # print(self.photometric_widgets)
-
-        self.update_values()
-
-    def create_tuple_widgetLbl_widgetType(self, nameAttr, typeAttr):
-        widget_lbl = QtWidgets.QLabel(nameAttr)
-        set_style_sheet_Desc_Label_wdg(widget_lbl, FONT_COLOR_TITLE, FONT_LIST, FONT_SIZE_DESC)
-
-        types_spinbox = [
-            "float",
-            "long",
-            "double",
-            "int",
-            "doubleAngle",
+        self.update_widgets()
+
+    def create_type_widgets(self):
+        # TODO add attributes create widgets
+        self.type_widgets = [
+            self.create_tuple_widgetLbl_widgetType(nameAttr, widget_kind, min_value, max_value)
+            for nameAttr, widget_kind, min_value, max_value in self.plan.section_attributes
         ]
 
-        if typeAttr == "bool":
+    def get_type_widgets(self):
+        """Return the (label, widget) list of the dedicated section of this light"""
+        return self.type_widgets
+
+    def create_tuple_widgetLbl_widgetType(self, nameAttr, widget_kind, min_value=None, max_value=None):
+        widget_lbl = QtWidgets.QLabel(nameAttr)
+        widget_lbl.setObjectName("attributeLabel")
+
+        if widget_kind == "checkbox":
             widget = QtWidgets.QCheckBox()
-        elif typeAttr in types_spinbox:
-            widget = QtWidgets.QDoubleSpinBox()
+        elif widget_kind == "spinbox":
+            widget = ScrubSpinBox()
             widget.setButtonSymbols(QtWidgets.QAbstractSpinBox.NoButtons)
 
-            # Set styleSheet to change backgroun-color to white when focus on it
-            set_style_sheet_double_spine_box_edit(widget)
-            ####################################################################
-
-            mxe = cmds.attributeQuery(nameAttr, node=self.shape_name, mxe=True)
-            mne = cmds.attributeQuery(nameAttr, node=self.shape_name, mne=True)
-            print("mne mxe")
-            print(mne, mxe)
+            # ranges come from the plan of the light type
             default_max_min = 10000.0
-            if mxe:
-                max = cmds.attributeQuery(nameAttr, node=self.shape_name, max=True)[0]
-                print("max:")
-                print(max)
-                widget.setMaximum(max)
+            if max_value is not None:
+                widget.setMaximum(max_value)
             else:
                 widget.setMaximum(default_max_min)
-            if mne:
-                # max = cmds.attributeQuery(nameAttr, node=self.shape_name, softRange=True)
-                min = cmds.attributeQuery(nameAttr, node=self.shape_name, min=True)[0]
-                print("min:")
-                print(min)
-                widget.setMinimum(min)
+            if min_value is not None:
+                widget.setMinimum(min_value)
             else:
                 widget.setMinimum(-default_max_min)
         else:
@@ -689,133 +1912,20 @@ class LightItem(QtWidgets.QWidget):
         first_line_layout.addWidget(self.visiblity_cb)
         first_line_layout.addWidget(self.transform_name_label)
 
-        light_type = self.get_light_type()
-        if light_type in self.SUPPORTED_TYPES:
+        if self.plan.supported:
             # print("light_type in self.SUPPORTED_TYPES layout")
             first_line_layout.addWidget(self.intensity_dsb)
 
             first_line_layout.addSpacing(1)
             first_line_layout.addWidget(self.color_btn)
 
-            if light_type in self.EMIT_TYPES:
+            if self.plan.emits:
                 # print("light_type in self.EMIT_TYPES layout START")
                 # first_line_layout.addSpacing(1)
                 first_line_layout.addWidget(self.emit_diffuse_cb)
                 # first_line_layout.addSpacing(2)
                 first_line_layout.addWidget(self.emit_specular_cb)
                 # print("light_type in self.EMIT_TYPES layout END")
-            # TODO add attributes create layout
-            if light_type in self.MAYA_TYPES:
-                maya_main_vlayout = QtWidgets.QVBoxLayout()
-                maya_layout_lines = []
-
-                if light_type == "directionalLight":
-                    first_line_maya = QtWidgets.QHBoxLayout()
-                    first_line_maya.addWidget(self.directional_light_lbl)
-                    maya_layout_lines.append(first_line_maya)
-                    for lbl, wdg in self.directional_widgets:
-                        maya_line_layout = QtWidgets.QHBoxLayout()
-                        maya_line_layout.addWidget(lbl)
-                        maya_line_layout.addWidget(wdg)
-                        maya_layout_lines.append(maya_line_layout)
-
-                if light_type == "ambientLight":
-                    first_line_maya = QtWidgets.QHBoxLayout()
-                    first_line_maya.addWidget(self.ambient_light_lbl)
-                    maya_layout_lines.append(first_line_maya)
-                    for lbl, wdg in self.ambient_lights:
-                        maya_line_layout = QtWidgets.QHBoxLayout()
-                        maya_line_layout.addWidget(lbl)
-                        maya_line_layout.addWidget(wdg)
-                        maya_layout_lines.append(maya_line_layout)
-
-                if light_type == "pointLight":
-                    first_line_maya = QtWidgets.QHBoxLayout()
-                    first_line_maya.addWidget(self.point_light_lbl)
-                    maya_layout_lines.append(first_line_maya)
-                    for lbl, wdg in self.point_lights:
-                        maya_line_layout = QtWidgets.QHBoxLayout()
-                        maya_line_layout.addWidget(lbl)
-                        maya_line_layout.addWidget(wdg)
-                        maya_layout_lines.append(maya_line_layout)
-
-                if light_type == "spotLight":
-                    first_line_maya = QtWidgets.QHBoxLayout()
-                    first_line_maya.addWidget(self.spot_light_lbl)
-                    maya_layout_lines.append(first_line_maya)
-                    for lbl, wdg in self.spot_lights:
-                        maya_line_layout = QtWidgets.QHBoxLayout()
-                        maya_line_layout.addWidget(lbl)
-                        maya_line_layout.addWidget(wdg)
-                        maya_layout_lines.append(maya_line_layout)
-
-                if light_type == "areaLight":
-                    first_line_maya = QtWidgets.QHBoxLayout()
-                    first_line_maya.addWidget(self.area_light_lbl)
-                    maya_layout_lines.append(first_line_maya)
-                    for lbl, wdg in self.area_lights:
-                        maya_line_layout = QtWidgets.QHBoxLayout()
-                        maya_line_layout.addWidget(lbl)
-                        maya_line_layout.addWidget(wdg)
-                        maya_layout_lines.append(maya_line_layout)
-
-                if maya_layout_lines:
-                    print("if maya_layout_lines")
-                    for maya_line_layout in maya_layout_lines:
-                        maya_main_vlayout.addLayout(maya_line_layout)
-                else:
-                    print("not if maya_layout_lines")
-
-            if light_type in self.ARNOLD_TYPES:
-                arnold_main_vlayout = QtWidgets.QVBoxLayout()
-                # arnold_main_vlayout.setContentsMargins(2,2,2,2)
-                arnold_layout_lines = []
-                if light_type == "aiAreaLight":
-                    first_line_arnold = QtWidgets.QHBoxLayout()
-                    first_line_arnold.addWidget(self.arnold_area_light_lbl)
-                    arnold_layout_lines.append(first_line_arnold)
-                    for lbl, wdg in self.area_arnold_widgets:
-                        arnold_line_layout = QtWidgets.QHBoxLayout()
-                        arnold_line_layout.addWidget(lbl)
-                        arnold_line_layout.addWidget(wdg)
-                        arnold_layout_lines.append(arnold_line_layout)
-                elif light_type == "aiMeshLight":
-                    first_line_arnold = QtWidgets.QHBoxLayout()
-                    first_line_arnold.addWidget(self.arnold_mesh_light_lbl)
-                    arnold_layout_lines.append(first_line_arnold)
-                    for lbl, wdg in self.mesh_widgets:
-                        arnold_line_layout = QtWidgets.QHBoxLayout()
-                        arnold_line_layout.addWidget(lbl)
-                        arnold_line_layout.addWidget(wdg)
-                        arnold_layout_lines.append(arnold_line_layout)
-                elif light_type == "aiSkyDomeLight":
-                    first_line_arnold = QtWidgets.QHBoxLayout()
-                    first_line_arnold.addWidget(self.arnold_skydome_light_lbl)
-                    arnold_layout_lines.append(first_line_arnold)
-                    for lbl, wdg in self.skydome_widgets:
-                        arnold_line_layout = QtWidgets.QHBoxLayout()
-                        arnold_line_layout.addWidget(lbl)
-                        arnold_line_layout.addWidget(wdg)
-
-                        arnold_layout_lines.append(arnold_line_layout)
-                elif light_type == "aiPhotometricLight":
-                    first_line_arnold = QtWidgets.QHBoxLayout()
-                    first_line_arnold.addWidget(self.arnold_photometric_light_lbl)
-                    arnold_layout_lines.append(first_line_arnold)
-                    for lbl, wdg in self.photometric_widgets:
-                        arnold_line_layout = QtWidgets.QHBoxLayout()
-                        arnold_line_layout.addWidget(lbl)
-                        arnold_line_layout.addWidget(wdg)
-
-                        arnold_layout_lines.append(arnold_line_layout)
-                else:
-                    # print("no match arnold type")
-                    pass
-
-                if arnold_layout_lines:
-                    for arnold_line_layout in arnold_layout_lines:
-                        arnold_main_vlayout.addLayout(arnold_line_layout)
-
         # first_line_layout.addStretch()
         # first_line_layout.addSpacing(1)
 
@@ -830,208 +1940,171 @@ class LightItem(QtWidgets.QWidget):
         self.line.setFrameShadow(QtWidgets.QFrame.Sunken)
 
         # TODO add attributes add layout
-        if light_type in self.MAYA_TYPES:
-            print("create_layout() in maya types")
-            main_layout.addWidget(self.line)
-            main_layout.addSpacing(20)
-            main_layout.addLayout(maya_main_vlayout)
-        if light_type in self.ARNOLD_TYPES:
+        # the dedicated section is only built the first time it is expanded
+        if self.plan.section_title is not None:
             main_layout.addWidget(self.line)
-            main_layout.addSpacing(20)
-            main_layout.addLayout(arnold_main_vlayout)
+            self.type_container = Container(self.plan.section_title)
+            self.type_container.set_content_builder(self.build_type_section)
+            main_layout.addWidget(self.type_container)
+
+    @profiled("LightItem.build_type_section")
+    def build_type_section(self):
+        """Create, lay out, connect and fill the widgets of the dedicated section"""
+        self.create_type_widgets()
+        QtWidgets.QVBoxLayout(self.type_container.contentWidget).addLayout(self.create_type_layout())
+        self.create_type_connections()
+        for qlabel, qwidget in self.get_type_widgets():
+            self.attribute_widgets[qlabel.text()] = (qlabel, qwidget)
+            self.update_value_widget(qlabel, qwidget)
+
+    def create_type_layout(self):
+        type_layout = QtWidgets.QVBoxLayout()
+        for lbl, wdg in self.get_type_widgets():
+            line_layout = QtWidgets.QHBoxLayout()
+            line_layout.addWidget(lbl)
+            line_layout.addWidget(wdg)
+            type_layout.addLayout(line_layout)
+        return type_layout
 
     def create_connections(self):
         self.light_type_btn.clicked.connect(self.select_light)
         self.visiblity_cb.toggled.connect(self.set_visibility)
-        light_type = self.get_light_type()
-        if light_type in self.SUPPORTED_TYPES:
+        if self.plan.supported:
             self.intensity_dsb.editingFinished.connect(self.on_intensity_changed)
+            self.connect_scrub(self.intensity_dsb, "intensity")
             self.color_btn.color_changed.connect(self.set_color)
-            if light_type in self.EMIT_TYPES:
+            self.color_btn.scrub_started.connect(partial(self.scrubber.begin, "color"))
+            self.color_btn.color_scrubbed.connect(self.on_color_scrubbed)
+            self.color_btn.scrub_finished.connect(self.scrubber.end)
+            if self.plan.emits:
                 self.emit_diffuse_cb.toggled.connect(self.set_emit_diffuse)
                 self.emit_specular_cb.toggled.connect(self.set_emit_specular)
-            # TODO add attributes connections callback
-            if light_type in self.MAYA_TYPES:
-                if light_type == "directionalLight":
-                    print(f"type is {light_type}")
-                    for qlabel, qwidget in self.directional_widgets:
-                        self.connect_widgets_dynamic(qlabel, qwidget)
-                if light_type == "ambientLight":
-                    print(f"type is {light_type}")
-                    for qlabel, qwidget in self.ambient_lights:
-                        self.connect_widgets_dynamic(qlabel, qwidget)
-                if light_type == "pointLight":
-                    print(f"type is {light_type}")
-                    for qlabel, qwidget in self.point_lights:
-                        self.connect_widgets_dynamic(qlabel, qwidget)
-                if light_type == "spotLight":
-                    print(f"type is {light_type}")
-                    for qlabel, qwidget in self.spot_lights:
-                        self.connect_widgets_dynamic(qlabel, qwidget)
-                if light_type == "areaLight":
-                    print(f"type is {light_type}")
-                    for qlabel, qwidget in self.area_lights:
-                        self.connect_widgets_dynamic(qlabel, qwidget)
-
-            if light_type in self.ARNOLD_TYPES:
-                if light_type == "aiAreaLight":
-                    for qlabel, qwidget in self.area_arnold_widgets:
-                        self.connect_widgets_dynamic(qlabel, qwidget)
-                elif light_type == "aiMeshLight":
-                    for qlabel, qwidget in self.mesh_widgets:
-                        self.connect_widgets_dynamic(qlabel, qwidget)
-                elif light_type == "aiSkyDomeLight":
-                    for qlabel, qwidget in self.skydome_widgets:
-                        self.connect_widgets_dynamic(qlabel, qwidget)
-                elif light_type == "aiPhotometricLight":
-                    for qlabel, qwidget in self.photometric_widgets:
-                        self.connect_widgets_dynamic(qlabel, qwidget)
-                else:
-                    pass
-                    # print("no match arnold type in create_connections()")
-                    # self.exposure_dsb.editingFinished.connect(self.on_exposure_changed)
+
+    def create_type_connections(self):
+        # TODO add attributes connections callback
+        for qlabel, qwidget in self.get_type_widgets():
+            self.connect_widgets_dynamic(qlabel, qwidget)
 
     def connect_widgets_dynamic(self, qlabel, qwidget):
-        print("connect_widgets_dynamic()")
-        print(qlabel, qwidget)
         attr_name = qlabel.text()
-        print(attr_name)
         classname = qwidget.metaObject().className()
-        print(classname)
-        if classname == "QDoubleSpinBox":
+        if classname == "ScrubSpinBox":
             value = qwidget.value()
             qwidget.editingFinished.connect(partial(self.on_QDoubleSpinBox_changed, qwidget, attr_name))
+            self.connect_scrub(qwidget, attr_name)
         if classname == "QCheckBox":
             state = qwidget.isChecked()
             qwidget.toggled.connect(partial(self.on_QCheckBox_changed, qwidget, attr_name))
 
+    def connect_scrub(self, qdsb, attr_name):
+        qdsb.scrub_started.connect(partial(self.scrubber.begin, attr_name))
+        qdsb.valueChanged.connect(partial(self.on_spinbox_scrubbed, attr_name))
+        qdsb.scrub_finished.connect(self.scrubber.end)
+
+    @profiled("LightItem.update_values")
     def update_values(self):
+        # one API read of this light, then the widgets are filled from the snapshot
+        self.light_data.refresh()
+        self.update_widgets()
+
+    def update_widgets(self):
         self.transform_name_label.setText(self.get_transform_name())
-        self.visiblity_cb.setChecked(self.is_visible())
+        self.set_widget_value(self.visiblity_cb, self.is_visible())
         self.light_type_btn.setIcon(self.get_light_type_icon())
 
-        light_type = self.get_light_type()
-        if light_type in self.SUPPORTED_TYPES:
-            self.intensity_dsb.setValue(self.get_intensity())
+        if self.plan.supported:
+            self.set_widget_value(self.intensity_dsb, self.get_intensity())
             # print(self.intensity_dsb)
             self.color_btn.set_color(self.get_color())
-            if light_type in self.EMIT_TYPES:
-                self.emit_diffuse_cb.setChecked(self.emits_diffuse())
-                self.emit_specular_cb.setChecked(self.emits_specular())
+            if self.plan.emits:
+                self.set_widget_value(self.emit_diffuse_cb, self.emits_diffuse())
+                self.set_widget_value(self.emit_specular_cb, self.emits_specular())
             # TODO add attributes update value
-            if light_type in self.MAYA_TYPES:
-                if light_type == "directionalLight":
-                    for qlabel, qwidget in self.directional_widgets:
-                        self.update_value_widget(qlabel, qwidget)
-                if light_type == "ambientLight":
-                    for qlabel, qwidget in self.ambient_lights:
-                        self.update_value_widget(qlabel, qwidget)
-                if light_type == "pointLight":
-                    for qlabel, qwidget in self.point_lights:
-                        self.update_value_widget(qlabel, qwidget)
-                if light_type == "spotLight":
-                    for qlabel, qwidget in self.spot_lights:
-                        self.update_value_widget(qlabel, qwidget)
-                if light_type == "areaLight":
-                    for qlabel, qwidget in self.area_lights:
-                        self.update_value_widget(qlabel, qwidget)
-
-            if light_type in self.ARNOLD_TYPES:
-                if light_type == "aiAreaLight":
-                    for qlabel, qwidget in self.area_arnold_widgets:
-                        self.update_value_widget(qlabel, qwidget)
-                if light_type == "aiMeshLight":
-                    for qlabel, qwidget in self.mesh_widgets:
-                        self.update_value_widget(qlabel, qwidget)
-                if light_type == "aiSkyDomeLight":
-                    for qlabel, qwidget in self.skydome_widgets:
-                        self.update_value_widget(qlabel, qwidget)
-                if light_type == "aiPhotometricLight":
-                    for qlabel, qwidget in self.photometric_widgets:
-                        self.update_value_widget(qlabel, qwidget)
+            # the dedicated section widgets only exist once it has been expanded
+            for qlabel, qwidget in self.attribute_widgets.values():
+                self.update_value_widget(qlabel, qwidget)
 
     def update_value_widget(self, qlabel, qwidget):
-        print(qlabel, qwidget)
         attr_name = qlabel.text()
-        print(attr_name)
-        print(qlabel.text(), qwidget)
         classname = qwidget.metaObject().className()
-        if classname == "QDoubleSpinBox":
+        if classname in ("ScrubSpinBox", "QCheckBox"):
             # qwidget.setValue(.66)
-            qwidget.setValue(self.get_attribute_from_widget(attr_name=attr_name))
-        if classname == "QCheckBox":
-            qwidget.setChecked(self.get_attribute_from_widget(attr_name=attr_name))
-            # qwidget.setChecked(False)
+            self.set_widget_value(qwidget, self.get_attribute_from_widget(attr_name=attr_name))
+
+    def update_attribute_widgets(self, attributes):
+        """Refresh only the widgets displaying the given attributes"""
+        for attr_name in attributes:
+            # the widget being scrubbed is ahead of Maya, the throttled values would make it jump back
+            if self.scrubber.is_scrubbing(attr_name):
+                continue
+            if attr_name == "visibility":
+                self.set_widget_value(self.visiblity_cb, self.is_visible())
+            elif attr_name == "intensity":
+                self.set_widget_value(self.intensity_dsb, self.get_intensity())
+            elif attr_name == "color":
+                self.color_btn.set_color(self.get_color())
+            elif attr_name == "emitDiffuse":
+                self.set_widget_value(self.emit_diffuse_cb, self.emits_diffuse())
+            elif attr_name == "emitSpecular":
+                self.set_widget_value(self.emit_specular_cb, self.emits_specular())
+            if attr_name in self.attribute_widgets:
+                self.update_value_widget(*self.attribute_widgets[attr_name])
+
+    @staticmethod
+    def set_widget_value(widget, value):
+        """Display a value coming from Maya, with the signals of the widget blocked so it is never written back"""
+        was_blocked = widget.blockSignals(True)
+        if isinstance(widget, QtWidgets.QCheckBox):
+            widget.setChecked(bool(value))
+        else:
+            widget.setValue(value)
+        widget.blockSignals(was_blocked)
 
     def get_transform_name(self):
-        return cmds.listRelatives(self.shape_name, parent=True)[0]
+        return self.light_data.transform_name
 
     def get_attribute_value(self, name, attribute):
         return cmds.getAttr("{0}.{1}".format(name, attribute))
 
+    @profiled("LightItem.set_attribute_value")
     def set_attribute_value(self, name, attribute, *args):
-        print("set_attribute_value enter")
         attr_name = "{0}.{1}".format(name, attribute)
-        print(name, attribute, attr_name, args)
-
         cmds.setAttr(attr_name, *args)
 
+    def edit_attribute(self, attr_name, value):
+        """Write an edit of this light, to every selected light when it is part of a multi-selection"""
+        if self.batch_editor is not None and self.batch_editor.edit(self.light_data, attr_name, value):
+            return
+        node_name = self.get_transform_name() if attr_name == "visibility" else self.shape_name
+        with self.dispatcher.tool_edit():
+            self.set_attribute_value(node_name, attr_name, *(value if isinstance(value, tuple) else (value,)))
+        self.light_data.values[attr_name] = value
+
+    def is_spinbox_unchanged(self, qdsb, attr_name):
+        # editingFinished is also emitted when the focus leaves an untouched spinbox
+        previous = self.light_data.get_value(attr_name)
+        return previous is not None and qdsb.value() == round(previous, qdsb.decimals())
+
     def is_visible(self):
-        transform_name = self.get_transform_name()
-        return self.get_attribute_value(transform_name, "visibility")
+        return self.light_data.get_value("visibility")
 
     def get_light_type(self):
-        return cmds.objectType(self.shape_name)
+        return self.light_data.light_type
 
     def get_light_type_icon(self):
-        light_type = self.get_light_type()
-        # print(light_type)
-        icon = QtGui.QIcon()
-        if light_type == "ambientLight":
-            icon = QtGui.QIcon(":ambientLight.svg")
-        elif light_type == "directionalLight":
-            icon = QtGui.QIcon(":directionalLight.svg")
-        elif light_type == "pointLight":
-            icon = QtGui.QIcon(":pointLight.svg")
-        elif light_type == "spotLight":
-            icon = QtGui.QIcon(":spotLight.svg")
-        elif light_type == "areaLight":
-            icon = QtGui.QIcon(":areaLight.svg")
-        # arnold lights
-        # TODO le chemin ne marche pas avec le chemin relatif !?
-        elif light_type == "aiAreaLight":
-            area_icon_path = "C:/Program Files/Autodesk/Arnold/maya2022/icons/AreaLightShelf.png"
-            # area_icon_path = "./icons/AreaLightShelf.png"
-
-            icon = QtGui.QIcon(area_icon_path)
-            # print("aiAreaLight")
-        elif light_type == "aiMeshLight":
-            aiMesh_icon_path = "C:/Program Files/Autodesk/Arnold/maya2022/icons/MeshLightShelf.png"
-            icon = QtGui.QIcon(aiMesh_icon_path)
-        elif light_type == "aiPhotometricLight":
-            aiPhotometric_icon_path = "C:/Program Files/Autodesk/Arnold/maya2022/icons/PhotometricLightShelf.png"
-            icon = QtGui.QIcon(aiPhotometric_icon_path)
-        elif light_type == "aiSkyDomeLight":
-            aiSkyDome_icon_path = "C:/Program Files/Autodesk/Arnold/maya2022/icons/SkyDomeLightShelf.png"
-            icon = QtGui.QIcon(aiSkyDome_icon_path)
-
-        else:
-            icon = QtGui.QIcon(":Light.png")
-        return icon
+        return get_light_type_icon(self.get_light_type())
 
     def get_intensity(self):
-        return self.get_attribute_value(self.shape_name, "intensity")
+        return self.light_data.get_value("intensity")
 
     def get_exposure(self):
         return self.get_attribute_value(self.shape_name, "exposure")
 
     def get_attribute_from_widget(self, attr_name):
-        print("get_attribute_from_widget")
-        print(self.shape_name, attr_name)
-        return self.get_attribute_value(self.shape_name, attr_name)
+        return self.light_data.get_value(attr_name)
 
     def get_color(self):
-        temp_color = self.get_attribute_value(self.shape_name, "color")[0]
+        temp_color = self.light_data.get_value("color")
         # print(temp_color)
         color = QtGui.QColor(
             temp_color[0] * 255,
@@ -1041,19 +2114,20 @@ class LightItem(QtWidgets.QWidget):
         return color
 
     def emits_diffuse(self):
-        return self.get_attribute_value(self.shape_name, "emitDiffuse")
+        return self.light_data.get_value("emitDiffuse")
 
     def emits_specular(self):
-        return self.get_attribute_value(self.shape_name, "emitSpecular")
+        return self.light_data.get_value("emitSpecular")
 
     def select_light(self):
         cmds.select(self.get_transform_name())
 
     def set_visibility(self, checked):
-        self.set_attribute_value(self.get_transform_name(), "visibility", checked)
+        self.edit_attribute("visibility", checked)
 
     def on_intensity_changed(self):
-        self.set_attribute_value(self.shape_name, "intensity", self.intensity_dsb.value())
+        if not self.is_spinbox_unchanged(self.intensity_dsb, "intensity"):
+            self.edit_attribute("intensity", self.intensity_dsb.value())
 
     def on_exposure_changed(self):
         # print("on_exposure_changed")
@@ -1064,115 +2138,311 @@ class LightItem(QtWidgets.QWidget):
         # print(qdsb)
         value = qdsb.value()
         # print(value)
-        self.set_attribute_value(self.shape_name, attr_name, value)
+        if not self.is_spinbox_unchanged(qdsb, attr_name):
+            self.edit_attribute(attr_name, value)
 
     def on_QCheckBox_changed(self, qcb, attr_name, state):
         # print("on_QCheckBox_changed value: " + str(attr_name) + " " + str(state))
         # print(qcb)
-        self.set_attribute_value(self.shape_name, attr_name, state)
+        self.edit_attribute(attr_name, state)
+
+    def on_spinbox_scrubbed(self, attr_name, value):
+        # valueChanged is also emitted when the widget follows Maya, only the gesture writes
+        if self.scrubber.is_scrubbing(attr_name):
+            self.scrubber.push(value)
+
+    def on_color_scrubbed(self, color):
+        self.scrubber.push((color.redF(), color.greenF(), color.blueF()))
 
     def set_color(self, color):
         # print(color)
-        self.set_attribute_value(
-            self.shape_name,
-            "color",
-            color.redF(),
-            color.greenF(),
-            color.blueF(),
-        )
+        self.edit_attribute("color", (color.redF(), color.greenF(), color.blueF()))
 
     def set_emit_diffuse(self, checked):
         # print("set_emit_diffuse")
-        self.set_attribute_value(self.shape_name, "emitDiffuse", checked)
+        self.edit_attribute("emitDiffuse", checked)
 
     def set_emit_specular(self, checked):
         # print("set_emit_specular")
-        self.set_attribute_value(self.shape_name, "emitSpecular", checked)
-
-    def on_node_deleted(self):
-        self.node_deleted.emit(self.shape_name)
-
-    def on_name_changed(self):
-        # UUID universal uniq identifier
-        self.shape_name = cmds.ls(self.uuid)[0]
-        self.update_values()
-
-    def create_script_jobs(self):
-        self.delete_script_jobs()
-        # TODO ajouter pour chaque attribut?
-        self.add_attribute_change_script_jobs(self.get_transform_name(), "visibility")
-        light_type = self.get_light_type()
-        if light_type in self.SUPPORTED_TYPES:
-            self.add_attribute_change_script_jobs(self.shape_name, "color")
-            self.add_attribute_change_script_jobs(self.shape_name, "intensity")
-            if light_type in self.EMIT_TYPES:
-                self.add_attribute_change_script_jobs(self.shape_name, "emitDiffuse")
-                self.add_attribute_change_script_jobs(self.shape_name, "emitSpecular")
-            # TODO add attributes scriptjob
-            if light_type in self.MAYA_TYPES:
-                if light_type == "directionalLight":
-                    for attrName, _ in self.MAYA_ATTRIBUTES_DIRECTIONALLIGHT:
-                        self.add_attribute_change_script_jobs(self.shape_name, attrName)
-                if light_type == "ambientLight":
-                    for attrName, _ in self.MAYA_ATTRIBUTES_AMBIENTLIGHT:
-                        self.add_attribute_change_script_jobs(self.shape_name, attrName)
-                if light_type == "pointLight":
-                    for attrName, _ in self.MAYA_ATTRIBUTES_POINTLIGHT:
-                        self.add_attribute_change_script_jobs(self.shape_name, attrName)
-                if light_type == "spotLight":
-                    for attrName, _ in self.MAYA_ATTRIBUTES_SPOTLIGHT:
-                        self.add_attribute_change_script_jobs(self.shape_name, attrName)
-                if light_type == "areaLight":
-                    for attrName, _ in self.MAYA_ATTRIBUTES_AREALIGHT:
-                        self.add_attribute_change_script_jobs(self.shape_name, attrName)
-
-            if light_type in self.ARNOLD_TYPES:
-                if light_type == "aiAreaLight":
-                    for attrName, _ in self.ARNOLD_ATTRIBUTES_AREALIGHT:
-                        self.add_attribute_change_script_jobs(self.shape_name, attrName)
-                if light_type == "aiMeshLight":
-                    for attrName, _ in self.ARNOLD_ATTRIBUTES_MESHLIGHT:
-                        self.add_attribute_change_script_jobs(self.shape_name, attrName)
-                if light_type == "aiSkyDomeLight":
-                    for attrName, _ in self.ARNOLD_ATTRIBUTES_SKYDOMELIGHT:
-                        self.add_attribute_change_script_jobs(self.shape_name, attrName)
-                if light_type == "aiPhotometricLight":
-                    for attrName, _ in self.ARNOLD_ATTRIBUTES_PHOTOMETRICLIGHT:
-                        self.add_attribute_change_script_jobs(self.shape_name, attrName)
-
-        scriptjob_number1 = cmds.scriptJob(nodeDeleted=(self.shape_name, partial(self.on_node_deleted)))
-        self.script_jobs.append(scriptjob_number1)
-        scriptjob_number2 = cmds.scriptJob(nodeNameChanged=(self.shape_name, partial(self.on_name_changed)))
-        self.script_jobs.append(scriptjob_number2)
-
-    def add_attribute_change_script_jobs(self, name, attribute):
-        sjn = cmds.scriptJob(
-            attributeChange=(
-                "{0}.{1}".format(name, attribute),
-                partial(self.update_values),
-            )
-        )
-        self.script_jobs.append(sjn)
-
-    def delete_script_jobs(self):
-        # print("delete_script_jobs")
-        for job_number in self.script_jobs:
-            if cmds.scriptJob(exists=job_number):
-                cmds.scriptJob(kill=job_number, force=True)
-            cmds.evalDeferred(
-                "if cmds.scriptJob(exists={0}):\n\tcmds.scriptJob(kill={0}, force=True)".format(job_number)
-            )
-        self.script_jobs = []
+        self.edit_attribute("emitSpecular", checked)
+
+    def on_node_deleted(self, *args):
+        # the model removes the row of the light, which destroys this editor
+        pass
+
+    def on_name_changed(self, *args):
+        # the dispatcher already re-read the new names in the snapshot
+        self.shape_name = self.light_data.shape_name
+        self.transform_name_label.setText(self.get_transform_name())
+
+    def on_attributes_changed(self, uuid, attributes):
+        self.update_attribute_widgets(attributes)
+
+    def create_callbacks(self):
+        # a single subscription per light, the dispatcher watches every displayed attribute
+        self.delete_callbacks()
+        self.light_data = self.dispatcher.subscribe(self.light_data, self)
+
+    def delete_callbacks(self):
+        # a gesture cut by the removal of the item still closes its undo chunk
+        self.scrubber.end()
+        self.dispatcher.unsubscribe(self.uuid, self)
+
+
+class LightListModel(QtCore.QAbstractItemModel):
+    """Tree model of the scene lights, keyed by node UUID.
+    Every light is a top-level row (type icon, name and visibility) painted by the view.
+    Its only child row hosts the LightItem editor, created on demand when the light
+    is expanded, so collapsed or scrolled off lights do not cost any widget.
+    light_changed is emitted with the UUID of a light whose snapshot changed.
+    """
+
+    light_changed = QtCore.Signal(str)
+
+    def __init__(self, parent=None):
+        super(LightListModel, self).__init__(parent)
+        self.dispatcher = LightCallbackDispatcher.instance()
+        self.uuids = []  # row order
+        self.lights = {}  # {"uuid" : LightData}
+        self.rows = {}  # {"uuid" : row}
+        self.batch_editor = None  # LightBatchEditor of the panel, to toggle the visibility of a selection
+        self.bold_font = QtGui.QFont()
+        self.bold_font.setBold(True)
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column)
+        # the child row of a light points to its LightData
+        return self.createIndex(row, column, self.lights[self.uuids[parent.row()]])
+
+    def parent(self, index):
+        if not index.isValid() or index.internalPointer() is None:
+            return QtCore.QModelIndex()
+        return self.createIndex(self.rows[index.internalPointer().uuid], 0)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if not parent.isValid():
+            return len(self.uuids)
+        if parent.internalPointer() is None and parent.column() == 0:
+            return 1
+        return 0
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 1
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.ItemFlags()
+        if self.is_details_index(index):
+            return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsEditable
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsUserCheckable
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or self.is_details_index(index):
+            return None
+        light_data = self.lights[self.uuids[index.row()]]
+        if role == QtCore.Qt.DisplayRole:
+            return light_data.transform_name
+        if role == QtCore.Qt.DecorationRole:
+            return get_light_type_icon(light_data.light_type)
+        if role == QtCore.Qt.CheckStateRole:
+            return QtCore.Qt.Checked if light_data.get_value("visibility") else QtCore.Qt.Unchecked
+        if role == QtCore.Qt.BackgroundRole:
+            return QtGui.QColor(SECOND_BACKGROUND_COLOR if index.row() % 2 else SECOND_BACKGROUND_CLOSE_COLOR)
+        if role == QtCore.Qt.FontRole:
+            return self.bold_font
+        if role == QtCore.Qt.ToolTipRole:
+            return f"{light_data.shape_name} ({light_data.light_type})"
+        if role == QtCore.Qt.UserRole:
+            return light_data.uuid
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid() or self.is_details_index(index) or role != QtCore.Qt.CheckStateRole:
+            return False
+        light_data = self.lights[self.uuids[index.row()]]
+        visible = value == QtCore.Qt.Checked
+        if self.batch_editor is None or not self.batch_editor.edit(light_data, "visibility", visible):
+            with self.dispatcher.tool_edit():
+                cmds.setAttr(f"{light_data.transform_name}.visibility", visible)
+            light_data.values["visibility"] = visible
+        # the row itself is refreshed by the dispatcher once Maya applied the change
+        return True
+
+    def is_details_index(self, index):
+        return index.internalPointer() is not None
+
+    def get_light(self, uuid):
+        return self.lights.get(uuid)
+
+    def get_index(self, uuid):
+        if uuid not in self.rows:
+            return QtCore.QModelIndex()
+        return self.createIndex(self.rows[uuid], 0)
+
+    def get_details_index(self, index):
+        return self.index(0, 0, index)
+
+    def update_rows(self):
+        self.rows = {uuid: row for row, uuid in enumerate(self.uuids)}
+
+    def set_lights(self, lights):
+        self.beginResetModel()
+        for uuid in self.uuids:
+            self.dispatcher.unsubscribe(uuid, self)
+        self.uuids = [light_data.uuid for light_data in lights]
+        self.lights = {light_data.uuid: self.dispatcher.subscribe(light_data, self) for light_data in lights}
+        self.update_rows()
+        self.endResetModel()
+
+    def insert_light(self, light_data, row):
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self.uuids.insert(row, light_data.uuid)
+        self.lights[light_data.uuid] = self.dispatcher.subscribe(light_data, self)
+        self.update_rows()
+        self.endInsertRows()
+
+    def remove_light(self, uuid):
+        if uuid not in self.rows:
+            return
+        row = self.rows[uuid]
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        self.dispatcher.unsubscribe(uuid, self)
+        del self.uuids[row]
+        del self.lights[uuid]
+        self.update_rows()
+        self.endRemoveRows()
+
+    def clear(self):
+        self.set_lights([])
+
+    @profiled("LightListModel.read_attributes")
+    def read_attributes(self, attributes):
+        """Read these attributes for every light whose type has them, once per type.
+        Returns: {"attribute" : [node types of the lights without it]}
+        """
+        lights_by_type = {}
+        for light_data in self.lights.values():
+            lights_by_type.setdefault(light_data.light_type, []).append(light_data)
+        missing = {}
+        for light_type, lights in lights_by_type.items():
+            plan = lights[0].plan
+            added = plan.add_read_attributes(attributes, lights[0].shape_name)
+            if added:
+                for light_data in lights:
+                    light_data.refresh(added)
+            for attr_name in attributes:
+                if attr_name not in plan.attribute_info:
+                    missing.setdefault(attr_name, []).append(light_type)
+        AttributeMetadataCache.instance().save_if_dirty()
+        return missing
+
+    def update_light_row(self, uuid):
+        index = self.get_index(uuid)
+        if index.isValid():
+            self.dataChanged.emit(index, index)
+
+    # dispatcher listener
+    def on_attributes_changed(self, uuid, attributes):
+        if "visibility" in attributes:
+            self.update_light_row(uuid)
+        self.light_changed.emit(uuid)
+
+    def on_name_changed(self, uuid):
+        self.update_light_row(uuid)
+        self.light_changed.emit(uuid)
+
+    def on_node_deleted(self, uuid):
+        self.remove_light(uuid)
+
+
+class LightItemDelegate(QtWidgets.QStyledItemDelegate):
+    """Delegate of the light list: the light rows are painted by the default delegate,
+    the details rows get a LightItem editor, created only while the light is expanded.
+    """
+
+    ROW_HEIGHT = 28
+
+    def __init__(self, parent=None, batch_editor=None):
+        super(LightItemDelegate, self).__init__(parent)
+        self.batch_editor = batch_editor
+        self.editors = {}  # {"uuid" : LightItem}
+        self.editor_indexes = {}  # {"uuid" : QPersistentModelIndex of its details row}
+
+    def createEditor(self, parent, option, index):
+        light_data = index.internalPointer()
+        if light_data is None:
+            return super(LightItemDelegate, self).createEditor(parent, option, index)
+        editor = LightItem(light_data.shape_name, parent, light_data=light_data, batch_editor=self.batch_editor)
+        # TODO change this value hard coding
+        editor.setContentsMargins(1, 1, 1, 1)
+        # painted by the theme of the panel with the color of its light row
+        editor.setAttribute(QtCore.Qt.WA_StyledBackground, True)
+        editor.setProperty("odd", bool(index.parent().row() % 2))
+        self.editors[light_data.uuid] = editor
+        self.editor_indexes[light_data.uuid] = QtCore.QPersistentModelIndex(index)
+        # a section built or toggled inside the LightItem changes the height of its row
+        editor.installEventFilter(self)
+        self.sizeHintChanged.emit(index)
+        return editor
+
+    def destroyEditor(self, editor, index):
+        if isinstance(editor, LightItem):
+            editor.removeEventFilter(self)
+            editor.delete_callbacks()
+            self.editors.pop(editor.uuid, None)
+            self.editor_indexes.pop(editor.uuid, None)
+        super(LightItemDelegate, self).destroyEditor(editor, index)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QtCore.QEvent.LayoutRequest and isinstance(watched, LightItem):
+            index = self.editor_indexes.get(watched.uuid)
+            if index is not None and index.isValid():
+                self.sizeHintChanged.emit(QtCore.QModelIndex(index))
+        return super(LightItemDelegate, self).eventFilter(watched, event)
+
+    def setEditorData(self, editor, index):
+        # a LightItem keeps itself in sync with Maya through the dispatcher
+        if not isinstance(editor, LightItem):
+            super(LightItemDelegate, self).setEditorData(editor, index)
+
+    def setModelData(self, editor, model, index):
+        # a LightItem writes its edits to Maya itself
+        if not isinstance(editor, LightItem):
+            super(LightItemDelegate, self).setModelData(editor, model, index)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
+        # rows inserted or removed above move the light to a row of the other color
+        odd = bool(index.parent().row() % 2)
+        if isinstance(editor, LightItem) and editor.property("odd") != odd:
+            editor.setProperty("odd", odd)
+            editor.style().unpolish(editor)
+            editor.style().polish(editor)
+
+    def sizeHint(self, option, index):
+        light_data = index.internalPointer()
+        if light_data is not None:
+            editor = self.editors.get(light_data.uuid)
+            return editor.sizeHint() if editor is not None else QtCore.QSize(0, 0)
+        size = super(LightItemDelegate, self).sizeHint(option, index)
+        size.setHeight(max(size.height(), self.ROW_HEIGHT))
+        return size
 
 
 class LightPanel(QtWidgets.QDialog):
 
     WINDOW_TITLE = "Custom Light Editor"
+    RECONCILE_INTERVAL = 50  # milliseconds
+    FILTER_INTERVAL = 250  # milliseconds after the last keystroke
+    STATS_INTERVAL = 200  # milliseconds
 
     # Creating all the static variable used in function styleSheet
     def __init__(self, parent=maya_main_window()):
         super(LightPanel, self).__init__(parent)
-        self.setStyleSheet(f"background-color : {MAIN_BACKGROUND_COLOR};")
+        self.setStyleSheet(LIGHT_PANEL_STYLE_SHEET)
         self.setWindowTitle(self.WINDOW_TITLE)
         if cmds.about(ntOS=True):
             self.setWindowFlags(self.windowFlags() ^ QtCore.Qt.WindowContextHelpButtonHint)
@@ -1180,21 +2450,86 @@ class LightPanel(QtWidgets.QDialog):
             self.setWindowFlags(QtCore.Qt.Tool)
 
         self.resize(700, 350)
-        self.light_items = []
-        self.script_jobs = []
+        self.callback_ids = []  # node added/removed callbacks of the light types
+
+        # lights created or deleted together (import, undo, delete) are reconciled once
+        self.reconcile_timer = QtCore.QTimer(self)
+        self.reconcile_timer.setSingleShot(True)
+        self.reconcile_timer.setInterval(self.RECONCILE_INTERVAL)
+        self.reconcile_timer.timeout.connect(self.reconcile_lights)
+
+        self.light_filter = LightFilter()
+        self.hidden_uuids = set()  # lights not matching the filter
+        self.missing_filter_attributes = {}  # {"attribute" : [node types without it]}
+        self.rig_stats = LightRigStats()
         self.create_widgets()
         self.create_layout()
         self.create_connections()
 
     def create_widgets(self):
         self.refreshButton = QtWidgets.QPushButton("Refresh Lights Names")
-        set_style_sheet_btn(self.refreshButton, BTN_BACKGROUND_COLOR, FONT_LABEL_DESC)
+        self.refreshButton.setObjectName("actionButton")
+        self.save_preset_btn = QtWidgets.QPushButton("Save Rig")
+        self.save_preset_btn.setObjectName("actionButton")
+        self.load_preset_btn = QtWidgets.QPushButton("Load Rig")
+        self.load_preset_btn.setObjectName("actionButton")
         self.title_lbl = QtWidgets.QLabel(
             "<span style='color:green'>GUILIC</span> Custom <span style='color:green'>Light</span> Editor"
         )
         self.title_lbl.setAlignment(QtCore.Qt.AlignCenter)
         self.title_lbl.setContentsMargins(0, 15, 0, 15)
-        set_style_sheet_title_wdg(self.title_lbl, FONT_LABEL_DESC, FONT_SIZE_TITLE)
+        self.title_lbl.setObjectName("titleLabel")
+
+        self.filter_le = QtWidgets.QLineEdit()
+        self.filter_le.setPlaceholderText("Filter: key*  pointLight  aiSamples>3  intensity<0.1  aiCastShadows=0")
+        self.filter_le.setClearButtonEnabled(True)
+        self.filter_count_lbl = QtWidgets.QLabel()
+        self.filter_count_lbl.setObjectName("attributeLabel")
+        # the filter is applied once the typing pauses
+        self.filter_timer = QtCore.QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(self.FILTER_INTERVAL)
+
+        # statistics of the rig, kept up to date from the snapshot and displayed when expanded
+        self.stats_container = Container("RIG STATISTICS")
+        self.stats_lbl = QtWidgets.QLabel()
+        self.stats_lbl.setObjectName("attributeLabel")
+        self.stats_lbl.setTextFormat(QtCore.Qt.RichText)
+        QtWidgets.QVBoxLayout(self.stats_container.contentWidget).addWidget(self.stats_lbl)
+        self.stats_timer = QtCore.QTimer(self)
+        self.stats_timer.setSingleShot(True)
+        self.stats_timer.setInterval(self.STATS_INTERVAL)
+
+        # an edit on a light of a multi-selection is applied to every selected light
+        self.batch_editor = LightBatchEditor(self.get_selected_lights)
+
+        # only the visible rows are painted, the LightItem of a light is created when it is expanded
+        self.light_model = LightListModel(self)
+        self.light_model.batch_editor = self.batch_editor
+        self.light_view = QtWidgets.QTreeView()
+        self.light_view.setModel(self.light_model)
+        self.light_view.setItemDelegate(LightItemDelegate(self.light_view, self.batch_editor))
+        self.light_view.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.light_view.setHeaderHidden(True)
+        self.light_view.setUniformRowHeights(False)
+        self.light_view.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.light_view.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        self.light_view.setIconSize(QtCore.QSize(20, 20))
+
+        # edit of the selected lights
+        self.batch_lbl = QtWidgets.QLabel("Selection")
+        self.batch_lbl.setObjectName("attributeLabel")
+        self.batch_attribute_cmb = QtWidgets.QComboBox()
+        self.batch_attribute_cmb.setMinimumWidth(140)
+        self.batch_mode_cmb = QtWidgets.QComboBox()
+        self.batch_mode_cmb.addItems(LightBatchEditor.MODES)
+        self.batch_value_dsb = QtWidgets.QDoubleSpinBox()
+        self.batch_value_dsb.setRange(-10000.0, 10000.0)
+        self.batch_value_dsb.setDecimals(3)
+        self.batch_value_dsb.setButtonSymbols(QtWidgets.QAbstractSpinBox.NoButtons)
+        self.batch_apply_btn = QtWidgets.QPushButton("Apply")
+        self.batch_apply_btn.setObjectName("actionButton")
+        self.update_batch_widgets()
 
     def create_layout(self):
         header_layout = QtWidgets.QHBoxLayout()
@@ -1210,134 +2545,282 @@ class LightPanel(QtWidgets.QDialog):
         header_layout.addWidget(QtWidgets.QLabel("Emit Spec"))
         header_layout.addStretch()
 
+        filter_layout = QtWidgets.QHBoxLayout()
+        filter_layout.addWidget(self.filter_le)
+        filter_layout.addWidget(self.filter_count_lbl)
+
+        batch_layout = QtWidgets.QHBoxLayout()
+        batch_layout.addWidget(self.batch_lbl)
+        batch_layout.addWidget(self.batch_attribute_cmb)
+        batch_layout.addWidget(self.batch_mode_cmb)
+        batch_layout.addWidget(self.batch_value_dsb)
+        batch_layout.addWidget(self.batch_apply_btn)
+        batch_layout.addStretch()
+
         button_layout = QtWidgets.QHBoxLayout()
+        button_layout.addWidget(self.save_preset_btn)
+        button_layout.addWidget(self.load_preset_btn)
         button_layout.addStretch()
         button_layout.addWidget(self.refreshButton)
 
-        light_list_wdg = QtWidgets.QWidget()
-
-        # light_list_wdg.setStyleSheet(
-        #     """
-        #         border-width: 2px;
-        #         border-radius: 10px;
-        #         border-color: red;
-        #     """
-        # )
-        # debug ui
-        light_list_wdg.setContentsMargins(0, 0, 0, 0)
-        self.light_layout = QtWidgets.QVBoxLayout(light_list_wdg)
-        self.light_layout.setContentsMargins(2, 2, 2, 2)
-
-        # self.light_layout.setSpacing(1)
-        # self.light_layout.setAlignment(QtCore.Qt.AlignTop)
-        # self.light_layout.addStretch()
-
-        light_list_scroll_area = QtWidgets.QScrollArea()
-        light_list_scroll_area.setWidgetResizable(True)
-        light_list_scroll_area.setWidget(light_list_wdg)
-
         main_layout = QtWidgets.QVBoxLayout(self)
         main_layout.setContentsMargins(2, 2, 2, 2)
         # main_layout.addLayout(header_layout)
         main_layout.addWidget(self.title_lbl)
 
-        main_layout.addWidget(light_list_scroll_area)
+        main_layout.addWidget(self.stats_container)
+        main_layout.addLayout(filter_layout)
+        main_layout.addWidget(self.light_view)
+        main_layout.addLayout(batch_layout)
         main_layout.addLayout(button_layout)
 
         # main_layout.addWidget(container)
 
     def create_connections(self):
         self.refreshButton.clicked.connect(self.refresh_lights)
+        self.save_preset_btn.clicked.connect(self.save_preset)
+        self.load_preset_btn.clicked.connect(self.load_preset)
+        self.light_view.expanded.connect(self.on_light_expanded)
+        self.light_view.collapsed.connect(self.on_light_collapsed)
+        self.light_view.selectionModel().selectionChanged.connect(self.update_batch_widgets)
+        self.batch_mode_cmb.currentTextChanged.connect(self.set_batch_mode)
+        self.batch_apply_btn.clicked.connect(self.apply_batch_edit)
+        self.filter_le.textChanged.connect(self.filter_timer.start)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        # only the lights added or changed are matched again
+        self.light_model.modelReset.connect(self.on_model_reset)
+        self.light_model.rowsInserted.connect(self.on_rows_inserted)
+        self.light_model.light_changed.connect(self.on_light_changed)
+        self.light_model.rowsAboutToBeRemoved.connect(self.on_rows_about_to_be_removed)
+        self.stats_timer.timeout.connect(self.update_stats_label)
+        self.stats_container.header.installEventFilter(self)
 
     def get_lights_in_scene(self):
         return cmds.ls(type=cmds.listNodeTypes("light"))
 
+    @profiled("refresh_lights")
     def refresh_lights(self):
         # print("refresh_lights")
-        self.clear_lights()
+        # read every light once, the rows are then painted without querying Maya
+        snapshot = LightSceneSnapshot(self.get_lights_in_scene())
+        # the reset would drop the editors of the expanded lights without unsubscribing them:
+        # close them first, then expand the same lights again
+        expanded_uuids = list(self.light_view.itemDelegate().editors)
+        for uuid in expanded_uuids:
+            self.light_view.closePersistentEditor(self.light_model.get_details_index(self.light_model.get_index(uuid)))
+        self.light_model.set_lights(snapshot.lights)
+        for uuid in expanded_uuids:
+            index = self.light_model.get_index(uuid)
+            if index.isValid():
+                self.light_view.expand(index)
+
+    @profiled("reconcile_lights")
+    def reconcile_lights(self):
+        """Insert or remove only the rows of the lights created or deleted since the last refresh.
+        Lights are matched by UUID, so the existing rows keep their editors, callbacks and expand state.
+        """
         scene_lights = self.get_lights_in_scene()
-        count_header = 0
-        for light in scene_lights:
-            # print(light)
-
-            light_item = LightItem(light)
-            # TODO change this value hard coding
-
-            light_item.setContentsMargins(1, 1, 1, 1)
+        scene_uuids = cmds.ls(scene_lights, uuid=True) if scene_lights else []
+
+        scene_uuids_set = set(scene_uuids)
+        for uuid in [uuid for uuid in self.light_model.uuids if uuid not in scene_uuids_set]:
+            self.light_model.remove_light(uuid)
+
+        new_shapes = [shape for shape, uuid in zip(scene_lights, scene_uuids) if uuid not in self.light_model.lights]
+        if not new_shapes:
+            return
+        new_lights = {light_data.uuid: light_data for light_data in LightSceneSnapshot(new_shapes).lights}
+        # insert each new light at its position in the scene order
+        row = 0
+        for uuid in scene_uuids:
+            if uuid in new_lights:
+                self.light_model.insert_light(new_lights[uuid], row)
+            if uuid in self.light_model.lights:
+                row += 1
+
+    def on_light_expanded(self, index):
+        self.light_view.openPersistentEditor(self.light_model.get_details_index(index))
+
+    def on_light_collapsed(self, index):
+        # the LightItem is destroyed with its editor, a collapsed light costs no widget
+        self.light_view.closePersistentEditor(self.light_model.get_details_index(index))
 
-            light_item.node_deleted.connect(self.on_node_deleted)
-
-            self.container_name = light_item.get_transform_name()
-            container = Container(self.container_name)
-
-            if count_header % 2:
-                container.header.setStyleSheet(
-                    f"""
-                                QWidget{{
-                                    background-color : {SECOND_BACKGROUND_COLOR}; 
-                                }} 
-                                """
-                )
-            else:
-                container.header.setStyleSheet(
-                    f"""
-                                QWidget{{
-                                    background-color : {SECOND_BACKGROUND_CLOSE_COLOR}; 
-                                }}
-                                """
-                )
+    def clear_lights(self):
+        self.light_model.clear()
+
+    def get_selected_lights(self):
+        lights = []
+        for index in self.light_view.selectionModel().selectedRows():
+            uuid = index.data(QtCore.Qt.UserRole)
+            light_data = self.light_model.get_light(uuid)
+            # lights hidden by the filter are never edited
+            if light_data is not None and uuid not in self.hidden_uuids:
+                lights.append(light_data)
+        return lights
+
+    def get_light_types(self):
+        light_types = set(LightItem.SUPPORTED_TYPES or [])
+        light_types.update(light_data.light_type for light_data in self.light_model.lights.values())
+        return light_types
+
+    @profiled("LightPanel.apply_filter")
+    def apply_filter(self):
+        self.light_filter = LightFilter(self.filter_le.text(), self.get_light_types())
+        # the predicates may compare attributes the light tables do not display
+        self.read_filter_attributes()
+        self.update_filtered_rows()
+
+    def update_filtered_rows(self, uuids=None):
+        """Show or hide the rows of the given lights (all of them by default) from their snapshot"""
+        if uuids is None:
+            uuids = self.light_model.uuids
+        for uuid in uuids:
+            light_data = self.light_model.get_light(uuid)
+            if light_data is None:
+                continue
+            hidden = not self.light_filter.is_empty() and not self.light_filter.matches(light_data)
+            if hidden != (uuid in self.hidden_uuids):
+                self.light_view.setRowHidden(self.light_model.rows[uuid], QtCore.QModelIndex(), hidden)
+                if hidden:
+                    self.hidden_uuids.add(uuid)
+                else:
+                    self.hidden_uuids.discard(uuid)
+        self.update_filter_count()
 
-            self.light_layout.addWidget(container)
+    def update_filter_count(self):
+        light_count = len(self.light_model.uuids)
+        if self.light_filter.is_empty():
+            self.filter_count_lbl.setText(f"{light_count} lights")
+        else:
+            hidden_count = len(self.hidden_uuids & set(self.light_model.lights))
+            text = f"{light_count - hidden_count} / {light_count} lights"
+            # a predicate never matches the lights whose type has no such attribute
+            if self.missing_filter_attributes:
+                text += f", {', '.join(self.missing_filter_attributes)} n/a on some types"
+            self.filter_count_lbl.setText(text)
+        self.filter_count_lbl.setToolTip(
+            "\n".join(
+                f"{attr_name} is not an attribute of {', '.join(sorted(light_types))}"
+                for attr_name, light_types in self.missing_filter_attributes.items()
+            )
+        )
 
-            content_layout = QtWidgets.QGridLayout(container.contentWidget)
-            content_layout.addWidget(light_item)
+    def read_filter_attributes(self):
+        self.missing_filter_attributes = self.light_model.read_attributes(self.light_filter.get_attributes())
+
+    def on_model_reset(self):
+        # the view shows every row again after a reset
+        self.hidden_uuids = set()
+        self.read_filter_attributes()
+        self.update_filtered_rows()
+        self.rig_stats.set_lights(self.light_model.lights.values())
+        self.stats_timer.start()
+
+    def on_rows_inserted(self, parent, first, last):
+        if not parent.isValid():
+            uuids = self.light_model.uuids[first : last + 1]
+            if self.light_filter.predicates:
+                self.read_filter_attributes()
+            self.update_filtered_rows(uuids)
+            for uuid in uuids:
+                self.rig_stats.add(self.light_model.get_light(uuid))
+            self.stats_timer.start()
+
+    def on_rows_about_to_be_removed(self, parent, first, last):
+        if not parent.isValid():
+            for uuid in self.light_model.uuids[first : last + 1]:
+                self.rig_stats.remove(uuid)
+            self.stats_timer.start()
+
+    def on_light_changed(self, uuid):
+        if not self.light_filter.is_empty():
+            self.update_filtered_rows([uuid])
+        self.rig_stats.update(self.light_model.get_light(uuid))
+        self.stats_timer.start()
+
+    def update_stats_label(self):
+        # the text is only built while the statistics are shown
+        if not self.stats_container.contentWidget.isHidden():
+            self.stats_lbl.setText(self.rig_stats.to_html())
+
+    def eventFilter(self, watched, event):
+        if watched is self.stats_container.header and event.type() == QtCore.QEvent.MouseButtonRelease:
+            self.update_stats_label()
+        return super(LightPanel, self).eventFilter(watched, event)
+
+    def update_batch_widgets(self, *args):
+        """List the attributes the selection bar can edit: the numeric ones and the color of the selected lights"""
+        current_attribute = self.batch_attribute_cmb.currentText()
+        attributes = set()
+        for light_data in self.get_selected_lights():
+            for attr_name, metadata in light_data.attribute_info.items():
+                if metadata.type in SPINBOX_TYPES or attr_name == "color":
+                    attributes.add(attr_name)
+        self.batch_attribute_cmb.clear()
+        self.batch_attribute_cmb.addItems(sorted(attributes))
+        if current_attribute in attributes:
+            self.batch_attribute_cmb.setCurrentText(current_attribute)
+        for widget in (self.batch_attribute_cmb, self.batch_mode_cmb, self.batch_value_dsb, self.batch_apply_btn):
+            widget.setEnabled(bool(attributes))
+
+    def set_batch_mode(self, mode):
+        self.batch_editor.mode = mode
+        # the neutral amount of the mode
+        if mode == LightBatchEditor.MULTIPLY:
+            self.batch_value_dsb.setValue(1.0)
+        elif mode in (LightBatchEditor.ADD, LightBatchEditor.STOPS):
+            self.batch_value_dsb.setValue(0.0)
+
+    def apply_batch_edit(self):
+        attr_name = self.batch_attribute_cmb.currentText()
+        if attr_name:
+            self.batch_editor.apply(self.get_selected_lights(), attr_name, self.batch_value_dsb.value())
+
+    def save_preset(self):
+        file_path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Light Rig", "", LightRigPreset.FILE_FILTER)
+        if file_path:
+            LightRigPreset.capture().save(file_path)
+
+    def load_preset(self):
+        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Load Light Rig", "", LightRigPreset.FILE_FILTER)
+        if not file_path:
+            return
+        try:
+            preset = LightRigPreset.load(file_path)
+        except (IOError, ValueError, KeyError) as e:
+            cmds.warning(f"Cannot read the light rig preset {file_path}: {e}")
+            return
+        preset.apply()
+
+    def create_scene_callbacks(self):
+        """Watch the creation and deletion of the light node types only.
+        Undo and redo of a creation or a deletion also add or remove the nodes,
+        creating any other node costs nothing to the panel.
+        """
+        self.delete_scene_callbacks()
+        for node_type in cmds.listNodeTypes("light") or []:
+            self.callback_ids.append(om2.MDGMessage.addNodeAddedCallback(self.on_light_added, node_type))
+            self.callback_ids.append(om2.MDGMessage.addNodeRemovedCallback(self.on_light_removed, node_type))
 
-            self.light_items.append(light_item)
+    def delete_scene_callbacks(self):
+        if self.callback_ids:
+            om2.MMessage.removeCallbacks(self.callback_ids)
+        self.callback_ids = []
 
-            self.light_items.append(light_item)
-            count_header += 1
+    def on_light_added(self, node, client_data):
+        # the shape is not parented yet, the light is read once the command is over
+        self.reconcile_timer.start()
 
-    def clear_lights(self):
-        for light in self.light_items:
-            light.delete_script_jobs()
-
-        self.light_items = []
-        while self.light_layout.count() > 0:
-            light_item = self.light_layout.takeAt(0)
-            if light_item.widget():
-                light_item.widget().deleteLater()
-
-    def create_script_jobs(self):
-        sjn = cmds.scriptJob(event=["DagObjectCreated", partial(self.on_dag_object_created)])
-        self.script_jobs.append(sjn)
-        sjn = cmds.scriptJob(event=["Undo", partial(self.on_undo)])
-        self.script_jobs.append(sjn)
-        # print(self.script_jobs)
-
-    def delete_script_jobs(self):
-        for script_job in self.script_jobs:
-            cmds.scriptJob(kill=script_job)
-        self.script_jobs = []
-
-    def on_dag_object_created(self):
-        if len(cmds.ls(type="light")) != len(self.light_items):
-            # print("new light created...")
-            self.refresh_lights()
-
-    def on_undo(self):
-        if len(cmds.ls(type="light")) != len(self.light_items):
-            # print("undo light created...")
-            self.refresh_lights()
-
-    def on_node_deleted(self):
-        self.refresh_lights()
+    def on_light_removed(self, node, client_data):
+        self.reconcile_timer.start()
 
     def showEvent(self, event):
-        self.create_script_jobs()
+        self.create_scene_callbacks()
         self.refresh_lights()
 
     def closeEvent(self, event):
-        self.delete_script_jobs()
+        self.delete_scene_callbacks()
+        self.reconcile_timer.stop()
         self.clear_lights()
 
 
@@ -0,0 +1,42 @@
+"""The tools run against benchmarks/fake_maya, the in-memory stand-in for maya.cmds and maya.api.OpenMaya"""
+
+import os
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("QT_LOGGING_RULES", "qt.svg.warning=false")
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "benchmarks", "fake_maya"))
+
+QtWidgets = pytest.importorskip("PySide2.QtWidgets")
+# the tool modules build fonts and widgets when imported
+APP = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+from maya._scene import SCENE  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def app():
+    return APP
+
+
+@pytest.fixture
+def scene(app):
+    """An empty fake scene, with the callbacks and flush timers of the previous test gone"""
+    SCENE.reset()
+    yield SCENE
+    app.processEvents()
+
+
+def process_events(app, milliseconds=100):
+    """Let the coalescing timers of the tools fire"""
+    from PySide2 import QtCore
+
+    loop = QtCore.QEventLoop()
+    QtCore.QTimer.singleShot(milliseconds, loop.quit)
+    loop.exec_()
@@ -0,0 +1,131 @@
+import json
+
+from maya import cmds
+
+from conftest import process_events
+
+import light_manager
+
+
+def test_refresh_keeps_expanded_light_following_maya(app, scene):
+    scene.create_light("pointLight", "key")
+    scene.create_light("spotLight", "rim")
+    panel = light_manager.LightPanel()
+    panel.refresh_lights()
+    uuid = panel.light_model.uuids[0]
+    panel.light_view.expand(panel.light_model.get_index(uuid))
+
+    panel.refresh_lights()
+    cmds.setAttr("keyShape.intensity", 42.0)
+    process_events(app)
+
+    light_data = panel.light_model.get_light(uuid)
+    assert light_data.get_value("intensity") == 42.0
+    assert panel.light_view.itemDelegate().editors[uuid].light_data is light_data
+    assert light_manager.LightCallbackDispatcher.instance().lights[uuid] is light_data
+    panel.clear_lights()
+
+
+def test_rig_stats_read_samples_and_shadows_of_every_type(app, scene):
+    scene.create_light("directionalLight", "sun")
+    scene.create_light("areaLight", "fill")
+    cmds.setAttr("sunShape.aiSamples", 3)
+    cmds.setAttr("sunShape.aiVolumeSamples", 2)
+    cmds.setAttr("sunShape.aiCastVolumetricShadows", True)
+    cmds.setAttr("fillShape.aiSamples", 2)
+    cmds.setAttr("fillShape.aiCastShadows", False)
+    cmds.setAttr("fillShape.aiCastVolumetricShadows", False)
+
+    stats = light_manager.LightRigStats()
+    stats.set_lights(light_manager.LightSceneSnapshot().lights)
+
+    assert stats.shadow_count == 1
+    assert stats.volumetric_count == 1
+    assert stats.sample_sums["aiSamples"] == 5
+    # sun: 3 * 3 + 2 * 2 volume samples, fill: 2 * 2
+    assert stats.cost == 17
+
+
+def test_filter_predicate_reads_attributes_missing_from_the_tables(app, scene):
+    scene.create_light("directionalLight", "sun")
+    scene.create_light("pointLight", "key")
+    cmds.setAttr("sunShape.aiShadowDensity", 0.25)
+    panel = light_manager.LightPanel()
+    panel.refresh_lights()
+
+    panel.filter_le.setText("aiShadowDensity<0.5")
+    panel.apply_filter()
+    assert panel.hidden_uuids == {panel.light_model.uuids[1]}
+    assert panel.filter_count_lbl.text() == "1 / 2 lights"
+
+    # the predicate follows the changes made in Maya
+    cmds.setAttr("keyShape.aiShadowDensity", 0.1)
+    process_events(app)
+    assert not panel.hidden_uuids
+
+    panel.filter_le.setText("ambientShade>0")
+    panel.apply_filter()
+    assert "ambientShade n/a on some types" in panel.filter_count_lbl.text()
+    assert "directionalLight, pointLight" in panel.filter_count_lbl.toolTip()
+    panel.clear_lights()
+
+
+def test_preset_apply_skips_locked_plugs(app, scene):
+    scene.create_light("pointLight", "key")
+    scene.create_light("pointLight", "fill")
+    preset = light_manager.LightRigPreset.capture()
+    cmds.setAttr("keyShape.intensity", 5.0)
+    cmds.setAttr("fillShape.intensity", 5.0)
+    cmds.setAttr("keyShape.intensity", lock=True)
+
+    result = preset.apply()
+
+    assert result["failed"] == ["keyShape.intensity"]
+    assert result["written"] == 1
+    assert cmds.getAttr("fillShape.intensity") == 1.0
+
+
+def test_batch_edit_skips_locked_lights(app, scene):
+    for name in ["key", "fill", "rim"]:
+        scene.create_light("pointLight", name)
+    cmds.setAttr("fillShape.intensity", lock=True)
+    lights = light_manager.LightSceneSnapshot().lights
+    editor = light_manager.LightBatchEditor(lambda: lights)
+
+    written = editor.apply(lights, "intensity", 4.0)
+
+    assert written == 2
+    assert [cmds.getAttr(f"{name}Shape.intensity") for name in ["key", "fill", "rim"]] == [4.0, 1.0, 4.0]
+    assert [light_data.get_value("intensity") for light_data in lights] == [4.0, 1.0, 4.0]
+
+
+def test_metadata_cache_written_once_per_snapshot(app, scene, tmp_path, monkeypatch):
+    for light_type in ["pointLight", "spotLight", "areaLight", "aiAreaLight"]:
+        scene.create_light(light_type, light_type + "1")
+    cache = light_manager.AttributeMetadataCache()
+    cache.persistent = True
+    cache.file_path = str(tmp_path / "metadata.json")
+    cache.version_key = "test"
+    saves = []
+    save = cache.save
+
+    def counted_save():
+        saves.append(cache.file_path)
+        save()
+
+    monkeypatch.setattr(cache, "save", counted_save)
+    monkeypatch.setattr(light_manager.AttributeMetadataCache, "_instance", cache)
+    monkeypatch.setattr(light_manager.LightTypePlan, "_plans", {})
+
+    light_manager.LightSceneSnapshot()
+    light_manager.LightSceneSnapshot()
+
+    assert len(saves) == 1
+    with open(cache.file_path) as cache_file:
+        cached_types = set(json.load(cache_file)["test"])
+    assert cached_types == {
+        "pointLight",
+        "spotLight",
+        "areaLight",
+        "aiAreaLight",
+    }
@@ -0,0 +1,285 @@
+# Author: Guillaume Cournet
+# Date: April 13, 2023
+
+"""Instrumentation of the tools: Maya commands counted and timed per UI operation.
+
+The UI operations of the tools are decorated with span(name). While the profiler is
+enabled, the maya.cmds module used by the registered tools is swapped for a proxy
+recording every call, and each span records its wall time and the commands issued
+inside it, nested the same way as the operations. When disabled, the tools use the
+real maya.cmds and a span only costs one attribute check.
+
+The tools import this module when it is on the Python path and fall back to a no-op
+profiled decorator otherwise, so each of them can still be pasted alone in the script
+editor, running without instrumentation.
+
+Usage, from the script editor:
+    import tool_profiler
+    tool_profiler.enable()
+    # ... use the tools ...
+    print(tool_profiler.report())
+    tool_profiler.dump_json("C:/tmp/light_tools_profile.json")
+    tool_profiler.show_overlay()
+"""
+
+import json
+import time
+from functools import wraps
+
+from PySide2 import QtCore
+from PySide2 import QtWidgets
+from shiboken2 import wrapInstance
+
+import maya.cmds as cmds
+import maya.OpenMayaUI as omui
+
+
+class Span:
+    """Aggregated timings of one operation at one place of the call tree"""
+
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.children = {}  # {"name" : Span}
+        self.calls = 0
+        self.time = 0.0
+        self.commands = {}  # {"command" : [count, time]} issued directly inside this span
+
+    def get_child(self, name):
+        child = self.children.get(name)
+        if child is None:
+            child = self.children[name] = Span(name, self)
+        return child
+
+    def get_command_count(self):
+        """Number of commands issued inside this span and its children"""
+        count = sum(command[0] for command in self.commands.values())
+        return count + sum(child.get_command_count() for child in self.children.values())
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "time": self.time,
+            "command_count": self.get_command_count(),
+            "commands": {name: {"count": count, "time": elapsed} for name, (count, elapsed) in self.commands.items()},
+            "children": [child.to_dict() for child in self.children.values()],
+        }
+
+
+class CountedCommands:
+    """Stand-in for maya.cmds forwarding every call to the real command and recording it"""
+
+    def __init__(self, profiler, commands):
+        self._profiler = profiler
+        self._commands = commands
+        self._wrappers = {}
+
+    def __getattr__(self, name):
+        wrapper = self._wrappers.get(name)
+        if wrapper is None:
+            command = getattr(self._commands, name)
+            if not callable(command):
+                return command
+            wrapper = self._wrappers[name] = self._wrap(name, command)
+        return wrapper
+
+    def _wrap(self, name, command):
+        profiler = self._profiler
+
+        @wraps(command)
+        def counted_command(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return command(*args, **kwargs)
+            finally:
+                profiler.record_command(name, time.perf_counter() - start)
+
+        return counted_command
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.modules = []  # tool modules whose cmds is swapped while enabled
+        self.counted_commands = CountedCommands(self, cmds)
+        self.reset()
+
+    def reset(self):
+        self.root = Span("session")
+        self.current = self.root
+
+    def register(self, module):
+        """Instrument the maya.cmds calls of a tool module"""
+        if module not in self.modules:
+            self.modules.append(module)
+            if self.enabled:
+                module.cmds = self.counted_commands
+
+    def enable(self):
+        self.enabled = True
+        for module in self.modules:
+            module.cmds = self.counted_commands
+
+    def disable(self):
+        self.enabled = False
+        for module in self.modules:
+            module.cmds = cmds
+
+    def enter(self, name):
+        self.current = self.current.get_child(name)
+        return time.perf_counter()
+
+    def exit(self, start):
+        span = self.current
+        span.calls += 1
+        span.time += time.perf_counter() - start
+        self.current = span.parent or self.root
+
+    def record_command(self, name, elapsed):
+        command = self.current.commands.setdefault(name, [0, 0.0])
+        command[0] += 1
+        command[1] += elapsed
+
+    def span(self, name):
+        """Decorator recording every call of a function as the span name"""
+
+        def decorator(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = self.enter(name)
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.exit(start)
+
+            return wrapper
+
+        return decorator
+
+    def report(self):
+        """Return the spans as indented lines, e.g. 'refresh_lights: 14,302 cmds calls, 3.8 s (1 call)'"""
+        lines = []
+
+        def add_lines(span, depth):
+            for child in sorted(span.children.values(), key=lambda child: -child.time):
+                lines.append(
+                    f"{'    ' * depth}{child.name}: {child.get_command_count():,} cmds calls, "
+                    f"{child.time:.3f} s ({child.calls} call{'s' if child.calls > 1 else ''})"
+                )
+                add_lines(child, depth + 1)
+
+        add_lines(self.root, 0)
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return self.root.to_dict()
+
+    def dump_json(self, file_path):
+        with open(file_path, "w") as report_file:
+            json.dump(self.to_dict(), report_file, indent=2)
+        return file_path
+
+
+class ProfilerOverlay(QtWidgets.QDialog):
+    """Small window showing the spans recorded by the profiler, refreshed every second"""
+
+    REFRESH_INTERVAL = 1000  # milliseconds
+
+    def __init__(self, profiler, parent=None):
+        super(ProfilerOverlay, self).__init__(parent)
+        self.profiler = profiler
+        self.setWindowTitle("Tools Profiler")
+        self.setWindowFlags(QtCore.Qt.Tool)
+        self.resize(480, 300)
+
+        self.span_tree = QtWidgets.QTreeWidget()
+        self.span_tree.setHeaderLabels(["Operation", "Calls", "Cmds", "Time (ms)"])
+        self.enable_cb = QtWidgets.QCheckBox("Enabled")
+        self.enable_cb.setChecked(self.profiler.enabled)
+        self.reset_btn = QtWidgets.QPushButton("Reset")
+
+        button_layout = QtWidgets.QHBoxLayout()
+        button_layout.addWidget(self.enable_cb)
+        button_layout.addStretch()
+        button_layout.addWidget(self.reset_btn)
+        main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.addWidget(self.span_tree)
+        main_layout.addLayout(button_layout)
+
+        self.enable_cb.toggled.connect(self.set_enabled)
+        self.reset_btn.clicked.connect(self.reset)
+        self.refresh_timer = QtCore.QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_INTERVAL)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def set_enabled(self, enabled):
+        self.profiler.enable() if enabled else self.profiler.disable()
+
+    def reset(self):
+        self.profiler.reset()
+        self.refresh()
+
+    def refresh(self):
+        self.span_tree.clear()
+
+        def add_items(span, parent_item):
+            for child in sorted(span.children.values(), key=lambda child: -child.time):
+                item = QtWidgets.QTreeWidgetItem(
+                    parent_item,
+                    [child.name, str(child.calls), str(child.get_command_count()), f"{child.time * 1000.0:.1f}"],
+                )
+                add_items(child, item)
+
+        add_items(self.profiler.root, self.span_tree.invisibleRootItem())
+        self.span_tree.expandAll()
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+
+
+PROFILER = Profiler()
+_overlay = None
+
+
+def register(module):
+    PROFILER.register(module)
+
+
+def span(name):
+    return PROFILER.span(name)
+
+
+def enable():
+    PROFILER.enable()
+
+
+def disable():
+    PROFILER.disable()
+
+
+def reset():
+    PROFILER.reset()
+
+
+def report():
+    return PROFILER.report()
+
+
+def dump_json(file_path):
+    return PROFILER.dump_json(file_path)
+
+
+def show_overlay():
+    global _overlay
+    if _overlay is None:
+        main_window = wrapInstance(int(omui.MQtUtil.mainWindow()), QtWidgets.QWidget)
+        _overlay = ProfilerOverlay(PROFILER, main_window)
+    _overlay.show()
+    return _overlay